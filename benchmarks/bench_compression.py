@@ -0,0 +1,72 @@
+"""
+Throughput vs. compression ratio for the text exporters.
+
+Usage: python benchmarks/bench_compression.py [--reviews 20000] [--repeat 3]
+"""
+import argparse
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from outputs.exporters import export_reviews  # noqa: E402
+from synthetic import make_reviews  # noqa: E402
+
+TEXT_FORMATS = ["json", "csv", "html", "xml"]
+CODECS = [
+    ("none", None),
+    ("gzip", 1),
+    ("gzip", 6),
+    ("gzip", 9),
+    ("zstd", 1),
+    ("zstd", 3),
+    ("zstd", 10),
+    ("zstd", 19),
+]
+
+def _file_size(path: Path) -> int:
+    if path.is_dir():
+        return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+    return path.stat().st_size
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--reviews", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    reviews = make_reviews(args.reviews)
+    workdir = Path(tempfile.mkdtemp(prefix="bench_compression_"))
+    raw_sizes: Dict[str, int] = {}
+
+    print(f"{'format':<6} {'codec':<6} {'level':>5} {'MB/s':>8} {'ratio':>7} {'size MB':>8}")
+    try:
+        for fmt in TEXT_FORMATS:
+            for codec, level in CODECS:
+                options = {fmt: {"compression": codec, "level": level}}
+                best = float("inf")
+                for run in range(args.repeat):
+                    start = time.perf_counter()
+                    export_map = export_reviews(
+                        reviews, workdir, f"{fmt}_{codec}_{level}_{run}", [fmt], options
+                    )
+                    best = min(best, time.perf_counter() - start)
+                size = _file_size(export_map[fmt])
+                if codec == "none":
+                    raw_sizes[fmt] = size
+                raw_mb = raw_sizes[fmt] / 1e6
+                print(
+                    f"{fmt:<6} {codec:<6} {level if level is not None else '-':>5} "
+                    f"{raw_mb / best:>8.1f} {raw_sizes[fmt] / size:>7.2f} {size / 1e6:>8.2f}"
+                )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
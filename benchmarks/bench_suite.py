@@ -0,0 +1,239 @@
+"""
+Parsing, pagination and export benchmarks on synthetic Booking pages.
+
+Usage:
+    python benchmarks/bench_suite.py                      # run and print
+    python benchmarks/bench_suite.py --save-baseline      # record baseline
+    python benchmarks/bench_suite.py --baseline benchmarks/baseline.json
+
+With a baseline, the run exits non-zero when a throughput drops, or peak
+memory grows, by more than --tolerance (relative).
+"""
+import argparse
+import json
+import platform
+import re
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+from extractors.booking_parser import _parse_reviews_from_html  # noqa: E402
+from extractors.pagination_handler import PaginationHandler  # noqa: E402
+from extractors.utils_cleaner import extract_numeric  # noqa: E402
+from outputs.country_codes import COUNTRY_CODES  # noqa: E402
+from outputs.exporters import EXPORT_FORMATS, export_format  # noqa: E402
+from outputs.normalize import normalize_reviews  # noqa: E402
+from outputs.parquet_writer import parse_dates  # noqa: E402
+from synthetic import LAYOUTS, PAGINATORS, make_review_page, make_reviews  # noqa: E402
+
+DEFAULT_BASELINE = Path(__file__).resolve().parent / "baseline.json"
+PAGE_URL = "https://www.booking.com/hotel/us/example-property.en-gb.html"
+
+class Case:
+    def __init__(
+        self,
+        name: str,
+        fn: Callable[[], Any],
+        pages: int = 0,
+        reviews: int = 0,
+    ) -> None:
+        self.name = name
+        self.fn = fn
+        self.pages = pages
+        self.reviews = reviews
+
+def build_cases(args: argparse.Namespace, workdir: Path) -> List[Case]:
+    cases: List[Case] = []
+
+    for layout in LAYOUTS:
+        html = make_review_page(args.cards, layout=layout, padding_kb=args.padding_kb)
+        cases.append(
+            Case(
+                f"parse.{layout}",
+                lambda html=html: _parse_reviews_from_html(html, "us/example", 1, {}),
+                pages=1,
+                reviews=args.cards,
+            )
+        )
+
+    handler = PaginationHandler(session=None)  # type: ignore[arg-type]
+    for variant in PAGINATORS:
+        html = make_review_page(args.cards, paginator=variant, padding_kb=args.padding_kb)
+        cases.append(
+            Case(
+                f"paginate.{variant}",
+                lambda html=html: handler._find_next_page_url(html, PAGE_URL),
+                pages=1,
+            )
+        )
+
+    reviews = make_reviews(args.reviews)
+    for fmt in EXPORT_FORMATS:
+        cases.append(
+            Case(
+                f"export.{fmt}",
+                lambda fmt=fmt: export_format(fmt, reviews, workdir, f"bench_{fmt}"),
+                reviews=len(reviews),
+            )
+        )
+
+    # Typed fields for a whole batch at once vs one review at a time
+    cases.append(
+        Case(
+            "normalize.batch",
+            lambda: normalize_reviews([dict(r) for r in reviews]),
+            reviews=len(reviews),
+        )
+    )
+    cases.append(
+        Case(
+            "normalize.rowwise",
+            lambda: [_normalize_row(dict(r)) for r in reviews],
+            reviews=len(reviews),
+        )
+    )
+    # Exporters that convert types, fed reviews that are already typed
+    normalized = normalize_reviews([dict(r) for r in reviews])
+    for fmt in ("parquet", "sqlite", "summary"):
+        cases.append(
+            Case(
+                f"export.{fmt}.normalized",
+                lambda fmt=fmt: export_format(
+                    fmt, normalized, workdir, f"bench_{fmt}_normalized", {"normalized": True}
+                ),
+                reviews=len(normalized),
+            )
+        )
+
+    if args.only:
+        pattern = re.compile(args.only)
+        cases = [case for case in cases if pattern.search(case.name)]
+    return cases
+
+def _normalize_row(review: Dict[str, Any]) -> Dict[str, Any]:
+    # The per-review conversions normalize_reviews replaces
+    rating = extract_numeric(review["rating"])
+    review["rating"] = float(rating) if rating else None
+    review_date, stay_date = parse_dates([review["reviewDate"]]) + parse_dates([review["stayDate"]])
+    review["reviewDateRaw"] = review["reviewDate"]
+    review["reviewDate"] = review_date.isoformat() if review_date else review["reviewDate"]
+    review["stayDate"] = stay_date.strftime("%Y-%m") if stay_date else review["stayDate"]
+    nights = extract_numeric(review["stayLength"])
+    review["nights"] = int(float(nights)) if nights else None
+    review["countryCode"] = COUNTRY_CODES.get((review["userLocation"] or "").strip().casefold())
+    return review
+
+def measure(case: Case, min_time: float) -> Dict[str, float]:
+    # Warm-up (imports, caches), then time whole iterations
+    case.fn()
+    iterations = 0
+    start = time.perf_counter()
+    while True:
+        case.fn()
+        iterations += 1
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+    per_call = elapsed / iterations
+
+    tracemalloc.start()
+    try:
+        case.fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    result = {"secondsPerCall": per_call, "peakMemoryKb": peak / 1024}
+    if case.pages:
+        result["pagesPerSec"] = case.pages / per_call
+    if case.reviews:
+        result["reviewsPerSec"] = case.reviews / per_call
+    return result
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    tolerance: float,
+) -> List[str]:
+    regressions: List[str] = []
+    for name, metrics in results.items():
+        reference = baseline.get(name)
+        if not reference:
+            continue
+        for key in ("pagesPerSec", "reviewsPerSec"):
+            if key in metrics and reference.get(key):
+                change = metrics[key] / reference[key] - 1
+                if change < -tolerance:
+                    regressions.append(f"{name} {key}: {change:+.0%}")
+        if reference.get("peakMemoryKb"):
+            change = metrics["peakMemoryKb"] / reference["peakMemoryKb"] - 1
+            if change > tolerance:
+                regressions.append(f"{name} peakMemoryKb: {change:+.0%}")
+    return regressions
+
+def _fmt(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value:,.1f}"
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Booking scraper benchmark suite")
+    parser.add_argument("--cards", type=int, default=25, help="Review cards per page.")
+    parser.add_argument("--padding-kb", type=int, default=200, help="Non-review markup per page.")
+    parser.add_argument("--reviews", type=int, default=5000, help="Reviews per export case.")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Seconds per case.")
+    parser.add_argument("--only", help="Regex filter on case names.")
+    parser.add_argument("--baseline", type=Path, help="Baseline JSON to compare against.")
+    parser.add_argument("--save-baseline", nargs="?", const=DEFAULT_BASELINE, type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--output", type=Path, help="Write results JSON here.")
+    args = parser.parse_args(argv)
+
+    workdir = Path(tempfile.mkdtemp(prefix="bench_suite_"))
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        print(f"{'case':<26} {'pages/s':>10} {'reviews/s':>12} {'peak KB':>10}")
+        for case in build_cases(args, workdir):
+            metrics = measure(case, args.min_time)
+            results[case.name] = metrics
+            print(
+                f"{case.name:<26} {_fmt(metrics.get('pagesPerSec')):>10} "
+                f"{_fmt(metrics.get('reviewsPerSec')):>12} {_fmt(metrics['peakMemoryKb']):>10}"
+            )
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    report = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cards": args.cards,
+            "paddingKb": args.padding_kb,
+            "reviews": args.reviews,
+        },
+        "results": results,
+    }
+
+    for path in filter(None, [args.output, args.save_baseline]):
+        path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"Wrote {path}")
+
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(results, baseline.get("results", {}), args.tolerance)
+        if regressions:
+            print("Regressions against baseline:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.baseline}.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Startup budget check for the JSON-only path.
+
+Each check runs in a fresh interpreter: it imports an entry point
+(``runner`` / ``main``), writes a JSON-only export, and then reports the
+import time and which heavy modules got loaded. The check fails if the
+import takes longer than ``--budget`` seconds or if pandas, openpyxl, bs4,
+lxml or pyarrow were loaded, since none of them is needed to import the CLI
+or to write JSON.
+
+Usage: python benchmarks/import_budget.py --budget 0.35
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT / "src"
+
+HEAVY_MODULES = ("pandas", "openpyxl", "bs4", "lxml", "pyarrow")
+
+# Runs inside the child interpreter; prints one JSON line.
+_PROBE = """
+import json, sys, tempfile, time
+sys.path[:0] = [{src!r}, {bench!r}]
+start = time.perf_counter()
+import {module}
+import_seconds = time.perf_counter() - start
+
+from synthetic import make_reviews
+with tempfile.TemporaryDirectory() as tmp:
+    {export}
+print(json.dumps({{
+    "importSeconds": import_seconds,
+    "loaded": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+CHECKS = {
+    "runner": (
+        "from outputs.exporters import export_reviews; "
+        "export_reviews(make_reviews(200), tmp, 'budget', ['json'])"
+    ),
+    "main": (
+        "from outputs.dataset_exporter import export_dataset; "
+        "export_dataset({'totalReviews': 0, 'scores': {}}, [{'id': 'r1', 'score': 8.0}], tmp + '/budget.json', ['json'])"
+    ),
+}
+
+def probe(module: str, export: str) -> Dict[str, Any]:
+    code = _PROBE.format(
+        src=str(SRC_DIR),
+        bench=str(ROOT / "benchmarks"),
+        module=module,
+        export=export,
+        heavy=HEAVY_MODULES,
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.strip().splitlines()[-1])
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check CLI import time and lazy imports")
+    parser.add_argument("--budget", type=float, default=0.35, help="Max import seconds per entry point.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per entry point (best is kept).")
+    args = parser.parse_args()
+
+    failures: List[str] = []
+    for module, export in CHECKS.items():
+        results = [probe(module, export) for _ in range(args.repeat)]
+        best = min(r["importSeconds"] for r in results)
+        loaded = sorted({m for r in results for m in r["loaded"]})
+        print(f"{module:>8}: import {best * 1000:7.1f} ms, heavy modules loaded: {loaded or 'none'}")
+        if best > args.budget:
+            failures.append(f"{module} import took {best:.3f}s (budget {args.budget:.3f}s)")
+        if loaded:
+            failures.append(f"{module} JSON-only path loaded {', '.join(loaded)}")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
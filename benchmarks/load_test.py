@@ -0,0 +1,203 @@
+"""
+Load-test the fetch layer against the local mock Booking server.
+
+Drives ``runner.run_scraper`` (sequential hotels, offset paging) and/or
+``main.scrape_reviews`` (next-link paging, N hotels in parallel over one
+session) and reports throughput, tail latency, errors and backoff.
+``--fetch-mode fragment`` pages through the mock's review-list fragments
+instead of full hotel pages.
+
+Usage:
+    python benchmarks/load_test.py --target both --hotels 20 --latency-ms 50 \\
+        --jitter-ms 40 --error-rate 0.02 --rate-limit-rps 50
+"""
+import argparse
+import json
+import logging
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+import main as scraper_main  # noqa: E402
+import runner  # noqa: E402
+from instrumentation.metrics import LATENCY_BUCKETS, Histogram, RunMetrics  # noqa: E402
+from mock_booking_server import (  # noqa: E402
+    MockBookingServer,
+    add_server_arguments,
+    config_from_args,
+)
+
+def summarize(name: str, metrics: RunMetrics, wall_seconds: float, reviews: int) -> Dict[str, Any]:
+    latency = Histogram(LATENCY_BUCKETS)
+    for hist in metrics.fetch_latency.values():
+        latency.merge(hist)
+    report = metrics.to_dict()
+    fetch = report["fetch"]
+
+    def total(entries: List[Dict[str, Any]]) -> float:
+        return sum(entry["value"] for entry in entries)
+
+    return {
+        "target": name,
+        "wallSeconds": round(wall_seconds, 3),
+        "pages": report["pagesFetched"],
+        "reviews": reviews,
+        "pagesPerSec": round(report["pagesFetched"] / wall_seconds, 2),
+        "reviewsPerSec": round(reviews / wall_seconds, 2),
+        "megabytes": round(report["bytesDownloaded"] / 1e6, 3),
+        "parseMsPerPage": (
+            None
+            if report["parse"]["secondsPerPage"]["mean"] is None
+            else round(report["parse"]["secondsPerPage"]["mean"] * 1000, 2)
+        ),
+        "latencyMs": {
+            key: None if latency.quantile(q) is None else round(latency.quantile(q) * 1000, 1)
+            for key, q in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+        },
+        "fetchErrors": int(total(fetch["errors"])),
+        "retries": int(total(fetch["retries"])),
+        "backoffSeconds": round(total(fetch["backoffSeconds"]), 2),
+    }
+
+def run_runner_target(server: MockBookingServer, args: argparse.Namespace, workdir: Path) -> Dict[str, Any]:
+    input_file = workdir / "urls.txt"
+    input_file.write_text(
+        "\n".join(server.hotel_url(i) for i in range(args.hotels)) + "\n", encoding="utf-8"
+    )
+    config_file = workdir / "runner_config.json"
+    config_file.write_text(
+        json.dumps(
+            {
+                "maxPagesPerHotel": args.max_pages,
+                "outputDirectory": str(workdir / "runner_output"),
+                "outputFormats": ["json"],
+                "request": {
+                    "timeoutSeconds": 20,
+                    "delayBetweenRequestsSeconds": 0,
+                    "concurrency": args.page_concurrency,
+                    "maxRequestsPerSecond": args.max_rps,
+                    "fetchMode": args.fetch_mode,
+                    "fragmentUrlTemplate": server.fragment_url_template(),
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    metrics = RunMetrics()
+    start = time.perf_counter()
+    runner.run_scraper(input_file, config_file, metrics=metrics)
+    wall = time.perf_counter() - start
+    return summarize(
+        f"runner.run_scraper (page concurrency={args.page_concurrency}, {args.fetch_mode}s)",
+        metrics,
+        wall,
+        metrics.reviews_total,
+    )
+
+def run_main_target(server: MockBookingServer, args: argparse.Namespace) -> Dict[str, Any]:
+    settings = {
+        "timeout": 20,
+        "max_retries": args.max_retries,
+        "backoff_factor": args.backoff_factor,
+        "fetch_mode": args.fetch_mode,
+        "fragment_url_template": server.fragment_url_template(),
+    }
+    session = scraper_main.create_http_session(settings)
+    adapter = scraper_main.requests.adapters.HTTPAdapter(
+        pool_connections=args.concurrency, pool_maxsize=args.concurrency
+    )
+    session.mount("http://", adapter)
+
+    metrics = RunMetrics()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        results = list(
+            pool.map(
+                lambda idx: scraper_main.scrape_reviews(
+                    session=session,
+                    hotel_url=server.hotel_url(idx),
+                    max_items=args.max_items,
+                    language="en",
+                    settings=settings,
+                    metrics=metrics,
+                ),
+                range(args.hotels),
+            )
+        )
+    wall = time.perf_counter() - start
+    reviews = sum(len(result["reviews"]) for result in results)
+    return summarize(
+        f"main.scrape_reviews (concurrency={args.concurrency}, {args.fetch_mode}s)", metrics, wall, reviews
+    )
+
+def print_summary(summary: Dict[str, Any]) -> None:
+    latency = summary["latencyMs"]
+    print(
+        f"{summary['target']}: {summary['pages']} pages / {summary['reviews']} reviews "
+        f"in {summary['wallSeconds']}s -> {summary['pagesPerSec']} pages/s, "
+        f"{summary['reviewsPerSec']} reviews/s, {summary['megabytes']} MB, "
+        f"parse {summary['parseMsPerPage']} ms/page\n"
+        f"  fetch latency ms p50={latency['p50']} p95={latency['p95']} p99={latency['p99']}; "
+        f"errors={summary['fetchErrors']} retries={summary['retries']} "
+        f"backoff={summary['backoffSeconds']}s"
+    )
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load test against the mock Booking server")
+    parser.add_argument("--target", choices=("runner", "main", "both"), default="both")
+    parser.add_argument("--hotels", type=int, default=10)
+    parser.add_argument("--max-pages", type=int, default=12, help="runner maxPagesPerHotel.")
+    parser.add_argument("--max-items", type=int, default=120, help="main max_items per hotel.")
+    parser.add_argument("--concurrency", type=int, default=4, help="Parallel hotels for main.")
+    parser.add_argument(
+        "--page-concurrency", type=int, default=1, help="runner request.concurrency (pages in flight per hotel)."
+    )
+    parser.add_argument("--max-rps", type=float, help="runner request.maxRequestsPerSecond.")
+    parser.add_argument(
+        "--fetch-mode", choices=("page", "fragment"), default="page", help="request.fetchMode for both targets."
+    )
+    parser.add_argument("--max-retries", type=int, default=3)
+    parser.add_argument("--backoff-factor", type=float, default=0.1)
+    parser.add_argument("--json", type=Path, help="Also write the summaries to this file.")
+    parser.add_argument("-v", "--verbose", action="store_true")
+    add_server_arguments(parser)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO if args.verbose else logging.ERROR)
+
+    server = MockBookingServer(config_from_args(args)).start()
+    workdir = Path(tempfile.mkdtemp(prefix="load_test_"))
+    summaries: List[Dict[str, Any]] = []
+    try:
+        if args.target in {"runner", "both"}:
+            summaries.append(run_runner_target(server, args, workdir))
+            # run_scraper configures logging itself; keep the report readable
+            logging.getLogger().setLevel(logging.INFO if args.verbose else logging.ERROR)
+        if args.target in {"main", "both"}:
+            summaries.append(run_main_target(server, args))
+    finally:
+        server_stats = server.snapshot()
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    for summary in summaries:
+        print_summary(summary)
+    print(f"server: {server_stats}")
+
+    if args.json:
+        args.json.write_text(
+            json.dumps({"runs": summaries, "server": server_stats}, indent=2), encoding="utf-8"
+        )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
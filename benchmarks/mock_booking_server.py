@@ -0,0 +1,277 @@
+"""
+Local mock of Booking.com hotel review pages for load and backoff testing.
+
+Serves /hotel/<country>/<name>.html with the ``?offset=`` paging scheme of
+``booking_parser._build_page_url``, and the same reviews as bare review-list
+fragments from /reviewlist.html?cc1=<country>&pagename=<name>&offset=N
+(the ``fetchMode: "fragment"`` endpoint). ``r_lang=<code>`` selects a
+language view: a window of the hotel's review pages shifted by a per-language
+amount, so views overlap and share reviews as real language filters do.
+Every page carries a next link in
+one of the styles PaginationHandler follows (rel=next, aria-label "Next",
+data-testid="review-paginator-next"). Latency, errors, 429/Retry-After
+throttling and bandwidth are configurable.
+
+Usage: python benchmarks/mock_booking_server.py --port 8000 --latency-ms 80
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+import zlib
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from synthetic import LAYOUTS, make_review_fragment, make_review_page
+
+PAGINATOR_ROTATION = ("rel-next", "aria-label", "testid")
+FRAGMENT_PATH = "/reviewlist.html"
+# Localized and plain page names serve the same hotel
+_PAGE_NAME_RE = re.compile(r"(?:\.[a-z]{2}(?:-[a-z]{2,4})?)?\.html$")
+
+@dataclass
+class MockServerConfig:
+    reviews_per_hotel: int = 120
+    page_size: int = 10
+    layout: str = "testid"
+    # "rotate" cycles through PAGINATOR_ROTATION page by page
+    paginator: str = "rotate"
+    padding_kb: int = 50
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    rate_limit_rps: float = 0.0
+    retry_after_seconds: int = 1
+    bandwidth_kb_per_sec: float = 0.0
+    seed: int = 7
+
+class _TokenBucket:
+    def __init__(self, rate: float) -> None:
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+class MockBookingServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, config: MockServerConfig, host: str = "127.0.0.1", port: int = 0) -> None:
+        if config.layout not in LAYOUTS:
+            raise ValueError(f"Unknown layout: {config.layout}")
+        super().__init__((host, port), _Handler)
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.rng_lock = threading.Lock()
+        self.bucket = _TokenBucket(config.rate_limit_rps) if config.rate_limit_rps > 0 else None
+        self.stats_lock = threading.Lock()
+        self.stats: Dict[str, int] = {"requests": 0, "bytesSent": 0}
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def hotel_url(self, index: int) -> str:
+        return f"{self.base_url}/hotel/us/mock-hotel-{index}.en-gb.html"
+
+    def fragment_url_template(self) -> str:
+        """A ``fragmentUrlTemplate`` pointing at this server."""
+        return self.base_url + FRAGMENT_PATH + "?cc1={country}&pagename={pagename}&rows={rows}&offset={offset}"
+
+    def chance(self, probability: float) -> bool:
+        if probability <= 0:
+            return False
+        with self.rng_lock:
+            return self.rng.random() < probability
+
+    def delay(self) -> float:
+        cfg = self.config
+        with self.rng_lock:
+            jitter = self.rng.uniform(-cfg.jitter_ms, cfg.jitter_ms) if cfg.jitter_ms else 0.0
+        return max(0.0, cfg.latency_ms + jitter) / 1000
+
+    def count(self, key: str, amount: int = 1) -> None:
+        with self.stats_lock:
+            self.stats[key] = self.stats.get(key, 0) + amount
+
+    def snapshot(self) -> Dict[str, int]:
+        with self.stats_lock:
+            return dict(self.stats)
+
+    def start(self) -> "MockBookingServer":
+        self._thread = threading.Thread(target=self.serve_forever, name="mock-booking", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockBookingServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+        pass
+
+    def _send(self, status: int, body: bytes, content_type: str, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+
+        rate = self.server.config.bandwidth_kb_per_sec * 1024
+        chunk = 16 * 1024
+        for start in range(0, len(body), chunk):
+            piece = body[start : start + chunk]
+            self.wfile.write(piece)
+            if rate > 0:
+                time.sleep(len(piece) / rate)
+
+        self.server.count("requests")
+        self.server.count(f"status_{status}")
+        self.server.count("bytesSent", len(body))
+
+    def do_GET(self) -> None:  # noqa: N802
+        server = self.server
+        cfg = server.config
+        parsed = urlparse(self.path)
+
+        if parsed.path == "/__stats":
+            self._send(200, json.dumps(server.snapshot()).encode(), "application/json")
+            return
+        query = parse_qs(parsed.query)
+        fragment = parsed.path == FRAGMENT_PATH
+        if fragment:
+            hotel = f"/hotel/{query.get('cc1', [''])[0]}/{query.get('pagename', [''])[0]}"
+        elif parsed.path.startswith("/hotel/"):
+            hotel = _PAGE_NAME_RE.sub("", parsed.path)
+        else:
+            self._send(404, b"not found", "text/plain")
+            return
+
+        time.sleep(server.delay())
+
+        if (server.bucket and not server.bucket.take()) or server.chance(cfg.throttle_rate):
+            self._send(
+                429,
+                b"Too Many Requests",
+                "text/plain",
+                {"Retry-After": str(cfg.retry_after_seconds)},
+            )
+            return
+        if server.chance(cfg.error_rate):
+            self._send(503, b"Service Unavailable", "text/plain")
+            return
+
+        try:
+            offset = int(query.get("offset", ["0"])[0])
+        except ValueError:
+            offset = 0
+        remaining = max(0, cfg.reviews_per_hotel - offset)
+        page_index = offset // cfg.page_size + 1
+        paginator = (
+            PAGINATOR_ROTATION[(page_index - 1) % len(PAGINATOR_ROTATION)]
+            if cfg.paginator == "rotate"
+            else cfg.paginator
+        )
+
+        seed = cfg.seed + zlib.crc32(hotel.encode())
+        has_next = offset + cfg.page_size < cfg.reviews_per_hotel
+        # Next links keep the rest of the query (language filter, fragment params)
+        next_query = {key: values[0] for key, values in query.items()}
+        next_query["offset"] = str(offset + cfg.page_size)
+        next_href = "?" + urlencode(next_query)
+        content_page = page_index + _language_shift(query.get("r_lang", [""])[0], cfg)
+        if fragment:
+            html = make_review_fragment(
+                num_cards=min(cfg.page_size, remaining),
+                layout=cfg.layout,
+                paginator=paginator,
+                page_index=content_page,
+                seed=seed,
+                next_href=next_href,
+                has_next=has_next,
+            )
+        else:
+            html = make_review_page(
+                num_cards=min(cfg.page_size, remaining),
+                layout=cfg.layout,
+                paginator=paginator,
+                page_index=content_page,
+                seed=seed,
+                padding_kb=cfg.padding_kb,
+                total_reviews=cfg.reviews_per_hotel,
+                next_href=next_href,
+                has_next=has_next,
+            )
+        self._send(200, html.encode("utf-8"), "text/html; charset=utf-8")
+
+def _language_shift(language: str, cfg: MockServerConfig) -> int:
+    # Up to half the pages, so any two views share at least half their reviews
+    if not language:
+        return 0
+    pages = max(1, -(-cfg.reviews_per_hotel // cfg.page_size))
+    return zlib.crc32(language.encode()) % (pages // 2 + 1)
+
+def add_server_arguments(parser: argparse.ArgumentParser) -> None:
+    defaults = MockServerConfig()
+    parser.add_argument("--reviews-per-hotel", type=int, default=defaults.reviews_per_hotel)
+    parser.add_argument("--page-size", type=int, default=defaults.page_size)
+    parser.add_argument("--layout", choices=LAYOUTS, default=defaults.layout)
+    parser.add_argument(
+        "--paginator",
+        choices=("rotate",) + PAGINATOR_ROTATION,
+        default=defaults.paginator,
+    )
+    parser.add_argument("--padding-kb", type=int, default=defaults.padding_kb)
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms)
+    parser.add_argument("--jitter-ms", type=float, default=defaults.jitter_ms)
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate, help="Share of 503 responses.")
+    parser.add_argument("--throttle-rate", type=float, default=defaults.throttle_rate, help="Share of random 429 responses.")
+    parser.add_argument("--rate-limit-rps", type=float, default=defaults.rate_limit_rps, help="429 above this request rate (0 = off).")
+    parser.add_argument("--retry-after-seconds", type=int, default=defaults.retry_after_seconds)
+    parser.add_argument("--bandwidth-kb-per-sec", type=float, default=defaults.bandwidth_kb_per_sec, help="Per-response bandwidth cap (0 = off).")
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+def config_from_args(args: argparse.Namespace) -> MockServerConfig:
+    return MockServerConfig(**{key: getattr(args, key) for key in asdict(MockServerConfig())})
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Mock Booking.com review server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    add_server_arguments(parser)
+    args = parser.parse_args()
+
+    server = MockBookingServer(config_from_args(args), host=args.host, port=args.port)
+    print(f"Serving mock Booking pages on {server.base_url} (e.g. {server.hotel_url(1)})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
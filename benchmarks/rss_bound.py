@@ -0,0 +1,178 @@
+"""
+Peak-RSS check for the memory-bounded export mode.
+
+Each run streams synthetic hotels through ``StreamingExporter`` in a fresh
+interpreter and reports how far peak RSS rose above the baseline taken
+after the imports. With ``memoryLimitMb`` set the tabular writers spill to
+disk, so the rise must not grow with the number of hotels: the check fails
+if going from ``--hotels`` to ``--scale`` times as many raises peak RSS by
+more than ``--tolerance-mb``, or if the rise exceeds ``--ceiling-mb``.
+Keep the small run above the limit so both runs actually spill.
+``--compare`` also runs the unbounded mode for reference.
+
+``--target main`` checks ``main.py`` instead: ``scrape_reviews`` collects
+``--hotels`` x ``--reviews-per-hotel`` reviews of one hotel from a mock
+server in the child into its spill buffer (``output.memory_limit_mb``),
+and ``export_dataset`` writes them. ``--normalize`` turns on review
+normalization in either target.
+
+Usage: python benchmarks/rss_bound.py --hotels 200 --scale 4 --memory-limit-mb 2
+       python benchmarks/rss_bound.py --target main --normalize --hotels 40 --memory-limit-mb 0.5
+"""
+import argparse
+import json
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC_DIR = ROOT / "src"
+
+# Runs inside the child interpreter; prints one JSON line.
+_PROBE = """
+import json, resource, sys, tempfile
+sys.path[:0] = [{src!r}, {bench!r}]
+import pandas, openpyxl
+from outputs.streaming import StreamingExporter
+from synthetic import make_reviews
+
+def peak_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+make_reviews(10)
+baseline = peak_mb()
+with tempfile.TemporaryDirectory() as tmp:
+    sink = StreamingExporter(
+        tmp,
+        "rss",
+        {formats!r},
+        memory_limit_mb={limit!r},
+        spill_dir=tmp + "/spill",
+        normalize={normalize!r},
+    )
+    for hotel in range({hotels}):
+        sink.push(make_reviews({per_hotel}, seed=hotel, start=hotel * {per_hotel}))
+    sink.close()
+print(json.dumps({{"baselineMb": baseline, "peakMb": peak_mb(), "reviews": sink.review_count}}))
+"""
+
+# main.py's collect-then-export path against a mock server in the child
+_MAIN_PROBE = """
+import json, resource, sys, tempfile
+sys.path[:0] = [{src!r}, {bench!r}]
+import pandas, openpyxl
+import main
+from mock_booking_server import MockBookingServer, MockServerConfig
+from outputs.dataset_exporter import export_dataset
+
+def peak_mb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 1024 / 1024 if sys.platform == "darwin" else rss / 1024
+
+reviews = {hotels} * {per_hotel}
+server = MockBookingServer(MockServerConfig(reviews_per_hotel=reviews, padding_kb=0)).start()
+baseline = peak_mb()
+with tempfile.TemporaryDirectory() as tmp:
+    settings = {{
+        "fetch_mode": "fragment",
+        "fragment_url_template": server.fragment_url_template(),
+        "output": {{
+            "memory_limit_mb": {limit!r},
+            "spill_directory": tmp + "/spill",
+            "normalize": {normalize!r},
+        }},
+    }}
+    session = main.create_http_session(settings)
+    result = main.scrape_reviews(session, server.hotel_url(0), reviews, None, settings)
+    export_dataset(
+        hotel_stats=result["hotelStats"],
+        reviews=result["reviews"],
+        base_output_path=tmp + "/rss.json",
+        formats={formats!r},
+        memory_limit_mb={limit!r},
+        normalized={normalize!r},
+    )
+    count = len(result["reviews"])
+server.stop()
+print(json.dumps({{"baselineMb": baseline, "peakMb": peak_mb(), "reviews": count}}))
+"""
+
+def probe(
+    hotels: int,
+    per_hotel: int,
+    formats: List[str],
+    limit: Optional[float],
+    target: str = "exporter",
+    normalize: bool = False,
+) -> Dict[str, Any]:
+    code = (_MAIN_PROBE if target == "main" else _PROBE).format(
+        src=str(SRC_DIR),
+        bench=str(ROOT / "benchmarks"),
+        formats=formats,
+        limit=limit,
+        hotels=hotels,
+        per_hotel=per_hotel,
+        normalize=normalize,
+    )
+    out = subprocess.run(
+        [sys.executable, "-c", code], check=True, capture_output=True, text=True
+    ).stdout
+    result = json.loads(out.strip().splitlines()[-1])
+    result["riseMb"] = result["peakMb"] - result["baselineMb"]
+    return result
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Check that spilled exports keep peak RSS flat")
+    parser.add_argument("--hotels", type=int, default=200, help="Hotels in the small run.")
+    parser.add_argument("--scale", type=int, default=4, help="The large run has this many times more hotels.")
+    parser.add_argument("--reviews-per-hotel", type=int, default=50)
+    parser.add_argument("--formats", default="json,csv,html", help="Comma-separated export formats.")
+    parser.add_argument("--memory-limit-mb", type=float, default=2.0)
+    parser.add_argument("--tolerance-mb", type=float, default=16.0, help="Allowed RSS growth from small to large run.")
+    parser.add_argument("--ceiling-mb", type=float, default=64.0, help="Allowed RSS rise over the baseline.")
+    parser.add_argument("--compare", action="store_true", help="Also run without a memory limit.")
+    parser.add_argument(
+        "--target",
+        choices=("exporter", "main"),
+        default="exporter",
+        help="StreamingExporter (runner) or main.py's scrape_reviews and export_dataset.",
+    )
+    parser.add_argument("--normalize", action="store_true", help="Normalize reviews (outputs.normalize).")
+    args = parser.parse_args()
+
+    formats = [fmt.strip() for fmt in args.formats.split(",") if fmt.strip()]
+    sizes = (args.hotels, args.hotels * args.scale)
+    limits: List[Optional[float]] = [args.memory_limit_mb] + ([None] if args.compare else [])
+
+    rises: Dict[int, float] = {}
+    for limit in limits:
+        label = f"limit {limit:g} MB" if limit else "unbounded"
+        for hotels in sizes:
+            result = probe(
+                hotels, args.reviews_per_hotel, formats, limit, args.target, args.normalize
+            )
+            print(
+                f"{label:>14}: {hotels:6d} hotels, {result['reviews']:8d} reviews, "
+                f"peak {result['peakMb']:7.1f} MB (+{result['riseMb']:6.1f} MB over baseline)"
+            )
+            if limit:
+                rises[hotels] = result["riseMb"]
+
+    failures: List[str] = []
+    growth = rises[sizes[1]] - rises[sizes[0]]
+    if growth > args.tolerance_mb:
+        failures.append(
+            f"peak RSS grew {growth:.1f} MB from {sizes[0]} to {sizes[1]} hotels "
+            f"(tolerance {args.tolerance_mb:.1f} MB)"
+        )
+    if rises[sizes[1]] > args.ceiling_mb:
+        failures.append(f"peak RSS rose {rises[sizes[1]]:.1f} MB (ceiling {args.ceiling_mb:.1f} MB)")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
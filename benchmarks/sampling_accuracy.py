@@ -0,0 +1,121 @@
+"""
+Compare sampled scrapes against full scrapes on the local mock server.
+
+Runs ``runner.run_scraper`` once over every review page of each hotel and
+once in sampling mode, then reports the page requests of both runs, the
+error of each sampled rating estimate against the full-crawl mean, and how
+often the confidence interval covers it.
+
+Usage:
+    python benchmarks/sampling_accuracy.py --hotels 20 --reviews-per-hotel 2000 \\
+        --sample-pages 10 --padding-kb 0
+"""
+import argparse
+import json
+import logging
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+from statistics import fmean
+from typing import Any, Dict, List, Optional
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+if str(SRC_DIR) not in sys.path:
+    sys.path.insert(0, str(SRC_DIR))
+
+import runner  # noqa: E402
+from instrumentation.metrics import RunMetrics  # noqa: E402
+from mock_booking_server import (  # noqa: E402
+    MockBookingServer,
+    add_server_arguments,
+    config_from_args,
+)
+
+def crawl(server: MockBookingServer, args: argparse.Namespace, workdir: Path, sample: bool) -> Path:
+    input_file = workdir / "urls.txt"
+    input_file.write_text(
+        "\n".join(server.hotel_url(i) for i in range(args.hotels)) + "\n", encoding="utf-8"
+    )
+    output_dir = workdir / ("sampled" if sample else "full")
+    config_file = workdir / "config.json"
+    config_file.write_text(
+        json.dumps(
+            {
+                "maxPagesPerHotel": args.reviews_per_hotel // args.page_size + 1,
+                "outputDirectory": str(output_dir),
+                "outputFormats": ["json"],
+                "request": {
+                    "timeoutSeconds": 20,
+                    "delayBetweenRequestsSeconds": 0,
+                    "concurrency": args.page_concurrency,
+                },
+                "sampling": {
+                    "pagesPerHotel": args.sample_pages,
+                    "confidence": args.confidence,
+                    "seed": args.sample_seed,
+                },
+            }
+        ),
+        encoding="utf-8",
+    )
+    runner.run_scraper(input_file, config_file, metrics=RunMetrics(), sample=sample)
+    logging.getLogger().setLevel(logging.ERROR)
+    return output_dir
+
+def true_means(output_dir: Path) -> Dict[str, float]:
+    reviews = json.loads(next(output_dir.glob("booking_reviews_*[0-9].json")).read_text(encoding="utf-8"))
+    ratings: Dict[str, List[float]] = {}
+    for review in reviews:
+        ratings.setdefault(review["hotelId"], []).append(float(review["rating"]))
+    return {hotel: fmean(values) for hotel, values in ratings.items()}
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Sampled vs full scrape accuracy")
+    parser.add_argument("--hotels", type=int, default=20)
+    parser.add_argument("--sample-pages", type=int, default=10)
+    parser.add_argument("--confidence", type=float, default=0.95)
+    parser.add_argument("--sample-seed", default="bench")
+    parser.add_argument("--page-concurrency", type=int, default=8)
+    add_server_arguments(parser)
+    parser.set_defaults(reviews_per_hotel=2000, padding_kb=0)
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+
+    server = MockBookingServer(config_from_args(args)).start()
+    workdir = Path(tempfile.mkdtemp(prefix="sampling_"))
+    try:
+        full_dir = crawl(server, args, workdir, sample=False)
+        full_requests = server.snapshot()["requests"]
+        sampled_dir = crawl(server, args, workdir, sample=True)
+        sampled_requests = server.snapshot()["requests"] - full_requests
+
+        truth = true_means(full_dir)
+        estimates: Dict[str, Any] = json.loads(
+            next(sampled_dir.glob("*.estimates.json")).read_text(encoding="utf-8")
+        )["hotels"]
+    finally:
+        server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    errors = []
+    covered = 0
+    widths = []
+    for hotel, estimate in estimates.items():
+        rating = estimate["averageRating"]
+        errors.append(abs(rating["estimate"] - truth[hotel]))
+        covered += rating["low"] <= truth[hotel] <= rating["high"]
+        widths.append(rating["high"] - rating["low"])
+
+    print(
+        f"full:    {full_requests} requests for {len(truth)} hotels\n"
+        f"sampled: {sampled_requests} requests "
+        f"({full_requests / max(sampled_requests, 1):.1f}x fewer)\n"
+        f"rating error: mean {fmean(errors):.3f}, max {max(errors):.3f}; "
+        f"mean {args.confidence:.0%} interval width {fmean(widths):.3f}; "
+        f"covered {covered}/{len(estimates)}"
+    )
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
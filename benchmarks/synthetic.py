@@ -0,0 +1,182 @@
+"""
+Synthetic Booking.com review data for the benchmarks.
+
+Pages mimic the two markup generations the parser understands (the
+``data-testid`` review cards and the legacy ``.c-review-block`` list items)
+and the paginator variants PaginationHandler looks for.
+"""
+import random
+from html import escape
+from typing import Any, Dict, List, Optional
+
+LAYOUTS = ("testid", "legacy")
+PAGINATORS = ("rel-next", "aria-label", "testid", "none")
+
+WORDS = (
+    "clean friendly staff location breakfast room bed quiet noisy small "
+    "spacious view pool parking helpful dated modern comfortable shower"
+).split()
+COUNTRIES = ["United Kingdom", "Germany", "France", "Japan", "Netherlands"]
+ROOMS = ["King Room", "Double Room", "Suite", "Twin Room"]
+MONTHS = ["January", "April", "July", "October"]
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choices(WORDS, k=rng.randint(low, high)))
+
+def make_reviews(count: int, seed: int = 7, start: int = 0) -> List[Dict[str, Any]]:
+    """Review dictionaries shaped like ``asdict(Review)``."""
+    rng = random.Random(seed)
+    reviews = []
+    for idx in range(start, start + count):
+        reviews.append(
+            {
+                "id": f"{idx:016x}",
+                "hotelId": f"us/hotel-{idx % 50}",
+                "reviewPage": idx // 10 + 1,
+                "userName": f"Guest {idx}",
+                "userLocation": rng.choice(COUNTRIES),
+                "roomInfo": rng.choice(ROOMS),
+                "stayDate": f"{rng.choice(MONTHS)} {rng.randint(2019, 2024)}",
+                "stayLength": f"{rng.randint(1, 7)} nights",
+                "reviewDate": f"{rng.choice(MONTHS)} {rng.randint(1, 28)}, 2024",
+                "reviewTitle": _sentence(rng, 2, 6),
+                "rating": f"{rng.uniform(1, 10):.1f}",
+                "reviewTextParts": {
+                    "Liked": _sentence(rng, 5, 40),
+                    "Disliked": _sentence(rng, 0, 20),
+                },
+                "customData": {},
+            }
+        )
+    return reviews
+
+def _testid_card(review: Dict[str, Any]) -> str:
+    parts = review["reviewTextParts"]
+    return (
+        '<div data-testid="review-card" class="review-card">'
+        f'<span data-testid="reviewer-name">{escape(review["userName"])}</span>'
+        f'<span data-testid="reviewer-origin">{escape(review["userLocation"])}</span>'
+        f'<span data-testid="review-room-info">{escape(review["roomInfo"])}</span>'
+        f'<span data-testid="review-stay-date">{escape(review["stayDate"])}</span>'
+        f'<span data-testid="review-stay-length">{escape(review["stayLength"])}</span>'
+        '<span data-testid="review-traveler-type">Couple</span>'
+        f'<span data-testid="review-date">Reviewed: {escape(review["reviewDate"])}</span>'
+        f'<h3 data-testid="review-title">{escape(review["reviewTitle"])}</h3>'
+        f'<div data-testid="review-score">Scored {review["rating"]}</div>'
+        f'<div data-testid="review-positive">{escape(parts["Liked"])}</div>'
+        f'<div data-testid="review-negative">{escape(parts["Disliked"])}</div>'
+        "</div>"
+    )
+
+def _legacy_card(review: Dict[str, Any]) -> str:
+    parts = review["reviewTextParts"]
+    return (
+        '<li class="review_list_new_item_block"><div class="c-review-block">'
+        '<div class="bui-avatar-block">'
+        f'<span class="bui-avatar-block__title">{escape(review["userName"])}</span>'
+        f'<span class="bui-avatar-block__subtitle">{escape(review["userLocation"])}</span>'
+        "</div>"
+        f'<div class="c-review-block__room-info">{escape(review["roomInfo"])}</div>'
+        f'<span class="c-review-block__stay-date">{escape(review["stayDate"])}</span>'
+        f'<span class="c-review-block__stay-length">{escape(review["stayLength"])}</span>'
+        f'<span class="c-review-block__date">Reviewed: {escape(review["reviewDate"])}</span>'
+        f'<h3 class="c-review-block__title">{escape(review["reviewTitle"])}</h3>'
+        f'<div class="bui-review-score__badge">{review["rating"]}</div>'
+        '<div class="c-review">'
+        '<div class="c-review__row c-review__row--positive">'
+        f'<span class="c-review__body">{escape(parts["Liked"])}</span></div>'
+        '<div class="c-review__row c-review__row--negative">'
+        f'<span class="c-review__body">{escape(parts["Disliked"])}</span></div>'
+        "</div></div></li>"
+    )
+
+def _hotel_stats(total_reviews: int) -> str:
+    subscores = "".join(
+        '<div data-testid="review-subscore">'
+        f'<span class="c-score-bar__title">{name}</span>'
+        f'<span class="c-score-bar__score">{score}</span></div>'
+        for name, score in (("Staff", "9.1"), ("Cleanliness", "8.7"), ("Location", "9.4"))
+    )
+    return (
+        '<div data-testid="review-score-component">Scored 8.9 '
+        f"<span>Fabulous</span> <span>{total_reviews:,} reviews</span></div>"
+        f"{subscores}"
+    )
+
+def _paginator(variant: str, next_href: Optional[str]) -> str:
+    # A few unrelated links first, so the link scans do some real work
+    filler = "".join(f'<a href="/hotel/us/page-{i}.html">Page {i}</a>' for i in range(1, 6))
+    if variant == "none" or not next_href:
+        return f'<nav class="bui-pagination">{filler}</nav>'
+    if variant == "rel-next":
+        link = f'<a rel="next" href="{next_href}">2</a>'
+    elif variant == "aria-label":
+        link = f'<a aria-label="Next page" href="{next_href}"><span></span></a>'
+    elif variant == "testid":
+        link = f'<a data-testid="review-paginator-next" href="{next_href}"><span></span></a>'
+    else:
+        raise ValueError(f"Unknown paginator variant: {variant}")
+    return f'<nav class="bui-pagination">{filler}{link}</nav>'
+
+def make_review_fragment(
+    num_cards: int = 10,
+    layout: str = "testid",
+    paginator: str = "rel-next",
+    page_index: int = 1,
+    seed: int = 7,
+    next_href: Optional[str] = None,
+    has_next: bool = True,
+) -> str:
+    """
+    Build the review list and paginator alone, as returned by Booking.com's
+    review-list endpoint and embedded in ``make_review_page``.
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"Unknown layout: {layout}")
+
+    first_review = (page_index - 1) * num_cards
+    reviews = make_reviews(num_cards, seed=seed + page_index, start=first_review)
+    render = _testid_card if layout == "testid" else _legacy_card
+    cards = "".join(render(r) for r in reviews)
+    container = (
+        f'<div data-testid="review-list">{cards}</div>'
+        if layout == "testid"
+        else f'<ul class="review_list">{cards}</ul>'
+    )
+
+    if not has_next or not num_cards:
+        next_href = None
+    elif next_href is None:
+        next_href = f"?offset={page_index * num_cards}"
+    return f"{container}{_paginator(paginator, next_href)}"
+
+def make_review_page(
+    num_cards: int = 10,
+    layout: str = "testid",
+    paginator: str = "rel-next",
+    page_index: int = 1,
+    seed: int = 7,
+    padding_kb: int = 0,
+    total_reviews: Optional[int] = None,
+    next_href: Optional[str] = None,
+    has_next: bool = True,
+) -> str:
+    """
+    Build a synthetic hotel review page.
+
+    ``padding_kb`` adds unrelated markup to approximate the weight of a full
+    hotel page around the review list. ``total_reviews`` adds the hotel's
+    review count and sub-scores; ``next_href`` overrides the default
+    ``?offset=`` next-page link and ``has_next=False`` drops it.
+    """
+    fragment = make_review_fragment(
+        num_cards, layout, paginator, page_index, seed, next_href, has_next
+    )
+    padding = '<div class="facility">Free WiFi</div>' * (padding_kb * 1024 // 36)
+    stats = _hotel_stats(total_reviews) if total_reviews is not None else ""
+
+    return (
+        "<!DOCTYPE html><html><head><title>Example Hotel</title></head><body>"
+        f"{padding}{stats}{fragment}"
+        "</body></html>"
+    )
@@ -0,0 +1,280 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("distributed.queue")
+
+DEFAULT_LEASE_SECONDS = 120.0
+DEFAULT_MAX_ATTEMPTS = 3
+
+PENDING = "pending"
+LEASED = "leased"
+DONE = "done"
+FAILED = "failed"
+
+# queue_meta key set once the queue has been filled
+SEALED_KEY = "sealed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS work_items (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL UNIQUE,
+    customData TEXT NOT NULL,
+    priority REAL NOT NULL DEFAULT 0,
+    maxPages INTEGER,
+    status TEXT NOT NULL DEFAULT 'pending',
+    workerId TEXT,
+    leasedUntil REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    reviewCount INTEGER,
+    shardPath TEXT,
+    lastError TEXT,
+    updatedAt REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_work_items_status ON work_items (status, leasedUntil);
+CREATE INDEX IF NOT EXISTS idx_work_items_priority ON work_items (priority DESC, id);
+CREATE TABLE IF NOT EXISTS queue_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+@dataclass
+class Lease:
+    id: int
+    url: str
+    customData: Dict[str, Any]
+    attempts: int
+    maxPages: Optional[int] = None
+
+class WorkQueue:
+    """
+    Lease-based work queue of hotel URLs in a shared SQLite database.
+
+    Workers (threads, processes or hosts sharing the file) ``claim`` items
+    under a time-limited lease and keep it alive with ``heartbeat``. Items
+    whose lease ran out are claimable again, so a crashed worker's hotels
+    are picked up by the others; after ``max_attempts`` an item is marked
+    failed. Every state change is a short ``BEGIN IMMEDIATE`` transaction.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str,
+        lease_seconds: float = DEFAULT_LEASE_SECONDS,
+        max_attempts: int = DEFAULT_MAX_ATTEMPTS,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._conn = sqlite3.connect(
+            str(self.db_path), timeout=30.0, isolation_level=None, check_same_thread=False
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        # The connection is shared with the heartbeat thread
+        self._lock = threading.Lock()
+
+    def close(self) -> None:
+        self._conn.close()
+
+    def _transaction(self) -> "_Transaction":
+        return _Transaction(self._conn, self._lock)
+
+    def enqueue(self, items: Iterable[Tuple[Any, ...]]) -> int:
+        """
+        Add ``(url, customData)`` or ``(url, customData, priority, maxPages)``
+        items. Higher priorities are claimed first; ``maxPages`` overrides
+        the configured page limit for that hotel. URLs already in the queue
+        are kept, but a still-pending one takes the new priority and page
+        limit. Returns the number of rows added or updated.
+        """
+        now = time.time()
+        rows = []
+        for item in items:
+            url, custom = item[0], item[1]
+            priority, max_pages = (item[2], item[3]) if len(item) > 2 else (0.0, None)
+            rows.append((url, json.dumps(custom or {}, ensure_ascii=False), priority, max_pages, now))
+        with self._transaction() as conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT INTO work_items (url, customData, priority, maxPages, updatedAt) "
+                "VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(url) DO UPDATE SET priority = excluded.priority, "
+                "maxPages = excluded.maxPages, updatedAt = excluded.updatedAt "
+                "WHERE status = 'pending'",
+                rows,
+            )
+            changed = conn.total_changes - before
+        logger.info("Enqueued or updated %d URLs in '%s'.", changed, self.db_path)
+        return changed
+
+    def claim(self, worker_id: str, limit: int = 1) -> List[Lease]:
+        """Lease up to ``limit`` pending or expired items for ``worker_id``."""
+        now = time.time()
+        with self._transaction() as conn:
+            # Expired leases that used up their attempts are given up on
+            conn.execute(
+                "UPDATE work_items SET status = ?, workerId = NULL, leasedUntil = NULL, "
+                "lastError = 'lease expired', updatedAt = ? "
+                "WHERE status = ? AND leasedUntil < ? AND attempts >= ?",
+                (FAILED, now, LEASED, now, self.max_attempts),
+            )
+            rows = conn.execute(
+                "SELECT id, url, customData, attempts, maxPages FROM work_items "
+                "WHERE status = ? OR (status = ? AND leasedUntil < ?) "
+                "ORDER BY priority DESC, id LIMIT ?",
+                (PENDING, LEASED, now, limit),
+            ).fetchall()
+            conn.executemany(
+                "UPDATE work_items SET status = ?, workerId = ?, leasedUntil = ?, "
+                "attempts = attempts + 1, updatedAt = ? WHERE id = ?",
+                [(LEASED, worker_id, now + self.lease_seconds, now, row[0]) for row in rows],
+            )
+        return [Lease(row[0], row[1], json.loads(row[2]), row[3] + 1, row[4]) for row in rows]
+
+    def heartbeat(self, worker_id: str, item_ids: Iterable[int]) -> int:
+        """Extend the worker's leases on ``item_ids``; returns how many it still holds."""
+        ids = list(item_ids)
+        if not ids:
+            return 0
+        now = time.time()
+        with self._transaction() as conn:
+            cur = conn.executemany(
+                "UPDATE work_items SET leasedUntil = ?, updatedAt = ? "
+                "WHERE id = ? AND status = ? AND workerId = ?",
+                [(now + self.lease_seconds, now, item_id, LEASED, worker_id) for item_id in ids],
+            )
+            return cur.rowcount
+
+    def complete(self, worker_id: str, item_id: int, review_count: int, shard_path: Optional[Path]) -> bool:
+        """
+        Mark an item done. Returns False if the lease was lost (expired and
+        re-claimed by another worker), in which case the result is dropped.
+        """
+        with self._transaction() as conn:
+            cur = conn.execute(
+                "UPDATE work_items SET status = ?, reviewCount = ?, shardPath = ?, "
+                "leasedUntil = NULL, lastError = NULL, updatedAt = ? "
+                "WHERE id = ? AND status = ? AND workerId = ?",
+                (
+                    DONE,
+                    review_count,
+                    str(shard_path) if shard_path else None,
+                    time.time(),
+                    item_id,
+                    LEASED,
+                    worker_id,
+                ),
+            )
+            return cur.rowcount == 1
+
+    def fail(self, worker_id: str, item_id: int, error: str) -> None:
+        """Release an item after an error: back to pending, or failed after ``max_attempts``."""
+        with self._transaction() as conn:
+            conn.execute(
+                "UPDATE work_items SET "
+                "status = CASE WHEN attempts >= ? THEN ? ELSE ? END, "
+                "workerId = NULL, leasedUntil = NULL, lastError = ?, updatedAt = ? "
+                "WHERE id = ? AND status = ? AND workerId = ?",
+                (self.max_attempts, FAILED, PENDING, error, time.time(), item_id, LEASED, worker_id),
+            )
+
+    def counts(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT status, COUNT(*) FROM work_items GROUP BY status"
+            ).fetchall()
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        counts.update(dict(rows))
+        return counts
+
+    def seal(self) -> None:
+        """
+        Mark the queue as filled. Until an enqueuer has sealed it, an empty
+        queue is waiting for work rather than drained.
+        """
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO queue_meta (key, value) VALUES (?, ?)",
+                (SEALED_KEY, str(time.time())),
+            )
+
+    def is_sealed(self) -> bool:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT 1 FROM queue_meta WHERE key = ?", (SEALED_KEY,)
+            ).fetchone()
+        return row is not None
+
+    def is_drained(self) -> bool:
+        """Sealed, with nothing pending or leased."""
+        if not self.is_sealed():
+            return False
+        counts = self.counts()
+        return counts[PENDING] == 0 and counts[LEASED] == 0
+
+    def done_shards(self) -> List[Tuple[str, Path]]:
+        """``(url, shard path)`` of every completed item, in queue order."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT url, shardPath FROM work_items WHERE status = ? AND shardPath IS NOT NULL "
+                "ORDER BY id",
+                (DONE,),
+            ).fetchall()
+        return [(row[0], Path(row[1])) for row in rows]
+
+    def try_acquire(self, key: str, owner: str, when_finished: bool = False) -> bool:
+        """
+        One-shot named claim (e.g. who merges the shards); first caller wins.
+        With ``when_finished`` the claim is only taken once the queue is
+        sealed, holds at least one item and every item is done or failed,
+        checked in the same transaction.
+        """
+        with self._transaction() as conn:
+            if when_finished:
+                sealed = conn.execute(
+                    "SELECT 1 FROM queue_meta WHERE key = ?", (SEALED_KEY,)
+                ).fetchone()
+                total, finished = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(status IN (?, ?)), 0) FROM work_items",
+                    (DONE, FAILED),
+                ).fetchone()
+                if sealed is None or total == 0 or finished != total:
+                    return False
+            cur = conn.execute(
+                "INSERT OR IGNORE INTO queue_meta (key, value) VALUES (?, ?)", (key, owner)
+            )
+            return cur.rowcount == 1
+
+    def release(self, key: str) -> None:
+        """Drop a named claim so that a later caller can take it."""
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM queue_meta WHERE key = ?", (key,))
+
+class _Transaction:
+    def __init__(self, conn: sqlite3.Connection, lock: threading.Lock) -> None:
+        self.conn = conn
+        self.lock = lock
+
+    def __enter__(self) -> sqlite3.Connection:
+        self.lock.acquire()
+        try:
+            self.conn.execute("BEGIN IMMEDIATE")
+        except BaseException:
+            self.lock.release()
+            raise
+        return self.conn
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        try:
+            self.conn.execute("COMMIT" if exc_type is None else "ROLLBACK")
+        finally:
+            self.lock.release()
@@ -0,0 +1,201 @@
+import json
+import logging
+import os
+import socket
+import threading
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from distributed.work_queue import Lease, WorkQueue
+from extractors.booking_parser import fetch_reviews_for_url, fragment_template
+from extractors.rate_limiter import RateLimiter
+from instrumentation.metrics import RunMetrics
+from outputs.streaming import DEFAULT_MAX_PENDING_BATCHES, StreamingExporter
+
+logger = logging.getLogger("distributed.worker")
+
+MERGE_KEY = "merge"
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+class _Heartbeat(threading.Thread):
+    """Renews the worker's leases every third of the lease period."""
+
+    def __init__(self, queue: WorkQueue, worker_id: str) -> None:
+        super().__init__(name="lease-heartbeat", daemon=True)
+        self.queue = queue
+        self.worker_id = worker_id
+        self.held: Set[int] = set()
+        self.stop_event = threading.Event()
+
+    def run(self) -> None:
+        interval = max(self.queue.lease_seconds / 3, 0.5)
+        while not self.stop_event.wait(interval):
+            held = list(self.held)
+            try:
+                renewed = self.queue.heartbeat(self.worker_id, held)
+            except Exception as exc:  # keep beating; the next renewal may succeed
+                logger.warning("Lease heartbeat failed: %s", exc)
+                continue
+            if renewed < len(held):
+                logger.warning("Lost %d of %d leases.", len(held) - renewed, len(held))
+
+def _write_shard(shard_dir: Path, lease: Lease, reviews: List[Dict[str, Any]]) -> Path:
+    # Written under a temporary name and renamed, so a shard either exists
+    # complete or not at all
+    path = shard_dir / f"item-{lease.id:08d}.json"
+    tmp_path = path.with_suffix(".json.tmp")
+    with tmp_path.open("w", encoding="utf-8") as f:
+        json.dump(reviews, f, ensure_ascii=False)
+    tmp_path.replace(path)
+    return path
+
+def run_worker(
+    queue: WorkQueue,
+    config: Dict[str, Any],
+    shard_dir: Path,
+    worker_id: Optional[str] = None,
+    metrics: Optional[RunMetrics] = None,
+) -> int:
+    """
+    Claim and scrape hotels until the queue is drained. A queue that no
+    enqueuer has sealed yet is waited on, however empty.
+
+    Each finished hotel's reviews are written to their own shard file in
+    ``shard_dir`` before the item is marked done, so a crash never loses a
+    completed hotel and never leaves a half-written one. Returns the number
+    of hotels this worker completed.
+    """
+    worker_id = worker_id or default_worker_id()
+    metrics = metrics or RunMetrics()
+    shard_dir.mkdir(parents=True, exist_ok=True)
+
+    max_pages = int(config.get("maxPagesPerHotel", 2))
+    request_cfg = config.get("request", {})
+    delay_seconds = float(request_cfg.get("delayBetweenRequestsSeconds", 1.0))
+    timeout_seconds = float(request_cfg.get("timeoutSeconds", 20))
+    user_agent = str(request_cfg.get("userAgent"))
+    concurrency = int(request_cfg.get("concurrency", 1))
+    rate_limiter = RateLimiter(request_cfg.get("maxRequestsPerSecond"))
+    fragment_url_template = fragment_template(
+        request_cfg.get("fetchMode"), request_cfg.get("fragmentUrlTemplate")
+    )
+    idle_seconds = min(queue.lease_seconds / 4, 5.0)
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_maxsize=max(10, concurrency))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    heartbeat = _Heartbeat(queue, worker_id)
+    heartbeat.start()
+    completed = 0
+    logger.info("Worker %s started.", worker_id)
+
+    try:
+        while True:
+            leases = queue.claim(worker_id)
+            if not leases:
+                if queue.is_drained():
+                    break
+                # Not yet filled by an enqueuer, or other workers still hold
+                # leases that may expire; wait and retry
+                time.sleep(idle_seconds)
+                continue
+
+            lease = leases[0]
+            heartbeat.held.add(lease.id)
+            if metrics.profiler:
+                metrics.profiler.hotel_started()
+            try:
+                reviews = fetch_reviews_for_url(
+                    url=lease.url,
+                    max_pages=lease.maxPages or max_pages,
+                    timeout_seconds=timeout_seconds,
+                    user_agent=user_agent,
+                    custom_data=lease.customData,
+                    metrics=metrics,
+                    session=session,
+                    concurrency=concurrency,
+                    rate_limiter=rate_limiter,
+                    fragment_url_template=fragment_url_template,
+                )
+                records = [asdict(r) for r in reviews]
+                shard_path = _write_shard(shard_dir, lease, records)
+            except Exception as exc:
+                logger.error("Worker %s: '%s' failed: %s", worker_id, lease.url, exc)
+                queue.fail(worker_id, lease.id, str(exc))
+            else:
+                if queue.complete(worker_id, lease.id, len(records), shard_path):
+                    completed += 1
+                    logger.info(
+                        "Worker %s: %d reviews from %s (attempt %d).",
+                        worker_id,
+                        len(records),
+                        lease.url,
+                        lease.attempts,
+                    )
+                else:
+                    logger.warning("Worker %s: lease on '%s' was lost; result dropped.", worker_id, lease.url)
+            finally:
+                heartbeat.held.discard(lease.id)
+
+            if delay_seconds > 0:
+                time.sleep(delay_seconds)
+    finally:
+        heartbeat.stop_event.set()
+        heartbeat.join()
+
+    logger.info("Worker %s finished: %d hotels completed.", worker_id, completed)
+    return completed
+
+def merge_shards(
+    queue: WorkQueue,
+    output_dir: Path,
+    base_filename: str,
+    formats: List[str],
+    format_options: Optional[Dict[str, Dict[str, Any]]] = None,
+    max_pending_batches: int = DEFAULT_MAX_PENDING_BATCHES,
+    metrics: Optional[RunMetrics] = None,
+    on_shard: Optional[Callable[[str, List[Dict[str, Any]]], None]] = None,
+    memory_limit_mb: Optional[float] = None,
+    spill_dir: Optional[Path | str] = None,
+    normalize: bool = False,
+) -> Dict[str, Path]:
+    """
+    Stream every completed shard, in queue order, into the configured
+    output formats. Reviews seen in more than one shard (a hotel listed
+    twice under different URLs) are written once. ``on_shard`` is called
+    with each shard's URL and reviews. ``memory_limit_mb``, ``spill_dir``
+    and ``normalize`` are passed on to the ``StreamingExporter``.
+    """
+    sink = StreamingExporter(
+        output_dir=output_dir,
+        base_filename=base_filename,
+        formats=formats,
+        format_options=format_options,
+        max_pending_batches=max_pending_batches,
+        metrics=metrics,
+        memory_limit_mb=memory_limit_mb,
+        spill_dir=spill_dir,
+        normalize=normalize,
+    )
+    seen: Set[str] = set()
+    shards = queue.done_shards()
+    for url, shard_path in shards:
+        with shard_path.open("r", encoding="utf-8") as f:
+            reviews = json.load(f)
+        if on_shard:
+            on_shard(url, reviews)
+        fresh = [r for r in reviews if r["id"] not in seen]
+        seen.update(r["id"] for r in fresh)
+        sink.push(fresh)
+
+    export_map = sink.close()
+    logger.info("Merged %d shards (%d reviews) into %s.", len(shards), sink.review_count, output_dir)
+    return export_map
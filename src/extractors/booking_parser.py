@@ -1,17 +1,43 @@
-thonimport logging
-import uuid
+import hashlib
+import logging
+import math
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Any, Dict, List, Optional
-from urllib.parse import urlparse
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs, parse_qsl, urlencode, urlsplit, urlunsplit
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
+from extractors.rate_limiter import RateLimiter
+from extractors.request_coalescer import SHARED_COALESCER, RequestCoalescer
+from extractors.urls import canonical_url, hotel_key
 from extractors.utils_cleaner import (
     clean_text,
     extract_numeric,
+    make_soup,
     safe_get_text,
 )
+from instrumentation.metrics import RunMetrics
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+# Reviews per page in Booking.com's ``offset=`` pagination
+REVIEWS_PER_PAGE = 10
+
+# "page" downloads the full hotel page for every review page; "fragment"
+# downloads only the review list for pages after the first
+FETCH_MODES = ("page", "fragment")
+# Booking.com's review-list endpoint, which returns the review cards and the
+# paginator without the rest of the hotel page. Placeholders: {origin}
+# (scheme and host), {country}, {pagename}, {rows} and {offset}.
+DEFAULT_FRAGMENT_URL_TEMPLATE = (
+    "{origin}/reviewlist.html?cc1={country}&pagename={pagename}"
+    "&rows={rows}&offset={offset}&type=total"
+)
 
 @dataclass
 class Review:
@@ -30,33 +56,91 @@ class Review:
     customData: Dict[str, Any] = field(default_factory=dict)
 
 def _derive_hotel_id(url: str) -> str:
-    parsed = urlparse(url)
-    path = parsed.path.strip("/")
+    # Canonical, so language variants and fragments map to one hotel
+    path = hotel_key(url)
     if not path:
-        return parsed.netloc or "unknown"
+        return urlsplit(url).netloc.lower() or "unknown"
     return path
 
-def _build_page_url(base_url: str, page_index: int) -> str:
+_HTML_EXT_RE = re.compile(r"\.html?$")
+
+def fragment_template(fetch_mode: Optional[str], template: Optional[str] = None) -> Optional[str]:
+    """
+    The review-list URL template for ``fetch_mode`` ("page" or "fragment"),
+    or None when full pages are fetched.
+    """
+    mode = (fetch_mode or "page").lower()
+    if mode not in FETCH_MODES:
+        raise ValueError(f"Unknown fetch mode: {fetch_mode!r} (expected one of {FETCH_MODES})")
+    if mode == "page":
+        return None
+    return template or DEFAULT_FRAGMENT_URL_TEMPLATE
+
+def build_fragment_url(hotel_url: str, offset: int, template: str = DEFAULT_FRAGMENT_URL_TEMPLATE) -> str:
+    """
+    Fill ``template`` for the review list of ``hotel_url`` starting at
+    ``offset``. Query parameters of ``hotel_url`` that the template does not
+    set (e.g. a review language filter) are carried over.
+    """
+    parts = urlsplit(canonical_url(hotel_url))
+    segments = [s for s in parts.path.split("/") if s]
+    pagename = _HTML_EXT_RE.sub("", segments[-1]) if segments else ""
+    # /hotel/<country>/<pagename>.html
+    country = segments[-2] if len(segments) >= 3 else ""
+    url = template.format(
+        origin=f"{parts.scheme}://{parts.netloc}",
+        country=country,
+        pagename=pagename,
+        rows=REVIEWS_PER_PAGE,
+        offset=offset,
+    )
+    if not parts.query:
+        return url
+
+    target = urlsplit(url)
+    query = parse_qsl(target.query, keep_blank_values=True)
+    present = {key for key, _ in query} | {"offset"}
+    query += [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k not in present]
+    return urlunsplit(target._replace(query=urlencode(query)))
+
+def page_offset(url: str) -> Optional[int]:
+    """The ``offset=`` query parameter of a page URL, if any."""
+    values = parse_qs(urlsplit(url).query).get("offset")
+    try:
+        return int(values[0]) if values else None
+    except ValueError:
+        return None
+
+def _build_page_url(base_url: str, page_index: int, fragment_url_template: Optional[str] = None) -> str:
     """
     Build a page URL for subsequent review pages.
 
     This is a heuristic and may need to be tuned for real-world use.
     For the first page we return the original URL. For subsequent pages
-    we append an offset parameter commonly used by Booking.com.
+    we append an offset parameter commonly used by Booking.com, or, with
+    ``fragment_url_template``, request only the review-list fragment.
     """
     if page_index <= 1:
         return base_url
 
+    if fragment_url_template:
+        return build_fragment_url(base_url, (page_index - 1) * REVIEWS_PER_PAGE, fragment_url_template)
+
     separator = "&" if "?" in base_url else "?"
-    offset = (page_index - 1) * 10
+    offset = (page_index - 1) * REVIEWS_PER_PAGE
     return f"{base_url}{separator}offset={offset}"
 
+def _stable_review_id(hotel_id: str, *fields: str) -> str:
+    """
+    Derive a review ID from the hotel and the review's own content, so the
+    same review gets the same ID on every run (and can be upserted).
+    """
+    digest = hashlib.sha1("\x1f".join((hotel_id, *fields)).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
 def _parse_review_block(
     block: Any, hotel_id: str, page_index: int, custom_data: Dict[str, Any]
 ) -> Optional[Review]:
-    # Basic identity fields
-    review_id = uuid.uuid4().hex[:16]
-
     # Name and location
     user_name = (
         safe_get_text(block, '[data-testid="reviewer-name"]')
@@ -117,6 +201,18 @@ def _parse_review_block(
     if not any([user_name, review_title, rating]):
         return None
 
+    review_id = _stable_review_id(
+        hotel_id,
+        user_name,
+        user_location,
+        stay_date,
+        review_date,
+        review_title,
+        rating,
+        text_parts.get("Liked", ""),
+        text_parts.get("Disliked", ""),
+    )
+
     return Review(
         id=review_id,
         hotelId=hotel_id,
@@ -133,24 +229,123 @@ def _parse_review_block(
         customData=custom_data or {},
     )
 
-def _parse_reviews_from_html(
-    html: str, hotel_id: str, page_index: int, custom_data: Dict[str, Any]
-) -> List[Review]:
-    soup = BeautifulSoup(html, "lxml")
+_NON_DIGIT_RE = re.compile(r"\D")
+_NON_SLUG_RE = re.compile(r"[^a-z0-9]+")
+_REVIEW_COUNT_RE = re.compile(r"(\d{1,3}(?:[,.\s]\d{3})+|\d+)\s+reviews?", re.IGNORECASE)
 
+def _select_review_blocks(soup: "BeautifulSoup") -> List[Any]:
     # Try newer Booking.com layouts first
     review_blocks = soup.select('[data-testid="review-card"]')
     if not review_blocks:
         # Fallback to legacy review block class
         review_blocks = soup.select(".review_list_new_item_block")
+    return review_blocks
+
+def _parse_hotel_stats(soup: "BeautifulSoup") -> Optional[Dict[str, Any]]:
+    """
+    Extract the hotel's total review count and category sub-scores, in the
+    ``hotelStats`` layout of ``data/output.sample.json``.
+    """
+    count_text = (
+        safe_get_text(soup, '[data-testid="review-score-component"]')
+        or safe_get_text(soup, ".bui-review-score__text")
+    )
+    match = _REVIEW_COUNT_RE.search(count_text)
+    total_reviews = int(_NON_DIGIT_RE.sub("", match.group(1))) if match else None
+
+    scores: Dict[str, Any] = {}
+    for sub in soup.select('[data-testid="review-subscore"], .v2_review-scores__subscore'):
+        translation = safe_get_text(sub, ".c-score-bar__title")
+        score = extract_numeric(safe_get_text(sub, ".c-score-bar__score"), default="")
+        if not translation or not score:
+            continue
+        key = "hotel_" + _NON_SLUG_RE.sub("_", translation.lower()).strip("_")
+        scores[key] = {"score": float(score), "translation": translation}
+
+    if total_reviews is None and not scores:
+        return None
+    return {"totalReviews": total_reviews, "scores": scores}
+
+def _parse_page(
+    html: str,
+    hotel_id: str,
+    page_index: int,
+    custom_data: Dict[str, Any],
+    want_total: bool = False,
+) -> Tuple[List[Review], Optional[int]]:
+    soup = make_soup(html)
 
     reviews: List[Review] = []
-    for block in review_blocks:
+    for block in _select_review_blocks(soup):
         review = _parse_review_block(block, hotel_id, page_index, custom_data)
         if review:
             reviews.append(review)
 
-    return reviews
+    total_reviews = None
+    if want_total:
+        stats = _parse_hotel_stats(soup)
+        total_reviews = stats["totalReviews"] if stats else None
+    return reviews, total_reviews
+
+def _parse_reviews_from_html(
+    html: str, hotel_id: str, page_index: int, custom_data: Dict[str, Any]
+) -> List[Review]:
+    return _parse_page(html, hotel_id, page_index, custom_data)[0]
+
+class BookingReviewParser:
+    """
+    Parses review pages into ``(hotel_stats, reviews)``, with reviews in the
+    dataset layout written by ``outputs.dataset_exporter`` (score, title,
+    positive/negative content, guest and booking details).
+    """
+
+    def __init__(self, language_hint: Optional[str] = None, hotel_id: str = "") -> None:
+        self.language_hint = language_hint
+        self.hotel_id = hotel_id
+        self.pages_parsed = 0
+
+    def parse(self, html: str) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        self.pages_parsed += 1
+        soup = make_soup(html)
+
+        reviews: List[Dict[str, Any]] = []
+        for block in _select_review_blocks(soup):
+            review = _parse_review_block(block, self.hotel_id, self.pages_parsed, {})
+            if review:
+                reviews.append(self._to_dataset_review(block, review))
+
+        return _parse_hotel_stats(soup), reviews
+
+    def _to_dataset_review(self, block: Any, review: Review) -> Dict[str, Any]:
+        traveller_type = (
+            safe_get_text(block, '[data-testid="review-traveler-type"]')
+            or safe_get_text(block, ".review-panel-wide__traveller_type")
+        )
+        nights = extract_numeric(review.stayLength, default="")
+
+        return {
+            "id": review.id,
+            "hotelId": review.hotelId,
+            "score": float(review.rating) if review.rating else None,
+            "reviewDate": review.reviewDate,
+            "title": review.reviewTitle,
+            "positiveContent": review.reviewTextParts.get("Liked"),
+            "negativeContent": review.reviewTextParts.get("Disliked"),
+            "language": self.language_hint,
+            "guest": {
+                "name": review.userName,
+                "country": review.userLocation,
+                "type": traveller_type or None,
+            },
+            "booking": {
+                "roomType": review.roomInfo,
+                "checkIn": None,
+                "checkOut": None,
+                "nights": int(float(nights)) if nights else None,
+                "customerType": None,
+            },
+            "photos": [],
+        }
 
 def fetch_reviews_for_url(
     url: str,
@@ -158,6 +353,14 @@ def fetch_reviews_for_url(
     timeout_seconds: float = 20.0,
     user_agent: Optional[str] = None,
     custom_data: Optional[Dict[str, Any]] = None,
+    metrics: Optional[RunMetrics] = None,
+    session: Optional[requests.Session] = None,
+    max_items: Optional[int] = None,
+    concurrency: int = 1,
+    rate_limiter: Optional[RateLimiter] = None,
+    coalescer: Optional[RequestCoalescer] = None,
+    fragment_url_template: Optional[str] = None,
+    page_sampler: Optional[Callable[[int], Sequence[int]]] = None,
 ) -> List[Review]:
     """
     Fetch reviews for a single Booking.com hotel URL.
@@ -174,13 +377,49 @@ def fetch_reviews_for_url(
         Custom User-Agent header.
     custom_data: Optional[Dict[str, Any]]
         Arbitrary metadata that will be attached to each review.
+    metrics: Optional[RunMetrics]
+        Run metrics to record fetch and parse timings into.
+    session: Optional[requests.Session]
+        Session to reuse (keeps connections warm across calls); a new one
+        is created when omitted.
+    max_items: Optional[int]
+        Stop once this many reviews have been collected.
+    concurrency: int
+        Pages fetched in parallel. Above 1, the hotel's total review count
+        is read from the first page and all remaining offsets are fetched
+        at once; without a total, pages are walked one by one.
+    rate_limiter: Optional[RateLimiter]
+        Shared limiter every page request waits on.
+    coalescer: Optional[RequestCoalescer]
+        Concurrent requests for the same page (from other threads, jobs or
+        runs in this process) share one fetch. Defaults to the
+        process-wide coalescer.
+    fragment_url_template: Optional[str]
+        Fetch pages after the first from the review-list endpoint built
+        from this template (see ``DEFAULT_FRAGMENT_URL_TEMPLATE``) instead
+        of downloading the full hotel page again. The first page is always
+        the hotel page, which carries the total review count.
+    page_sampler: Optional[Callable[[int], Sequence[int]]]
+        Called with the hotel's total review count from the first page;
+        returns the page indexes to fetch (page 1 is already fetched)
+        instead of the newest ``max_pages``. Without a total the pages are
+        walked one by one as usual.
 
     Returns
     -------
     List[Review]
+        Reviews in page order.
     """
     logger = logging.getLogger("booking_parser")
-    session = requests.Session()
+    if session is None:
+        session = requests.Session()
+        if concurrency > 1:
+            adapter = HTTPAdapter(pool_maxsize=concurrency)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+    metrics = metrics or RunMetrics()
+    rate_limiter = rate_limiter or RateLimiter()
+    coalescer = coalescer or SHARED_COALESCER
 
     headers = {}
     if user_agent:
@@ -190,31 +429,56 @@ def fetch_reviews_for_url(
     all_reviews: List[Review] = []
 
     logger.debug(
-        "Fetching reviews for hotel '%s' from URL '%s' (max_pages=%d)",
+        "Fetching reviews for hotel '%s' from URL '%s' (max_pages=%d, concurrency=%d)",
         hotel_id,
         url,
         max_pages,
+        concurrency,
     )
 
-    for page_index in range(1, max_pages + 1):
-        page_url = _build_page_url(url, page_index)
-        logger.debug("Requesting page %d: %s", page_index, page_url)
-
+    def download(page_url: str, page_index: int) -> Optional[str]:
+        rate_limiter.wait()
+        fetch_start = time.perf_counter()
         try:
-            resp = session.get(page_url, headers=headers, timeout=timeout_seconds)
+            with metrics.stage("fetch"):
+                resp = session.get(page_url, headers=headers, timeout=timeout_seconds)
             resp.raise_for_status()
         except requests.RequestException as exc:
+            metrics.observe_fetch(page_url, time.perf_counter() - fetch_start, ok=False)
             logger.warning(
                 "Request for '%s' (page %d) failed: %s", page_url, page_index, exc
             )
-            break
+            return None
+        metrics.observe_fetch(
+            page_url, time.perf_counter() - fetch_start, nbytes=len(resp.content)
+        )
+        return resp.text
 
-        reviews = _parse_reviews_from_html(
-            resp.text,
-            hotel_id=hotel_id,
-            page_index=page_index,
-            custom_data=custom_data or {},
+    def fetch_page(page_index: int) -> Optional[Tuple[List[Review], Optional[int]]]:
+        page_url = _build_page_url(url, page_index, fragment_url_template)
+        logger.debug("Requesting page %d: %s", page_index, page_url)
+
+        # The language stays in the key: localized pages are different responses
+        html, shared = coalescer.do(
+            canonical_url(page_url, strip_language=False),
+            lambda: download(page_url, page_index),
         )
+        if shared:
+            metrics.observe_coalesced(page_url)
+            logger.debug("Page %d of '%s' shared a concurrent request.", page_index, hotel_id)
+        if html is None:
+            return None
+
+        parse_start = time.perf_counter()
+        with metrics.stage("parse"):
+            reviews, total = _parse_page(
+                html,
+                hotel_id=hotel_id,
+                page_index=page_index,
+                custom_data=custom_data or {},
+                want_total=page_index == 1 and (concurrency > 1 or page_sampler is not None),
+            )
+        metrics.observe_parse(time.perf_counter() - parse_start, len(reviews))
 
         logger.info(
             "Parsed %d reviews from page %d for hotel '%s'.",
@@ -222,14 +486,53 @@ def fetch_reviews_for_url(
             page_index,
             hotel_id,
         )
-        all_reviews.extend(reviews)
-
-        # Basic heuristic: if a page has no reviews, assume we've reached the end
-        if not reviews:
-            logger.debug("No reviews found on page %d; stopping pagination.", page_index)
-            break
+        return reviews, total
+
+    first = fetch_page(1)
+    total_reviews = first[1] if first else None
+    if first:
+        all_reviews.extend(first[0])
+
+    if first and first[0] and total_reviews is not None:
+        # Fan out: every remaining offset is known up front
+        if page_sampler is not None:
+            pages = sorted(p for p in set(page_sampler(total_reviews)) if p > 1)
+        else:
+            last_page = min(max_pages, math.ceil(total_reviews / REVIEWS_PER_PAGE))
+            if max_items is not None:
+                last_page = min(last_page, math.ceil(max_items / REVIEWS_PER_PAGE))
+            pages = list(range(2, last_page + 1))
+        logger.debug(
+            "Hotel '%s' has %d reviews; fetching %d more pages with %d workers.",
+            hotel_id,
+            total_reviews,
+            len(pages),
+            concurrency,
+        )
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            # map() yields in page order, whatever order the pages finish in
+            for result in pool.map(fetch_page, pages):
+                if result:
+                    all_reviews.extend(result[0])
+    elif first and first[0]:
+        for page_index in range(2, max_pages + 1):
+            if max_items is not None and len(all_reviews) >= max_items:
+                logger.debug("Reached max_items (%d); stopping pagination.", max_items)
+                break
+            result = fetch_page(page_index)
+            if result is None:
+                break
+            all_reviews.extend(result[0])
+
+            # Basic heuristic: if a page has no reviews, assume we've reached the end
+            if not result[0]:
+                logger.debug("No reviews found on page %d; stopping pagination.", page_index)
+                break
+
+    if max_items is not None:
+        del all_reviews[max_items:]
 
     logger.info(
         "Total reviews collected for '%s': %d", hotel_id, len(all_reviews)
     )
-    return all_reviews
\ No newline at end of file
+    return all_reviews
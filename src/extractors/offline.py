@@ -0,0 +1,133 @@
+import logging
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from extractors.booking_parser import REVIEWS_PER_PAGE, _derive_hotel_id, _parse_reviews_from_html
+
+logger = logging.getLogger("extractors.offline")
+
+DEFAULT_HOST = "www.booking.com"
+# Tasks kept in flight per process; bounds the parsed pages waiting to be exported
+_WINDOW_PER_PROCESS = 4
+
+# The query string survives in mirrored file names as "?offset=10" or, with
+# wget --restrict-file-names=windows, "@offset=10"
+_QUERY_SPLIT_RE = re.compile(r"[?@]")
+_OFFSET_RE = re.compile(r"(?:^|[?@&;])offset=(\d+)")
+
+@dataclass
+class SavedPage:
+    path: Path
+    url: str
+    hotelId: str
+    pageIndex: int
+
+def _is_host(part: str) -> bool:
+    return "booking." in part and not part.lower().endswith((".htm", ".html"))
+
+def saved_page(path: Path, root: Path) -> Optional[SavedPage]:
+    """
+    Map a mirrored file to the URL it was saved from, e.g.
+    ``www.booking.com/hotel/us/x.en-gb.html@offset=20`` becomes page 3 of
+    ``https://www.booking.com/hotel/us/x.en-gb.html``. Files that are not
+    HTML pages return None.
+    """
+    name = path.name
+    stem = _QUERY_SPLIT_RE.split(name, 1)[0]
+    if not stem.lower().endswith((".htm", ".html")):
+        return None
+
+    parts = path.resolve().parts
+    host_idx = next((i for i in range(len(parts) - 2, -1, -1) if _is_host(parts[i])), None)
+    if host_idx is not None:
+        host, dirs = parts[host_idx], parts[host_idx + 1 : -1]
+    else:
+        host, dirs = DEFAULT_HOST, path.relative_to(root).parts[:-1]
+
+    url = f"https://{host}/" + "/".join((*dirs, stem))
+    query = name[len(stem) :]
+    match = _OFFSET_RE.search(query)
+    page_index = int(match.group(1)) // REVIEWS_PER_PAGE + 1 if match else 1
+    return SavedPage(path=path, url=url, hotelId=_derive_hotel_id(url), pageIndex=page_index)
+
+def discover_pages(root: Path | str) -> List[SavedPage]:
+    """Saved review pages under ``root``, grouped by hotel in page order."""
+    root = Path(root)
+    pages = []
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            page = saved_page(Path(dirpath) / filename, root)
+            if page:
+                pages.append(page)
+    pages.sort(key=lambda p: (p.hotelId, p.pageIndex, p.path.name))
+    return pages
+
+def _parse_saved_page(page: SavedPage) -> Tuple[SavedPage, List[Dict[str, Any]], float, Optional[str]]:
+    # Runs in a worker process; reads the file itself so only the path and
+    # the parsed records cross the process boundary
+    start = time.perf_counter()
+    try:
+        html = page.path.read_text(encoding="utf-8", errors="replace")
+        reviews = _parse_reviews_from_html(html, page.hotelId, page.pageIndex, {})
+    except Exception as exc:
+        return page, [], time.perf_counter() - start, str(exc)
+    return page, [asdict(r) for r in reviews], time.perf_counter() - start, None
+
+def _parse_in_order(
+    pages: Iterable[SavedPage], processes: int
+) -> Iterator[Tuple[SavedPage, List[Dict[str, Any]], float, Optional[str]]]:
+    if processes <= 1:
+        for page in pages:
+            yield _parse_saved_page(page)
+        return
+
+    remaining = iter(pages)
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        window: Deque[Future] = deque(
+            pool.submit(_parse_saved_page, page)
+            for page in islice(remaining, processes * _WINDOW_PER_PROCESS)
+        )
+        while window:
+            result = window.popleft().result()
+            page = next(remaining, None)
+            if page is not None:
+                window.append(pool.submit(_parse_saved_page, page))
+            yield result
+
+def reextract_pages(
+    pages: Iterable[SavedPage],
+    processes: Optional[int] = None,
+    on_page: Optional[Callable[[SavedPage, float, int], None]] = None,
+) -> Iterator[Tuple[str, List[Dict[str, Any]]]]:
+    """
+    Parse saved pages across a process pool and yield ``(hotelId, reviews)``
+    per hotel, in the order of ``pages`` (as returned by ``discover_pages``).
+
+    At most a few pages per process are parsed ahead of the consumer, so a
+    slow exporter holds the pool back instead of piling up results.
+    ``on_page(page, seconds, review_count)`` is called for every parsed
+    page. Unreadable pages are logged and skipped.
+    """
+    processes = processes or os.cpu_count() or 1
+    hotel_id: Optional[str] = None
+    batch: List[Dict[str, Any]] = []
+    for page, records, seconds, error in _parse_in_order(pages, processes):
+        if error:
+            logger.warning("Could not parse '%s': %s", page.path, error)
+            continue
+        if on_page:
+            on_page(page, seconds, len(records))
+        if page.hotelId != hotel_id:
+            if hotel_id is not None:
+                yield hotel_id, batch
+            hotel_id, batch = page.hotelId, []
+        batch.extend(records)
+    if hotel_id is not None:
+        yield hotel_id, batch
@@ -4,7 +4,12 @@ from typing import Generator, Optional
 from urllib.parse import urljoin
 
 import requests
-from bs4 import BeautifulSoup
+
+from extractors.booking_parser import build_fragment_url, page_offset
+from extractors.request_coalescer import SHARED_COALESCER, RequestCoalescer
+from extractors.urls import canonical_url
+from extractors.utils_cleaner import make_soup
+from instrumentation.metrics import RunMetrics, proxy_label
 
 logger = logging.getLogger("booking_reviews_scraper.pagination")
 
@@ -23,16 +28,27 @@ class PaginationHandler:
         timeout: int = 15,
         max_retries: int = 3,
         backoff_factor: float = 0.5,
+        metrics: Optional[RunMetrics] = None,
+        coalescer: Optional[RequestCoalescer] = None,
+        fragment_url_template: Optional[str] = None,
     ) -> None:
         self.session = session
         self.timeout = timeout
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
+        self.metrics = metrics or RunMetrics()
+        # Concurrent scrapes of the same page share one fetch (and its retries)
+        self.coalescer = coalescer or SHARED_COALESCER
+        # When set, pages after the first are requested from the review-list
+        # endpoint instead of as full hotel pages
+        self.fragment_url_template = fragment_url_template
 
     def iter_pages(self, start_url: str) -> Generator[str, None, None]:
         """
         Yield HTML for each page starting from start_url until there is
-        no "next page" link or an error occurs.
+        no "next page" link or an error occurs. With a fragment URL
+        template, the offset of each next link is requested as a review-list
+        fragment, and the fragments' own paginators drive the walk.
         """
         current_url = start_url
         visited_urls = set()
@@ -40,7 +56,7 @@ class PaginationHandler:
         while current_url and current_url not in visited_urls:
             visited_urls.add(current_url)
             logger.debug("Fetching page: %s", current_url)
-            html = self._fetch(current_url)
+            html = self._fetch_shared(current_url)
             if not html:
                 logger.warning("Empty response for %s, stopping pagination.", current_url)
                 break
@@ -48,7 +64,8 @@ class PaginationHandler:
             yield html
 
             try:
-                next_url = self._find_next_page_url(html, current_url)
+                with self.metrics.stage("parse"):
+                    next_url = self._find_next_page_url(html, current_url)
             except Exception as exc:
                 logger.debug("Error while resolving next page: %s", exc, exc_info=True)
                 next_url = None
@@ -57,21 +74,49 @@ class PaginationHandler:
                 logger.info("No further pages detected after %s.", current_url)
                 break
 
+            if self.fragment_url_template:
+                offset = page_offset(next_url)
+                if offset is not None:
+                    next_url = build_fragment_url(start_url, offset, self.fragment_url_template)
+
             current_url = next_url
 
+    def _fetch_shared(self, url: str) -> Optional[str]:
+        html, shared = self.coalescer.do(
+            canonical_url(url, strip_language=False), lambda: self._fetch(url)
+        )
+        if shared:
+            self.metrics.observe_coalesced(url)
+            logger.debug("Shared an in-flight request for %s", url)
+        return html
+
     def _fetch(self, url: str) -> Optional[str]:
         last_exception: Optional[Exception] = None
+        proxy = proxy_label(getattr(self.session, "proxies", None), url)
 
         for attempt in range(1, self.max_retries + 1):
+            start = time.perf_counter()
             try:
-                resp = self.session.get(url, timeout=self.timeout)
+                with self.metrics.stage("fetch"):
+                    resp = self.session.get(url, timeout=self.timeout)
                 if resp.status_code >= 400:
                     logger.warning("HTTP %s while requesting %s", resp.status_code, url)
                 resp.raise_for_status()
+                self.metrics.observe_fetch(
+                    url, time.perf_counter() - start, nbytes=len(resp.content), proxy=proxy
+                )
                 return resp.text
             except Exception as exc:
+                self.metrics.observe_fetch(url, time.perf_counter() - start, proxy=proxy, ok=False)
                 last_exception = exc
+                if attempt >= self.max_retries:
+                    # No retry follows the last attempt, so nothing to count or wait for
+                    logger.warning(
+                        "Request attempt %d/%d failed for %s: %s", attempt, self.max_retries, url, exc
+                    )
+                    break
                 sleep_time = self.backoff_factor * (2 ** (attempt - 1))
+                self.metrics.observe_retry(url, sleep_time)
                 logger.warning(
                     "Request attempt %d/%d failed for %s: %s. Retrying in %.1fs",
                     attempt,
@@ -86,7 +131,7 @@ class PaginationHandler:
         return None
 
     def _find_next_page_url(self, html: str, current_url: str) -> Optional[str]:
-        soup = BeautifulSoup(html, "lxml")
+        soup = make_soup(html)
 
         # Strategy 1: <a rel="next" ...>
         next_link = soup.find("a", rel="next")
@@ -0,0 +1,24 @@
+import threading
+import time
+from typing import Optional
+
+class RateLimiter:
+    """
+    Spaces requests at least ``1 / rate`` seconds apart across all threads
+    sharing the limiter. ``rate=None`` (or 0) disables the limit.
+    """
+
+    def __init__(self, rate: Optional[float] = None) -> None:
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
@@ -0,0 +1,44 @@
+import threading
+from concurrent.futures import Future
+from typing import Callable, Dict, Tuple, TypeVar
+
+T = TypeVar("T")
+
+class RequestCoalescer:
+    """
+    Collapses concurrent calls for the same key into one: the first caller
+    runs ``fn`` while later callers with that key wait and share its result
+    (or exception). Nothing is cached; once the call finishes the next one
+    for the key runs again.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._in_flight: Dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """Return ``(result, shared)``; ``shared`` is True for waiting callers."""
+        with self._lock:
+            future = self._in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._in_flight[key] = future
+        if not leader:
+            return future.result(), True
+
+        try:
+            result = fn()
+        except BaseException as exc:
+            future.set_exception(exc)
+            raise
+        else:
+            future.set_result(result)
+            return result, False
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+# Shared by every fetcher in the process, so concurrent runs, jobs and
+# threads asking for the same page trigger a single request
+SHARED_COALESCER = RequestCoalescer()
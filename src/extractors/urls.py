@@ -0,0 +1,59 @@
+import logging
+import re
+from typing import Any, Dict, Iterable, List, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+logger = logging.getLogger("extractors.urls")
+
+# Query parameter that filters a review list to one review language
+DEFAULT_LANGUAGE_PARAM = "r_lang"
+
+# Booking.com localized page names: "x.en-gb.html", "x.de.html", "x.zh-tw.html"
+_LANGUAGE_SUFFIX_RE = re.compile(r"\.[a-z]{2}(?:-[a-z]{2,4})?(?=\.html?$)", re.IGNORECASE)
+
+def canonical_url(url: str, strip_language: bool = True) -> str:
+    """
+    Normalize a hotel or page URL so that the same page has one spelling:
+    the fragment is dropped, scheme and host are lowercased, query
+    parameters are sorted and, with ``strip_language``, the language suffix
+    of the page name is removed (``x.en-gb.html`` -> ``x.html``).
+    """
+    parts = urlsplit(url.strip())
+    path = _LANGUAGE_SUFFIX_RE.sub("", parts.path) if strip_language else parts.path
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), path, query, ""))
+
+def hotel_key(url: str) -> str:
+    """The canonical URL path, which identifies the hotel."""
+    return urlsplit(canonical_url(url)).path.strip("/")
+
+def language_url(url: str, language: str, param: str = DEFAULT_LANGUAGE_PARAM) -> str:
+    """``url`` with its review list filtered to ``language`` (``?r_lang=de``)."""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != param]
+    query.append((param, language))
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(sorted(query)), parts.fragment))
+
+def dedupe_hotel_urls(
+    urls: Iterable[Tuple[str, Dict[str, Any]]],
+) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Keep one ``(url, customData)`` entry per hotel (by ``hotel_key``), in
+    first-seen order. The kept URL is canonicalized but keeps its language
+    suffix, so the localized page the user asked for is the one fetched.
+    The ``customData`` of duplicates is merged into the first entry's; on
+    conflicting keys the first value is kept.
+    """
+    merged: Dict[str, Tuple[str, Dict[str, Any]]] = {}
+    duplicates = 0
+    for url, custom_data in urls:
+        key = hotel_key(url) or url
+        if key in merged:
+            duplicates += 1
+            first_url, first_custom = merged[key]
+            merged[key] = (first_url, {**(custom_data or {}), **first_custom})
+        else:
+            merged[key] = (canonical_url(url, strip_language=False), dict(custom_data or {}))
+    if duplicates:
+        logger.info("Merged %d duplicate hotel URLs.", duplicates)
+    return list(merged.values())
@@ -1,16 +1,33 @@
-thonimport logging
+import logging
 import re
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-from bs4 import BeautifulSoup
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
 
 logger = logging.getLogger("utils_cleaner")
 
+# Compiled once; used for every field of every review and by the batch
+# normalization in outputs.normalize
+WHITESPACE_RE = re.compile(r"\s+")
+NUMBER_RE = re.compile(r"(\d+(?:\.\d+)?)")
+# Leading label of a scraped date, e.g. "Reviewed: January 12, 2022"
+DATE_LABEL_RE = re.compile(r"^[^\d:]*:\s*")
+
+def make_soup(html: str) -> "BeautifulSoup":
+    """
+    Parse HTML with lxml. bs4 (and lxml) are imported here rather than at
+    module level so entry points only pay for them once a page is parsed.
+    """
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, "lxml")
+
 def clean_text(value: str | None) -> str:
     if not value:
         return ""
     # Replace multiple whitespace with a single space
-    cleaned = re.sub(r"\s+", " ", value)
+    cleaned = WHITESPACE_RE.sub(" ", value)
     return cleaned.strip()
 
 def extract_numeric(value: str | None, default: str = "") -> str:
@@ -20,13 +37,13 @@ def extract_numeric(value: str | None, default: str = "") -> str:
     """
     if not value:
         return default
-    match = re.search(r"(\d+(?:\.\d+)?)", value)
+    match = NUMBER_RE.search(value)
     if not match:
         return default
     return match.group(1)
 
 def safe_get_text(
-    root: BeautifulSoup | Any,
+    root: "BeautifulSoup | Any",
     selector: str,
     default: str = "",
 ) -> str:
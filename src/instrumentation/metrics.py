@@ -0,0 +1,290 @@
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    from instrumentation.profiling import StageProfiler
+
+logger = logging.getLogger("instrumentation.metrics")
+
+PROMETHEUS_PREFIX = "booking_scraper"
+
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+PARSE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+REVIEWS_PER_PAGE_BUCKETS = (0, 1, 5, 10, 25, 50, 100)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+class Histogram:
+    """Cumulative-bucket histogram compatible with the Prometheus layout."""
+
+    def __init__(self, buckets: Sequence[float]) -> None:
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.count += 1
+        self.sum += value
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[idx] += 1
+
+    def merge(self, other: "Histogram") -> None:
+        if other.buckets != self.buckets:
+            raise ValueError("Cannot merge histograms with different buckets")
+        self.count += other.count
+        self.sum += other.sum
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the ``q`` quantile by linear interpolation inside the
+        matching bucket (as Prometheus' histogram_quantile does).
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        lower_bound, lower_count = 0.0, 0
+        for bound, cumulative in zip(self.buckets, self.counts):
+            if cumulative >= rank:
+                if cumulative == lower_count:
+                    return bound
+                share = (rank - lower_count) / (cumulative - lower_count)
+                return lower_bound + (bound - lower_bound) * share
+            lower_bound, lower_count = bound, cumulative
+        return self.buckets[-1] if self.buckets else None
+
+    def to_dict(self) -> Dict[str, Any]:
+        quantiles = {f"p{int(q * 100)}": self.quantile(q) for q in (0.5, 0.95, 0.99)}
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else None,
+            **{k: round(v, 6) if v is not None else None for k, v in quantiles.items()},
+            "buckets": {str(b): c for b, c in zip(self.buckets, self.counts)},
+        }
+
+def host_label(url: str) -> str:
+    return urlparse(url).netloc or "unknown"
+
+def proxy_label(proxies: Optional[Dict[str, Any]], url: str) -> str:
+    """Proxy host:port used for ``url`` (credentials stripped) or "direct"."""
+    if not proxies:
+        return "direct"
+    proxy = proxies.get(urlparse(url).scheme) or proxies.get("all")
+    if not proxy:
+        return "direct"
+    parsed = urlparse(proxy)
+    if not parsed.hostname:
+        return "direct"
+    return f"{parsed.hostname}:{parsed.port}" if parsed.port else parsed.hostname
+
+class RunMetrics:
+    """
+    Thread-safe per-run counters and histograms for every scraper stage:
+    fetch (latency per host/proxy, bytes, errors, retries, backoff), parse
+    (time and reviews per page) and export (time per format).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.fetch_latency: Dict[Labels, Histogram] = {}
+        self.bytes_downloaded: Dict[Labels, int] = {}
+        self.pages_fetched: Dict[Labels, int] = {}
+        self.fetch_errors: Dict[Labels, int] = {}
+        self.retries: Dict[Labels, int] = {}
+        self.coalesced: Dict[Labels, int] = {}
+        self.backoff_seconds: Dict[Labels, float] = {}
+        self.parse_seconds = Histogram(PARSE_BUCKETS)
+        self.reviews_per_page = Histogram(REVIEWS_PER_PAGE_BUCKETS)
+        self.export_seconds: Dict[Labels, float] = {}
+        self.reviews_total = 0
+        self.profiler: Optional["StageProfiler"] = None
+
+    # -- recording -------------------------------------------------------
+
+    def observe_fetch(
+        self,
+        url: str,
+        seconds: float,
+        nbytes: int = 0,
+        proxy: str = "direct",
+        ok: bool = True,
+    ) -> None:
+        labels: Labels = (("host", host_label(url)), ("proxy", proxy))
+        with self._lock:
+            self.fetch_latency.setdefault(labels, Histogram(LATENCY_BUCKETS)).observe(seconds)
+            if ok:
+                self.pages_fetched[labels] = self.pages_fetched.get(labels, 0) + 1
+                self.bytes_downloaded[labels] = self.bytes_downloaded.get(labels, 0) + nbytes
+            else:
+                self.fetch_errors[labels] = self.fetch_errors.get(labels, 0) + 1
+
+    def observe_retry(self, url: str, backoff_seconds: float) -> None:
+        labels: Labels = (("host", host_label(url)),)
+        with self._lock:
+            self.retries[labels] = self.retries.get(labels, 0) + 1
+            self.backoff_seconds[labels] = self.backoff_seconds.get(labels, 0.0) + backoff_seconds
+
+    def observe_coalesced(self, url: str) -> None:
+        labels: Labels = (("host", host_label(url)),)
+        with self._lock:
+            self.coalesced[labels] = self.coalesced.get(labels, 0) + 1
+
+    def observe_parse(self, seconds: float, reviews: int) -> None:
+        with self._lock:
+            self.parse_seconds.observe(seconds)
+            self.reviews_per_page.observe(reviews)
+            self.reviews_total += reviews
+
+    def observe_export(self, fmt: str, seconds: float) -> None:
+        labels: Labels = (("format", fmt),)
+        with self._lock:
+            self.export_seconds[labels] = self.export_seconds.get(labels, 0.0) + seconds
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Profile the enclosed block as stage ``name`` if a profiler is attached."""
+        if self.profiler is None:
+            yield
+            return
+        with self.profiler.stage(name):
+            yield
+
+    @contextmanager
+    def time_export(self, fmt: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            with self.stage("export"):
+                yield
+        finally:
+            self.observe_export(fmt, time.perf_counter() - start)
+
+    def finish(self) -> None:
+        self.finished_at = time.time()
+
+    # -- reporting -------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            finished_at = self.finished_at or time.time()
+            duration = max(finished_at - self.started_at, 1e-9)
+            pages = sum(self.pages_fetched.values())
+
+            def keyed(values: Dict[Labels, Any]) -> List[Dict[str, Any]]:
+                return [
+                    {**dict(labels), "value": round(v, 6) if isinstance(v, float) else v}
+                    for labels, v in values.items()
+                ]
+
+            return {
+                "startedAt": datetime.fromtimestamp(self.started_at, timezone.utc).isoformat(),
+                "finishedAt": datetime.fromtimestamp(finished_at, timezone.utc).isoformat(),
+                "durationSeconds": round(duration, 3),
+                "pagesFetched": pages,
+                "pagesPerSecond": round(pages / duration, 3),
+                "reviewsTotal": self.reviews_total,
+                "bytesDownloaded": sum(self.bytes_downloaded.values()),
+                "fetch": {
+                    "latencySeconds": [
+                        {**dict(labels), **hist.to_dict()}
+                        for labels, hist in self.fetch_latency.items()
+                    ],
+                    "bytes": keyed(self.bytes_downloaded),
+                    "pages": keyed(self.pages_fetched),
+                    "errors": keyed(self.fetch_errors),
+                    "retries": keyed(self.retries),
+                    "coalesced": keyed(self.coalesced),
+                    "backoffSeconds": keyed(self.backoff_seconds),
+                },
+                "parse": {
+                    "secondsPerPage": self.parse_seconds.to_dict(),
+                    "reviewsPerPage": self.reviews_per_page.to_dict(),
+                },
+                "export": {"secondsPerFormat": keyed(self.export_seconds)},
+            }
+
+    def to_prometheus(self) -> str:
+        report = self.to_dict()
+        lines: List[str] = []
+
+        def metric(name: str, kind: str, help_text: str) -> str:
+            full = f"{PROMETHEUS_PREFIX}_{name}"
+            lines.append(f"# HELP {full} {help_text}")
+            lines.append(f"# TYPE {full} {kind}")
+            return full
+
+        def fmt_labels(labels: Labels, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            body = ",".join(
+                '{}="{}"'.format(k, str(v).replace("\\", "\\\\").replace('"', '\\"'))
+                for k, v in pairs
+            )
+            return "{" + body + "}"
+
+        def histogram(name: str, help_text: str, items: Dict[Labels, Histogram]) -> None:
+            full = metric(name, "histogram", help_text)
+            for labels, hist in items.items():
+                for bound, count in zip(hist.buckets, hist.counts):
+                    lines.append(f"{full}_bucket{fmt_labels(labels, (('le', str(bound)),))} {count}")
+                lines.append(f"{full}_bucket{fmt_labels(labels, (('le', '+Inf'),))} {hist.count}")
+                lines.append(f"{full}_sum{fmt_labels(labels)} {hist.sum}")
+                lines.append(f"{full}_count{fmt_labels(labels)} {hist.count}")
+
+        def counter(name: str, help_text: str, items: Dict[Labels, Any], kind: str = "counter") -> None:
+            full = metric(name, kind, help_text)
+            for labels, value in items.items():
+                lines.append(f"{full}{fmt_labels(labels)} {value}")
+
+        with self._lock:
+            histogram("fetch_seconds", "Page fetch latency per host and proxy.", self.fetch_latency)
+            counter("pages_fetched_total", "Pages fetched successfully.", self.pages_fetched)
+            counter("bytes_downloaded_total", "Response bytes downloaded.", self.bytes_downloaded)
+            counter("fetch_errors_total", "Failed fetch attempts.", self.fetch_errors)
+            counter("retries_total", "Fetch retries.", self.retries)
+            counter(
+                "coalesced_requests_total",
+                "Page requests served by an identical in-flight request.",
+                self.coalesced,
+            )
+            counter("backoff_seconds_total", "Seconds slept in retry backoff.", self.backoff_seconds)
+            histogram("parse_seconds", "HTML parse time per page.", {(): self.parse_seconds})
+            histogram("reviews_per_page", "Reviews extracted per page.", {(): self.reviews_per_page})
+            counter("export_seconds", "Export time per output format.", self.export_seconds, "gauge")
+
+        counter("reviews_total", "Reviews collected.", {(): report["reviewsTotal"]})
+        counter("run_duration_seconds", "Run wall time.", {(): report["durationSeconds"]}, "gauge")
+        counter("pages_per_second", "Fetched pages per second of run time.", {(): report["pagesPerSecond"]}, "gauge")
+        return "\n".join(lines) + "\n"
+
+    def write_report(self, output_dir: Path | str, base_filename: str) -> Tuple[Path, Path]:
+        """
+        Write ``<base_filename>.metrics.json`` and ``<base_filename>.prom``
+        (Prometheus textfile format) into ``output_dir``.
+        """
+        if self.finished_at is None:
+            self.finish()
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        json_path = output_dir / f"{base_filename}.metrics.json"
+        with json_path.open("w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+        prom_path = output_dir / f"{base_filename}.prom"
+        prom_path.write_text(self.to_prometheus(), encoding="utf-8")
+
+        logger.info("Run report written to %s and %s", json_path, prom_path)
+        return json_path, prom_path
@@ -0,0 +1,141 @@
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger("instrumentation.profiling")
+
+PROFILE_MODES = ("cpu", "memory", "all")
+DEFAULT_TOP_N = 25
+TRACEMALLOC_FRAMES = 10
+
+class StageProfiler:
+    """
+    Opt-in cProfile (CPU) and tracemalloc (allocation) profiling per stage.
+
+    Stages ("fetch", "parse", "export") are entered through
+    ``RunMetrics.stage``. Only one stage is profiled at a time; a stage that
+    starts while another one is being profiled (nested, or on another
+    thread) is attributed to the running one. After ``max_hotels`` hotels
+    profiling switches off so long runs only pay for a sample.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path | str,
+        mode: str = "all",
+        top_n: int = DEFAULT_TOP_N,
+        max_hotels: Optional[int] = None,
+    ) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode: {mode}")
+        self.output_dir = Path(output_dir)
+        self.cpu = mode in {"cpu", "all"}
+        self.memory = mode in {"memory", "all"}
+        self.top_n = top_n
+        self.max_hotels = max_hotels
+        self.hotels_seen = 0
+        self.enabled = True
+        self._active = threading.Lock()
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._calls: Dict[str, int] = {}
+        # stage -> "file:line" -> [size_diff, count_diff]
+        self._allocations: Dict[str, Dict[str, List[int]]] = {}
+
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+
+    def hotel_started(self) -> None:
+        """Call once per hotel; disables profiling after ``max_hotels``."""
+        self.hotels_seen += 1
+        if self.max_hotels is not None and self.hotels_seen > self.max_hotels and self.enabled:
+            logger.info("Profiled the first %d hotels; profiling disabled.", self.max_hotels)
+            self.enabled = False
+            if self.memory and tracemalloc.is_tracing():
+                tracemalloc.stop()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        if not self.enabled or not self._active.acquire(blocking=False):
+            yield
+            return
+
+        profile = self._profiles.setdefault(name, cProfile.Profile()) if self.cpu else None
+        before = tracemalloc.take_snapshot() if self.memory and tracemalloc.is_tracing() else None
+        try:
+            if profile:
+                profile.enable()
+            try:
+                yield
+            finally:
+                if profile:
+                    profile.disable()
+            if before is not None and tracemalloc.is_tracing():
+                self._record_allocations(name, before, tracemalloc.take_snapshot())
+            self._calls[name] = self._calls.get(name, 0) + 1
+        finally:
+            self._active.release()
+
+    def _record_allocations(
+        self,
+        name: str,
+        before: tracemalloc.Snapshot,
+        after: tracemalloc.Snapshot,
+    ) -> None:
+        ignore = [tracemalloc.Filter(False, tracemalloc.__file__)]
+        diffs = after.filter_traces(ignore).compare_to(before.filter_traces(ignore), "lineno")
+        sites = self._allocations.setdefault(name, {})
+        for diff in diffs:
+            if diff.size_diff <= 0:
+                continue
+            frame = diff.traceback[0]
+            entry = sites.setdefault(f"{frame.filename}:{frame.lineno}", [0, 0])
+            entry[0] += diff.size_diff
+            entry[1] += diff.count_diff
+
+    def _top_allocations(self, name: str) -> List[Tuple[str, int, int]]:
+        sites = self._allocations.get(name, {})
+        ranked = sorted(sites.items(), key=lambda item: item[1][0], reverse=True)
+        return [(site, size, count) for site, (size, count) in ranked[: self.top_n]]
+
+    def write_reports(self) -> List[Path]:
+        """
+        Write ``<stage>.pstats`` and ``<stage>.cpu.txt`` (top-N cumulative)
+        for CPU mode and ``<stage>.alloc.txt`` (top-N allocation sites) for
+        memory mode into ``output_dir``.
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        written: List[Path] = []
+
+        for name, profile in self._profiles.items():
+            stats_path = self.output_dir / f"{name}.pstats"
+            profile.dump_stats(str(stats_path))
+            buffer = io.StringIO()
+            stats = pstats.Stats(profile, stream=buffer)
+            stats.sort_stats("cumulative").print_stats(self.top_n)
+            text_path = self.output_dir / f"{name}.cpu.txt"
+            text_path.write_text(buffer.getvalue(), encoding="utf-8")
+            written.extend([stats_path, text_path])
+
+        for name in self._allocations:
+            lines = [
+                f"Top {self.top_n} allocation sites for stage '{name}' "
+                f"({self._calls.get(name, 0)} profiled calls)",
+                f"{'size KiB':>12} {'blocks':>10}  site",
+            ]
+            for site, size, count in self._top_allocations(name):
+                lines.append(f"{size / 1024:>12.1f} {count:>10}  {site}")
+            alloc_path = self.output_dir / f"{name}.alloc.txt"
+            alloc_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+            written.append(alloc_path)
+
+        if self.memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+        logger.info("Profiling reports written to %s", self.output_dir)
+        return written
@@ -3,21 +3,32 @@ import json
 import logging
 import os
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, List, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
 
 # Ensure local packages are importable when running as "python src/main.py"
 CURRENT_DIR = os.path.dirname(os.path.abspath(__file__))
 if CURRENT_DIR not in sys.path:
     sys.path.append(CURRENT_DIR)
 
-from extractors.booking_parser import BookingReviewParser  # type: ignore
+from extractors.booking_parser import BookingReviewParser, _derive_hotel_id, fragment_template  # type: ignore
 from extractors.pagination_handler import PaginationHandler  # type: ignore
+from extractors.urls import DEFAULT_LANGUAGE_PARAM, canonical_url, language_url  # type: ignore
+from instrumentation.metrics import RunMetrics  # type: ignore
+from instrumentation.profiling import DEFAULT_TOP_N, PROFILE_MODES, StageProfiler  # type: ignore
 from outputs.dataset_exporter import export_dataset  # type: ignore
+from outputs.normalize import DATASET_NORMALIZE_FIELDS, DEFAULT_CHUNK_SIZE, normalize_reviews  # type: ignore
+from outputs.spill import SpillBuffer, memory_limit_bytes, record_size  # type: ignore
 
 logger = logging.getLogger("booking_reviews_scraper")
 
+# Language views scraped at a time with --languages
+DEFAULT_LANGUAGE_CONCURRENCY = 4
+
 def configure_logging(verbosity: int) -> None:
     level = logging.WARNING
     if verbosity == 1:
@@ -74,6 +85,14 @@ def create_http_session(settings: Dict[str, Any]) -> requests.Session:
         }
     )
 
+    # Language views are scraped concurrently over this session; size the
+    # connection pool so none of their connections are discarded
+    adapter = HTTPAdapter(
+        pool_maxsize=max(10, int(settings.get("language_concurrency", DEFAULT_LANGUAGE_CONCURRENCY)))
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
     return session
 
 def parse_input_config(path: Optional[str]) -> Dict[str, Any]:
@@ -102,7 +121,8 @@ def merge_config(
     hotel_url = args.hotel_url or input_cfg.get("hotelUrl") or input_cfg.get("hotel_url")
     if not hotel_url:
         raise ValueError("A Booking.com hotel URL must be provided via --hotel-url or input JSON (hotelUrl).")
-    cfg["hotel_url"] = hotel_url
+    # Only the spelling is normalized; the localized page asked for is kept
+    cfg["hotel_url"] = canonical_url(hotel_url, strip_language=False)
 
     max_items = (
         args.max_items
@@ -116,6 +136,13 @@ def merge_config(
     language = args.language or input_cfg.get("language")
     cfg["language"] = language
 
+    # Several languages fan out over language-filtered review lists
+    if args.languages:
+        languages = [lang.strip() for lang in args.languages.split(",") if lang.strip()]
+    else:
+        languages = [str(lang) for lang in input_cfg.get("languages") or []]
+    cfg["languages"] = list(dict.fromkeys(languages))
+
     output_cfg = settings.get("output", {})
     output_path = args.output or input_cfg.get("outputPath") or output_cfg.get("path") or "data/output.sample.json"
     cfg["output_path"] = output_path
@@ -136,22 +163,55 @@ def merge_config(
     cfg["settings"] = settings
     return cfg
 
+def _review_buffer(settings: Dict[str, Any]) -> List[Dict[str, Any]] | SpillBuffer:
+    # Under output.memory_limit_mb reviews beyond the limit wait on disk
+    output_cfg = settings.get("output", {})
+    limit = memory_limit_bytes(output_cfg.get("memory_limit_mb"))
+    return SpillBuffer(limit, output_cfg.get("spill_directory")) if limit else []
+
 def scrape_reviews(
     session: requests.Session,
     hotel_url: str,
     max_items: int,
     language: Optional[str],
     settings: Dict[str, Any],
+    metrics: Optional[RunMetrics] = None,
 ) -> Dict[str, Any]:
-    parser = BookingReviewParser(language_hint=language)
+    metrics = metrics or RunMetrics()
+    parser = BookingReviewParser(
+        language_hint=language, hotel_id=_derive_hotel_id(hotel_url)
+    )
     paginator = PaginationHandler(
         session=session,
         timeout=settings.get("timeout", 15),
         max_retries=settings.get("max_retries", 3),
         backoff_factor=settings.get("backoff_factor", 0.5),
+        metrics=metrics,
+        fragment_url_template=fragment_template(
+            settings.get("fetch_mode"), settings.get("fragment_url_template")
+        ),
     )
 
-    all_reviews: List[Dict[str, Any]] = []
+    all_reviews = _review_buffer(settings)
+    # Typed fields are converted in chunks of reviews, before they are
+    # buffered; without normalization every page is buffered right away.
+    # Under output.memory_limit_mb a chunk is also cut once it would make
+    # the buffer spill, so pending reviews stay within the limit too.
+    normalize = bool(settings.get("output", {}).get("normalize"))
+    chunk_size = DEFAULT_CHUNK_SIZE if normalize else 1
+    bounded = normalize and isinstance(all_reviews, SpillBuffer)
+    pending: List[Dict[str, Any]] = []
+    pending_bytes = 0
+
+    def flush() -> None:
+        nonlocal pending_bytes
+        if normalize and pending:
+            with metrics.stage("normalize"):
+                normalize_reviews(pending, DATASET_NORMALIZE_FIELDS)
+        all_reviews.extend(pending)
+        pending.clear()
+        pending_bytes = 0
+
     hotel_stats: Optional[Dict[str, Any]] = None
 
     logger.info("Starting scrape for %s", hotel_url)
@@ -162,21 +222,29 @@ def scrape_reviews(
             page_count += 1
             logger.info("Parsing page %d", page_count)
 
-            parsed_stats, page_reviews = parser.parse(page_html)
+            parse_start = time.perf_counter()
+            with metrics.stage("parse"):
+                parsed_stats, page_reviews = parser.parse(page_html)
+            metrics.observe_parse(time.perf_counter() - parse_start, len(page_reviews))
 
             if parsed_stats and not hotel_stats:
                 hotel_stats = parsed_stats
 
             for r in page_reviews:
-                all_reviews.append(r)
-                if len(all_reviews) >= max_items:
+                pending.append(r)
+                if bounded:
+                    pending_bytes += record_size(r)
+                if len(all_reviews) + len(pending) >= max_items:
                     logger.info("Reached max_items limit (%d). Stopping pagination.", max_items)
                     raise StopIteration()
+            if len(pending) >= chunk_size or (bounded and pending_bytes >= all_reviews.headroom):
+                flush()
 
     except StopIteration:
         logger.debug("Pagination stopped after reaching max_items.")
     except Exception as exc:
         logger.error("Unexpected error during scraping: %s", exc, exc_info=True)
+    flush()
 
     hotel_stats = hotel_stats or {
         "totalReviews": len(all_reviews),
@@ -190,11 +258,107 @@ def scrape_reviews(
         "reviews": all_reviews,
     }
 
+def scrape_languages(
+    session: requests.Session,
+    hotel_url: str,
+    languages: List[str],
+    max_items: int,
+    settings: Dict[str, Any],
+    metrics: Optional[RunMetrics] = None,
+) -> Dict[str, Any]:
+    """
+    Scrape the review list of ``hotel_url`` once per language, all languages
+    at once over the shared session, and merge the views.
+
+    Each view is filtered with the ``review_language_param`` query parameter
+    (``r_lang`` by default) and collects up to ``max_items`` reviews; at
+    most ``language_concurrency`` views are scraped at a time. A review
+    that shows up in more than one view has the same ID in each and is kept
+    once, with the language of the first view (in ``languages`` order) it
+    appeared in. The merged reviews are capped at ``max_items``.
+    """
+    metrics = metrics or RunMetrics()
+    param = settings.get("review_language_param") or DEFAULT_LANGUAGE_PARAM
+    concurrency = int(settings.get("language_concurrency", DEFAULT_LANGUAGE_CONCURRENCY))
+    workers = max(1, min(len(languages), concurrency))
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        views = list(
+            pool.map(
+                lambda lang: scrape_reviews(
+                    session=session,
+                    hotel_url=language_url(hotel_url, lang, param),
+                    max_items=max_items,
+                    language=lang,
+                    settings=settings,
+                    metrics=metrics,
+                ),
+                languages,
+            )
+        )
+
+    merged = _review_buffer(settings)
+    seen = set()
+    hotel_stats: Optional[Dict[str, Any]] = None
+    try:
+        for lang, view in zip(languages, views):
+            duplicates = 0
+            dropped = 0
+            for review in view["reviews"]:
+                if review["id"] in seen:
+                    duplicates += 1
+                elif len(merged) >= max_items:
+                    dropped += 1
+                else:
+                    seen.add(review["id"])
+                    merged.append(review)
+            logger.info(
+                "Language '%s': %d reviews, %d already seen in another language, "
+                "%d dropped at max_items.",
+                lang,
+                len(view["reviews"]),
+                duplicates,
+                dropped,
+            )
+            if hotel_stats is None and view["hotelStats"].get("scores"):
+                hotel_stats = view["hotelStats"]
+    except BaseException:
+        if isinstance(merged, SpillBuffer):
+            merged.close()
+        raise
+    finally:
+        for view in views:
+            if isinstance(view["reviews"], SpillBuffer):
+                view["reviews"].close()
+
+    logger.info(
+        "Merged %d languages into %d unique reviews (max_items %d).",
+        len(languages),
+        len(merged),
+        max_items,
+    )
+    return {
+        "hotelStats": hotel_stats or {"totalReviews": len(merged), "scores": {}},
+        "reviews": merged,
+    }
+
 def ensure_parent_dir(path: str) -> None:
     parent = os.path.dirname(path)
     if parent and not os.path.exists(parent):
         os.makedirs(parent, exist_ok=True)
 
+def write_run_report(metrics: RunMetrics, output_path: str) -> None:
+    """Write the run report next to the dataset, named after its base path."""
+    metrics.finish()
+    output_dir = os.path.dirname(output_path) or "."
+    base_filename = os.path.splitext(os.path.basename(output_path))[0]
+    try:
+        metrics.write_report(output_dir, base_filename)
+        if metrics.profiler:
+            metrics.profiler.write_reports()
+    except OSError as exc:
+        logger.warning("Could not write run report to %s: %s", output_dir, exc)
+
 def main() -> None:
     parser = argparse.ArgumentParser(
         description="Booking.com hotel reviews scraper",
@@ -216,13 +380,18 @@ def main() -> None:
         "--language",
         help="Preferred review language code (e.g., en, nl, fr).",
     )
+    parser.add_argument(
+        "--languages",
+        help="Comma-separated review languages to collect concurrently, "
+        "deduplicating reviews seen in several (e.g., en,de,fr).",
+    )
     parser.add_argument(
         "--output",
         help="Output base file path (extension added based on formats).",
     )
     parser.add_argument(
         "--formats",
-        help="Comma-separated list of output formats: json,csv,xlsx",
+        help="Comma-separated list of output formats: json,csv,xlsx,parquet,summary",
     )
     parser.add_argument(
         "--settings",
@@ -236,6 +405,25 @@ def main() -> None:
         default=0,
         help="Increase verbosity (use -vv for debug).",
     )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="all",
+        choices=PROFILE_MODES,
+        help="Profile the fetch/parse/export stages with cProfile (cpu), "
+        "tracemalloc (memory) or both (all, the default when no mode is given).",
+    )
+    parser.add_argument(
+        "--profile-hotels",
+        type=int,
+        help="Only profile the first N hotels.",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=DEFAULT_TOP_N,
+        help=f"Entries per profiling report (default: {DEFAULT_TOP_N}).",
+    )
 
     args = parser.parse_args()
     configure_logging(args.verbose)
@@ -249,30 +437,63 @@ def main() -> None:
         sys.exit(1)
 
     session = create_http_session(cfg["settings"])
-
-    scrape_result = scrape_reviews(
-        session=session,
-        hotel_url=cfg["hotel_url"],
-        max_items=cfg["max_items"],
-        language=cfg["language"],
-        settings=cfg["settings"],
-    )
+    metrics = RunMetrics()
 
     output_path = cfg["output_path"]
+    if args.profile:
+        profile_dir = os.path.splitext(output_path)[0] + ".profile"
+        metrics.profiler = StageProfiler(
+            profile_dir,
+            mode=args.profile,
+            top_n=args.profile_top,
+            max_hotels=args.profile_hotels,
+        )
+        metrics.profiler.hotel_started()
+
+    if cfg["languages"]:
+        scrape_result = scrape_languages(
+            session=session,
+            hotel_url=cfg["hotel_url"],
+            languages=cfg["languages"],
+            max_items=cfg["max_items"],
+            settings=cfg["settings"],
+            metrics=metrics,
+        )
+    else:
+        scrape_result = scrape_reviews(
+            session=session,
+            hotel_url=cfg["hotel_url"],
+            max_items=cfg["max_items"],
+            language=cfg["language"],
+            settings=cfg["settings"],
+            metrics=metrics,
+        )
+
     formats = cfg["formats"]
 
     ensure_parent_dir(output_path)
 
+    output_cfg = cfg["settings"].get("output", {})
     try:
         export_dataset(
             hotel_stats=scrape_result["hotelStats"],
             reviews=scrape_result["reviews"],
             base_output_path=output_path,
             formats=formats,
+            format_options=output_cfg.get("format_options"),
+            metrics=metrics,
+            memory_limit_mb=output_cfg.get("memory_limit_mb"),
+            normalized=bool(output_cfg.get("normalize")),
         )
     except Exception as exc:
         logger.error("Failed to export dataset: %s", exc)
+        write_run_report(metrics, output_path)
         sys.exit(1)
+    finally:
+        if isinstance(scrape_result["reviews"], SpillBuffer):
+            scrape_result["reviews"].close()
+
+    write_run_report(metrics, output_path)
 
     logger.info("All done. Output written to base path: %s", output_path)
 
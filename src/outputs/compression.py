@@ -0,0 +1,75 @@
+import gzip
+import logging
+from pathlib import Path
+from typing import IO, Any, Dict, Optional
+
+logger = logging.getLogger("exporters.compression")
+
+# Codec name -> file suffix appended to the uncompressed file name
+CODEC_SUFFIXES = {
+    "gzip": ".gz",
+    "zstd": ".zst",
+}
+
+DEFAULT_LEVELS = {
+    "gzip": 6,
+    "zstd": 3,
+}
+
+def resolve_codec(options: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Return the normalized codec from a per-format options dict, or None when
+    the format should be written uncompressed.
+    """
+    codec = (options or {}).get("compression")
+    if not codec or str(codec).lower() in {"none", "off"}:
+        return None
+    codec = str(codec).lower()
+    if codec == "gz":
+        codec = "gzip"
+    if codec not in CODEC_SUFFIXES:
+        raise ValueError(f"Unsupported compression codec: {codec}")
+    return codec
+
+def compressed_path(path: Path | str, codec: Optional[str]) -> Path:
+    path = Path(path)
+    if not codec:
+        return path
+    return path.with_name(path.name + CODEC_SUFFIXES[codec])
+
+def open_output(
+    path: Path | str,
+    codec: Optional[str],
+    level: Optional[int] = None,
+    binary: bool = False,
+) -> IO[Any]:
+    """
+    Open ``path`` for writing, compressing on the fly with ``codec``.
+
+    Data is compressed as it is written, so writers never hold the whole
+    compressed payload in memory. Text mode uses UTF-8.
+    """
+    mode = "wb" if binary else "wt"
+    encoding = None if binary else "utf-8"
+
+    if not codec:
+        return open(path, "wb" if binary else "w", encoding=encoding)
+
+    level = DEFAULT_LEVELS[codec] if level is None else int(level)
+    logger.debug("Opening %s with %s (level %d)", path, codec, level)
+
+    if codec == "gzip":
+        return gzip.open(path, mode, compresslevel=level, encoding=encoding)
+
+    try:
+        import zstandard
+    except ImportError as exc:
+        raise RuntimeError(
+            "zstd compression requires the 'zstandard' package (pip install zstandard)."
+        ) from exc
+    return zstandard.open(
+        path,
+        mode,
+        cctx=zstandard.ZstdCompressor(level=level),
+        encoding=encoding,
+    )
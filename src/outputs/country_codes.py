@@ -0,0 +1,253 @@
+# ISO 3166-1 alpha-2 codes by country name as shown in a reviewer's origin
+# (English UI), plus the common alternative spellings. Keys are casefolded.
+_CODES = {
+    "AF": ("Afghanistan",),
+    "AX": ("Aland Islands", "Åland Islands"),
+    "AL": ("Albania",),
+    "DZ": ("Algeria",),
+    "AS": ("American Samoa",),
+    "AD": ("Andorra",),
+    "AO": ("Angola",),
+    "AI": ("Anguilla",),
+    "AQ": ("Antarctica",),
+    "AG": ("Antigua & Barbuda", "Antigua and Barbuda"),
+    "AR": ("Argentina",),
+    "AM": ("Armenia",),
+    "AW": ("Aruba",),
+    "AU": ("Australia",),
+    "AT": ("Austria",),
+    "AZ": ("Azerbaijan",),
+    "BS": ("Bahamas", "The Bahamas"),
+    "BH": ("Bahrain",),
+    "BD": ("Bangladesh",),
+    "BB": ("Barbados",),
+    "BY": ("Belarus",),
+    "BE": ("Belgium",),
+    "BZ": ("Belize",),
+    "BJ": ("Benin",),
+    "BM": ("Bermuda",),
+    "BT": ("Bhutan",),
+    "BO": ("Bolivia",),
+    "BQ": ("Bonaire St Eustatius and Saba", "Caribbean Netherlands"),
+    "BA": ("Bosnia and Herzegovina", "Bosnia & Herzegovina"),
+    "BW": ("Botswana",),
+    "BR": ("Brazil",),
+    "IO": ("British Indian Ocean Territory",),
+    "VG": ("British Virgin Islands",),
+    "BN": ("Brunei Darussalam", "Brunei"),
+    "BG": ("Bulgaria",),
+    "BF": ("Burkina Faso",),
+    "BI": ("Burundi",),
+    "KH": ("Cambodia",),
+    "CM": ("Cameroon",),
+    "CA": ("Canada",),
+    "CV": ("Cape Verde", "Cabo Verde"),
+    "KY": ("Cayman Islands",),
+    "CF": ("Central Africa Republic", "Central African Republic"),
+    "TD": ("Chad",),
+    "CL": ("Chile",),
+    "CN": ("China",),
+    "CX": ("Christmas Island",),
+    "CC": ("Cocos (K) I.", "Cocos Islands"),
+    "CO": ("Colombia",),
+    "KM": ("Comoros",),
+    "CG": ("Congo", "Republic of the Congo"),
+    "CD": ("Democratic Republic of Congo", "Democratic Republic of the Congo", "DR Congo"),
+    "CK": ("Cook Islands",),
+    "CR": ("Costa Rica",),
+    "CI": ("Cote d'Ivoire", "Côte d'Ivoire", "Ivory Coast"),
+    "HR": ("Croatia",),
+    "CU": ("Cuba",),
+    "CW": ("Curaçao", "Curacao"),
+    "CY": ("Cyprus",),
+    "CZ": ("Czech Republic", "Czechia"),
+    "DK": ("Denmark",),
+    "DJ": ("Djibouti",),
+    "DM": ("Dominica",),
+    "DO": ("Dominican Republic",),
+    "EC": ("Ecuador",),
+    "EG": ("Egypt",),
+    "SV": ("El Salvador",),
+    "GQ": ("Equatorial Guinea",),
+    "ER": ("Eritrea",),
+    "EE": ("Estonia",),
+    "SZ": ("Eswatini", "Swaziland"),
+    "ET": ("Ethiopia",),
+    "FK": ("Falkland Islands (Malvinas)", "Falkland Islands"),
+    "FO": ("Faroe Islands",),
+    "FJ": ("Fiji",),
+    "FI": ("Finland",),
+    "FR": ("France",),
+    "GF": ("French Guiana",),
+    "PF": ("French Polynesia",),
+    "TF": ("French Southern Territories",),
+    "GA": ("Gabon",),
+    "GM": ("Gambia", "The Gambia"),
+    "GE": ("Georgia",),
+    "DE": ("Germany",),
+    "GH": ("Ghana",),
+    "GI": ("Gibraltar",),
+    "GR": ("Greece",),
+    "GL": ("Greenland",),
+    "GD": ("Grenada",),
+    "GP": ("Guadeloupe",),
+    "GU": ("Guam",),
+    "GT": ("Guatemala",),
+    "GG": ("Guernsey",),
+    "GN": ("Guinea",),
+    "GW": ("Guinea-Bissau",),
+    "GY": ("Guyana",),
+    "HT": ("Haiti",),
+    "HN": ("Honduras",),
+    "HK": ("Hong Kong", "Hong Kong SAR"),
+    "HU": ("Hungary",),
+    "IS": ("Iceland",),
+    "IN": ("India",),
+    "ID": ("Indonesia",),
+    "IR": ("Iran",),
+    "IQ": ("Iraq",),
+    "IE": ("Ireland",),
+    "IM": ("Isle of Man",),
+    "IL": ("Israel",),
+    "IT": ("Italy",),
+    "JM": ("Jamaica",),
+    "JP": ("Japan",),
+    "JE": ("Jersey",),
+    "JO": ("Jordan",),
+    "KZ": ("Kazakhstan",),
+    "KE": ("Kenya",),
+    "KI": ("Kiribati",),
+    "XK": ("Kosovo",),
+    "KW": ("Kuwait",),
+    "KG": ("Kyrgyzstan",),
+    "LA": ("Laos",),
+    "LV": ("Latvia",),
+    "LB": ("Lebanon",),
+    "LS": ("Lesotho",),
+    "LR": ("Liberia",),
+    "LY": ("Libya",),
+    "LI": ("Liechtenstein",),
+    "LT": ("Lithuania",),
+    "LU": ("Luxembourg",),
+    "MO": ("Macao", "Macau"),
+    "MG": ("Madagascar",),
+    "MW": ("Malawi",),
+    "MY": ("Malaysia",),
+    "MV": ("Maldives",),
+    "ML": ("Mali",),
+    "MT": ("Malta",),
+    "MH": ("Marshall Islands",),
+    "MQ": ("Martinique",),
+    "MR": ("Mauritania",),
+    "MU": ("Mauritius",),
+    "YT": ("Mayotte",),
+    "MX": ("Mexico",),
+    "FM": ("Micronesia",),
+    "MD": ("Moldova",),
+    "MC": ("Monaco",),
+    "MN": ("Mongolia",),
+    "ME": ("Montenegro",),
+    "MS": ("Montserrat",),
+    "MA": ("Morocco",),
+    "MZ": ("Mozambique",),
+    "MM": ("Myanmar", "Burma"),
+    "NA": ("Namibia",),
+    "NR": ("Nauru",),
+    "NP": ("Nepal",),
+    "NL": ("Netherlands", "The Netherlands", "Holland"),
+    "NC": ("New Caledonia",),
+    "NZ": ("New Zealand",),
+    "NI": ("Nicaragua",),
+    "NE": ("Niger",),
+    "NG": ("Nigeria",),
+    "NU": ("Niue",),
+    "NF": ("Norfolk Island",),
+    "KP": ("North Korea",),
+    "MK": ("North Macedonia", "Macedonia"),
+    "MP": ("Northern Mariana Islands",),
+    "NO": ("Norway",),
+    "OM": ("Oman",),
+    "PK": ("Pakistan",),
+    "PW": ("Palau",),
+    "PS": ("Palestinian Territory", "Palestine"),
+    "PA": ("Panama",),
+    "PG": ("Papua New Guinea",),
+    "PY": ("Paraguay",),
+    "PE": ("Peru",),
+    "PH": ("Philippines",),
+    "PN": ("Pitcairn",),
+    "PL": ("Poland",),
+    "PT": ("Portugal",),
+    "PR": ("Puerto Rico",),
+    "QA": ("Qatar",),
+    "RE": ("Reunion", "Réunion"),
+    "RO": ("Romania",),
+    "RU": ("Russia", "Russian Federation"),
+    "RW": ("Rwanda",),
+    "BL": ("Saint Barthelemy", "Saint Barthélemy"),
+    "SH": ("Saint Helena",),
+    "KN": ("Saint Kitts and Nevis", "St. Kitts and Nevis"),
+    "LC": ("Saint Lucia", "St. Lucia"),
+    "MF": ("Saint Martin",),
+    "PM": ("Saint Pierre and Miquelon",),
+    "VC": ("Saint Vincent and the Grenadines", "St. Vincent and the Grenadines"),
+    "WS": ("Samoa",),
+    "SM": ("San Marino",),
+    "ST": ("Sao Tome and Principe", "São Tomé and Príncipe"),
+    "SA": ("Saudi Arabia",),
+    "SN": ("Senegal",),
+    "RS": ("Serbia",),
+    "SC": ("Seychelles",),
+    "SL": ("Sierra Leone",),
+    "SG": ("Singapore",),
+    "SX": ("Sint Maarten",),
+    "SK": ("Slovakia",),
+    "SI": ("Slovenia",),
+    "SB": ("Solomon Islands",),
+    "SO": ("Somalia",),
+    "ZA": ("South Africa",),
+    "GS": ("South Georgia and the South Sandwich Islands",),
+    "KR": ("South Korea", "Korea", "Republic of Korea"),
+    "SS": ("South Sudan",),
+    "ES": ("Spain",),
+    "LK": ("Sri Lanka",),
+    "SD": ("Sudan",),
+    "SR": ("Suriname",),
+    "SE": ("Sweden",),
+    "CH": ("Switzerland",),
+    "SY": ("Syria",),
+    "TW": ("Taiwan",),
+    "TJ": ("Tajikistan",),
+    "TZ": ("Tanzania",),
+    "TH": ("Thailand",),
+    "TL": ("Timor-Leste", "East Timor"),
+    "TG": ("Togo",),
+    "TK": ("Tokelau",),
+    "TO": ("Tonga",),
+    "TT": ("Trinidad and Tobago", "Trinidad & Tobago"),
+    "TN": ("Tunisia",),
+    "TR": ("Turkey", "Türkiye", "Turkiye"),
+    "TM": ("Turkmenistan",),
+    "TC": ("Turks & Caicos Islands", "Turks and Caicos Islands"),
+    "TV": ("Tuvalu",),
+    "UG": ("Uganda",),
+    "UA": ("Ukraine",),
+    "AE": ("United Arab Emirates", "UAE"),
+    "GB": ("United Kingdom", "UK", "Great Britain"),
+    "US": ("United States", "United States of America", "USA"),
+    "UM": ("United States Minor Outlying Islands",),
+    "VI": ("U.S. Virgin Islands", "US Virgin Islands"),
+    "UY": ("Uruguay",),
+    "UZ": ("Uzbekistan",),
+    "VU": ("Vanuatu",),
+    "VA": ("Vatican City", "Holy See"),
+    "VE": ("Venezuela",),
+    "VN": ("Vietnam", "Viet Nam"),
+    "WF": ("Wallis and Futuna",),
+    "EH": ("Western Sahara",),
+    "YE": ("Yemen",),
+    "ZM": ("Zambia",),
+    "ZW": ("Zimbabwe",),
+}
+
+COUNTRY_CODES = {name.casefold(): code for code, names in _CODES.items() for name in names}
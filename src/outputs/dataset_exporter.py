@@ -1,9 +1,24 @@
 import json
 import logging
 import os
-from typing import Any, Dict, List
-
-import pandas as pd
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from instrumentation.metrics import RunMetrics
+from outputs.compression import compressed_path, open_output, resolve_codec
+from outputs.exporters import write_json_array
+from outputs.parquet_writer import (
+    CATEGORY,
+    DATE,
+    DEFAULT_COMPRESSION,
+    DEFAULT_ROW_GROUP_SIZE,
+    FLOAT,
+    INT,
+    STRING,
+    write_parquet,
+)
+from outputs.normalize import COUNTRY_CODE_FIELD
+from outputs.rollups import DATASET_ROLLUP_FIELDS, DEFAULT_CHUNK_SIZE, write_rollups
+from outputs.spill import iter_batches, memory_limit_bytes, write_text_chunks, write_xlsx_chunks
 
 logger = logging.getLogger("booking_reviews_scraper.exporter")
 
@@ -19,10 +34,16 @@ def _derive_paths(base_output_path: str, formats: List[str]) -> Dict[str, str]:
             paths["csv"] = base_output_path if ext == ".csv" or not ext else f"{root}.csv"
         elif fmt_lower in {"xlsx", "excel"}:
             paths["xlsx"] = base_output_path if ext in {".xlsx", ".xls"} or not ext else f"{root}.xlsx"
+        elif fmt_lower == "parquet":
+            paths["parquet"] = base_output_path if ext == ".parquet" else f"{root}.parquet"
+        elif fmt_lower == "summary":
+            paths["summary"] = f"{root}.summary.json"
 
     return paths
 
-def _flatten_review(hotel_stats: Dict[str, Any], review: Dict[str, Any]) -> Dict[str, Any]:
+def _flatten_review(
+    hotel_stats: Dict[str, Any], review: Dict[str, Any], normalized: bool = False
+) -> Dict[str, Any]:
     flat: Dict[str, Any] = {}
 
     # Hotel-level columns (some aggregated)
@@ -47,6 +68,8 @@ def _flatten_review(hotel_stats: Dict[str, Any], review: Dict[str, Any]) -> Dict
     if isinstance(guest, dict):
         flat["guest.name"] = guest.get("name")
         flat["guest.country"] = guest.get("country")
+        if normalized:
+            flat[f"guest.{COUNTRY_CODE_FIELD}"] = guest.get(COUNTRY_CODE_FIELD)
         flat["guest.type"] = guest.get("type")
 
     # Booking info
@@ -65,12 +88,68 @@ def _flatten_review(hotel_stats: Dict[str, Any], review: Dict[str, Any]) -> Dict
 
     return flat
 
+def _parquet_columns(hotel_stats: Dict[str, Any], normalized: bool = False) -> List[tuple]:
+    columns = [("hotelId", CATEGORY), ("hotelStats.totalReviews", INT)]
+
+    scores = hotel_stats.get("scores") or {}
+    if isinstance(scores, dict):
+        for key, entry in scores.items():
+            if isinstance(entry, dict):
+                columns.append((f"hotelStats.scores.{key}", FLOAT))
+
+    columns.extend(
+        [
+            ("score", FLOAT),
+            ("reviewDate", DATE),
+            ("title", STRING),
+            ("positiveContent", STRING),
+            ("negativeContent", STRING),
+            ("language", CATEGORY),
+            ("guest.name", STRING),
+            ("guest.country", CATEGORY),
+            *([(f"guest.{COUNTRY_CODE_FIELD}", CATEGORY)] if normalized else []),
+            ("guest.type", CATEGORY),
+            ("booking.roomType", CATEGORY),
+            ("booking.checkIn", DATE),
+            ("booking.checkOut", DATE),
+            ("booking.nights", INT),
+            ("booking.customerType", CATEGORY),
+            ("photos", STRING),
+        ]
+    )
+    return columns
+
+def _with_hotel_stats(hotel_stats: Dict[str, Any], review: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "hotelStats": hotel_stats,
+        **{
+            k: v
+            for k, v in review.items()
+            if k not in {"hotelStats"}
+        },
+    }
+
 def export_dataset(
     hotel_stats: Dict[str, Any],
-    reviews: List[Dict[str, Any]],
+    reviews: Iterable[Dict[str, Any]],
     base_output_path: str,
     formats: List[str],
+    format_options: Optional[Dict[str, Dict[str, Any]]] = None,
+    metrics: Optional[RunMetrics] = None,
+    memory_limit_mb: Optional[float] = None,
+    normalized: bool = False,
 ) -> None:
+    """
+    Write one hotel's reviews to every requested format.
+
+    ``reviews`` is read once per format, so it may be a list or a
+    ``SpillBuffer``. JSON and Parquet are written record by record. CSV and
+    XLSX are framed in one DataFrame, or, with ``memory_limit_mb``, written
+    in chunks of about that size so the whole table is never in memory.
+    The "summary" format writes per-hotel rollups next to the dataset.
+    ``normalized`` reviews (``outputs.normalize``) also get a
+    ``guest.countryCode`` column.
+    """
     if not reviews:
         logger.warning("No reviews to export. Still writing empty JSON for schema consistency.")
 
@@ -79,38 +158,96 @@ def export_dataset(
         raise ValueError(f"No valid output formats requested: {formats}")
 
     os.makedirs(os.path.dirname(list(paths.values())[0]) or ".", exist_ok=True)
+    format_options = format_options or {}
+    metrics = metrics or RunMetrics()
+    limit = memory_limit_bytes(memory_limit_mb)
 
     # JSON export
     if "json" in paths:
-        json_path = paths["json"]
+        json_options = format_options.get("json", {})
+        json_codec = resolve_codec(json_options)
+        json_path = str(compressed_path(paths["json"], json_codec))
         logger.info("Writing JSON output to %s", json_path)
-        payload = []
-        for r in reviews:
-            item = {
-                "hotelStats": hotel_stats,
-                **{
-                    k: v
-                    for k, v in r.items()
-                    if k not in {"hotelStats"}
-                },
-            }
-            payload.append(item)
-
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+        with metrics.time_export("json"), open_output(
+            json_path, json_codec, json_options.get("level")
+        ) as f:
+            write_json_array(f, (_with_hotel_stats(hotel_stats, r) for r in reviews))
 
     # CSV/XLSX export use flattened rows
-    if "csv" in paths or "xlsx" in paths:
+    if ("csv" in paths or "xlsx" in paths) and limit:
+        # Every row has the same columns, so chunks can be written as they come
+        columns = list(_flatten_review(hotel_stats, {}, normalized))
+
+        def row_chunks() -> Iterator[List[List[Any]]]:
+            for batch in iter_batches(reviews, limit):
+                yield [list(_flatten_review(hotel_stats, r, normalized).values()) for r in batch]
+
+        if "csv" in paths:
+            csv_options = format_options.get("csv", {})
+            csv_codec = resolve_codec(csv_options)
+            csv_path = str(compressed_path(paths["csv"], csv_codec))
+            logger.info("Writing CSV output to %s in chunks", csv_path)
+            with metrics.time_export("csv"), open_output(
+                csv_path, csv_codec, csv_options.get("level")
+            ) as f:
+                write_text_chunks(f, "csv", columns, row_chunks())
+
+        if "xlsx" in paths:
+            xlsx_path = paths["xlsx"]
+            logger.info("Writing Excel output to %s in chunks", xlsx_path)
+            with metrics.time_export("xlsx"):
+                write_xlsx_chunks(xlsx_path, columns, row_chunks())
+
+    elif "csv" in paths or "xlsx" in paths:
         logger.info("Flattening reviews for tabular export.")
-        rows = [_flatten_review(hotel_stats, r) for r in reviews]
+        rows = [_flatten_review(hotel_stats, r, normalized) for r in reviews]
+        import pandas as pd  # deferred: JSON-only runs never load pandas
+
         df = pd.DataFrame(rows)
 
         if "csv" in paths:
-            csv_path = paths["csv"]
+            csv_options = format_options.get("csv", {})
+            csv_codec = resolve_codec(csv_options)
+            csv_path = str(compressed_path(paths["csv"], csv_codec))
             logger.info("Writing CSV output to %s", csv_path)
-            df.to_csv(csv_path, index=False)
+            with metrics.time_export("csv"), open_output(
+                csv_path, csv_codec, csv_options.get("level")
+            ) as f:
+                df.to_csv(f, index=False)
 
         if "xlsx" in paths:
             xlsx_path = paths["xlsx"]
             logger.info("Writing Excel output to %s", xlsx_path)
-            df.to_excel(xlsx_path, index=False)
\ No newline at end of file
+            with metrics.time_export("xlsx"):
+                df.to_excel(xlsx_path, index=False)
+
+    # Parquet export streams flattened rows one row group at a time
+    if "parquet" in paths:
+        parquet_path = paths["parquet"]
+        parquet_options = format_options.get("parquet", {})
+        logger.info("Writing Parquet output to %s", parquet_path)
+        with metrics.time_export("parquet"):
+            write_parquet(
+                (
+                    {"hotelId": r.get("hotelId"), **_flatten_review(hotel_stats, r, normalized)}
+                    for r in reviews
+                ),
+                parquet_path,
+                columns=_parquet_columns(hotel_stats, normalized),
+                month_from="reviewDate",
+                partition_by=parquet_options.get("partitionBy"),
+                row_group_size=parquet_options.get("rowGroupSize", DEFAULT_ROW_GROUP_SIZE),
+                compression=parquet_options.get("compression", DEFAULT_COMPRESSION),
+            )
+
+    # Per-hotel rollups for dashboards that only need the aggregates
+    if "summary" in paths:
+        summary_path = paths["summary"]
+        logger.info("Writing rollup summary to %s", summary_path)
+        with metrics.time_export("summary"):
+            write_rollups(
+                reviews,
+                summary_path,
+                DATASET_ROLLUP_FIELDS,
+                format_options.get("summary", {}).get("chunkSize", DEFAULT_CHUNK_SIZE),
+            )
@@ -1,67 +1,242 @@
-thonimport json
+import json
 import logging
 from pathlib import Path
-from typing import Dict, Iterable, List
+from typing import IO, Any, Dict, Iterable, List, Optional
+from xml.etree.ElementTree import Element, SubElement, tostring
 
-import pandas as pd
-from xml.etree.ElementTree import Element, SubElement, ElementTree
+from instrumentation.metrics import RunMetrics
+from outputs.compression import compressed_path, open_output, resolve_codec
+from outputs.parquet_writer import (
+    CATEGORY,
+    DATE,
+    DEFAULT_COMPRESSION,
+    DEFAULT_ROW_GROUP_SIZE,
+    FLOAT,
+    INT,
+    JSON,
+    STRING,
+    TEXT_MAP,
+    write_parquet,
+)
+from outputs.normalize import NORMALIZED_REVIEW_COLUMNS
+from outputs.rollups import DEFAULT_CHUNK_SIZE, REVIEW_ROLLUP_FIELDS, write_rollups
+from outputs.spill import SpillBuffer, flat_rows, flatten_record, write_text_chunks, write_xlsx_chunks
+from outputs.sqlite_sink import DEFAULT_BATCH_SIZE, DEFAULT_DB_FILENAME, upsert_reviews
 
 logger = logging.getLogger("exporters")
 
+# Supported formats, in the order export_reviews writes them
+EXPORT_FORMATS = ("json", "csv", "excel", "html", "xml", "parquet", "sqlite", "summary")
+_EXTENSIONS = {"excel": "xlsx"}
+
+# Typed Parquet layout of the runner's Review records
+REVIEW_PARQUET_COLUMNS = [
+    ("id", STRING),
+    ("hotelId", CATEGORY),
+    ("reviewPage", INT),
+    ("userName", STRING),
+    ("userLocation", CATEGORY),
+    ("roomInfo", CATEGORY),
+    ("stayDate", DATE),
+    ("stayLength", CATEGORY),
+    ("reviewDate", DATE),
+    ("reviewTitle", STRING),
+    ("rating", FLOAT),
+    ("reviewTextParts", TEXT_MAP),
+    ("customData", JSON),
+]
+
 def _ensure_directory(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
+def write_json_array(f: IO[str], records: Iterable[Dict]) -> int:
+    """
+    Write ``records`` as a JSON array one record at a time, byte-identical
+    to ``json.dump(list(records), f, indent=2, ensure_ascii=False)``.
+    Returns the number of records written.
+    """
+    count = 0
+    for record in records:
+        encoded = json.dumps(record, indent=2, ensure_ascii=False)
+        f.write("[\n  " if count == 0 else ",\n  ")
+        f.write(encoded.replace("\n", "\n  "))
+        count += 1
+    f.write("\n]" if count else "[]")
+    return count
+
 def _export_json(
-    reviews: List[Dict],
+    reviews: Iterable[Dict],
     output_file: Path,
+    options: Dict[str, Any],
 ) -> Path:
-    with output_file.open("w", encoding="utf-8") as f:
-        json.dump(reviews, f, indent=2, ensure_ascii=False)
+    codec = resolve_codec(options)
+    output_file = compressed_path(output_file, codec)
+    with open_output(output_file, codec, options.get("level")) as f:
+        write_json_array(f, reviews)
     return output_file
 
 def _export_tabular(
-    reviews: List[Dict],
+    reviews: Iterable[Dict],
     output_file: Path,
     fmt: str,
+    options: Dict[str, Any],
 ) -> Path:
-    df = pd.json_normalize(reviews)
-    if fmt == "csv":
-        df.to_csv(output_file, index=False)
-    elif fmt == "excel":
-        df.to_excel(output_file, index=False)
-    elif fmt == "html":
-        df.to_html(output_file, index=False)
-    else:
+    if fmt not in {"csv", "excel", "html"}:
         raise ValueError(f"Unsupported tabular format: {fmt}")
+    if options.get("memoryLimit"):
+        return _export_tabular_spilled(reviews, output_file, fmt, options)
+
+    import pandas as pd  # deferred: JSON-only runs never load pandas
+
+    # Columns depend on every record, so tabular formats materialize here
+    df = pd.json_normalize(list(reviews))
+    if fmt == "excel":
+        # xlsx is already a zip container; stream compression does not apply
+        df.to_excel(output_file, index=False)
+        return output_file
+
+    codec = resolve_codec(options)
+    output_file = compressed_path(output_file, codec)
+    with open_output(output_file, codec, options.get("level")) as f:
+        if fmt == "csv":
+            df.to_csv(f, index=False)
+        else:
+            df.to_html(f, index=False)
+    return output_file
+
+def _export_tabular_spilled(
+    reviews: Iterable[Dict],
+    output_file: Path,
+    fmt: str,
+    options: Dict[str, Any],
+) -> Path:
+    # Two passes over a disk-backed buffer: the first collects the column
+    # union (json_normalize order), the second writes fixed-size chunks
+    limit = int(options["memoryLimit"])
+    with SpillBuffer(limit, options.get("spillDirectory")) as buffer:
+        columns: Dict[str, None] = {}
+        for record in reviews:
+            buffer.append(record)
+            for column, _ in flatten_record(record):
+                columns.setdefault(column)
+        row_chunks = (flat_rows(batch, columns) for batch in buffer.batches())
+        logger.debug(
+            "Writing %s from %d reviews in %d spilled segments.", fmt, len(buffer), len(buffer.segments)
+        )
+
+        if fmt == "excel":
+            write_xlsx_chunks(output_file, list(columns), row_chunks)
+            return output_file
+
+        codec = resolve_codec(options)
+        output_file = compressed_path(output_file, codec)
+        with open_output(output_file, codec, options.get("level")) as f:
+            write_text_chunks(f, fmt, list(columns), row_chunks)
     return output_file
 
+def _review_element(record: Dict) -> Element:
+    review_el = Element("review")
+    for key, value in record.items():
+        if isinstance(value, dict):
+            nested_el = SubElement(review_el, key)
+            for sub_key, sub_val in value.items():
+                leaf = SubElement(nested_el, sub_key)
+                leaf.text = "" if sub_val is None else str(sub_val)
+        else:
+            leaf = SubElement(review_el, key)
+            leaf.text = "" if value is None else str(value)
+    return review_el
+
 def _export_xml(
-    reviews: List[Dict],
+    reviews: Iterable[Dict],
     output_file: Path,
+    options: Dict[str, Any],
 ) -> Path:
-    root = Element("reviews")
-
-    for record in reviews:
-        review_el = SubElement(root, "review")
-        for key, value in record.items():
-            if isinstance(value, dict):
-                nested_el = SubElement(review_el, key)
-                for sub_key, sub_val in value.items():
-                    leaf = SubElement(nested_el, sub_key)
-                    leaf.text = "" if sub_val is None else str(sub_val)
-            else:
-                leaf = SubElement(review_el, key)
-                leaf.text = "" if value is None else str(value)
-
-    tree = ElementTree(root)
-    tree.write(output_file, encoding="utf-8", xml_declaration=True)
+    # Serialized one <review> at a time instead of building the whole tree
+    codec = resolve_codec(options)
+    output_file = compressed_path(output_file, codec)
+    with open_output(output_file, codec, options.get("level"), binary=True) as f:
+        f.write(b"<?xml version='1.0' encoding='utf-8'?>\n")
+        count = 0
+        for record in reviews:
+            if count == 0:
+                f.write(b"<reviews>")
+            f.write(tostring(_review_element(record), encoding="utf-8", xml_declaration=False))
+            count += 1
+        f.write(b"</reviews>" if count else b"<reviews />")
     return output_file
 
+def _export_parquet(
+    reviews: Iterable[Dict],
+    output_file: Path,
+    options: Dict[str, Any],
+) -> Path:
+    return write_parquet(
+        reviews,
+        output_file,
+        columns=REVIEW_PARQUET_COLUMNS
+        + (NORMALIZED_REVIEW_COLUMNS if options.get("normalized") else []),
+        month_from="reviewDate",
+        partition_by=options.get("partitionBy"),
+        row_group_size=options.get("rowGroupSize", DEFAULT_ROW_GROUP_SIZE),
+        compression=options.get("compression", DEFAULT_COMPRESSION),
+    )
+
+def _export_sqlite(
+    reviews: Iterable[Dict],
+    output_dir: Path,
+    options: Dict[str, Any],
+) -> Path:
+    # A single store shared across runs, unlike the timestamped exports
+    db_path = Path(options.get("path") or output_dir / DEFAULT_DB_FILENAME)
+    return upsert_reviews(
+        reviews,
+        db_path,
+        batch_size=options.get("batchSize", DEFAULT_BATCH_SIZE),
+    )
+
+def export_format(
+    fmt: str,
+    reviews: Iterable[Dict],
+    output_dir: Path,
+    base_filename: str,
+    options: Optional[Dict[str, Any]] = None,
+) -> Path:
+    """
+    Write ``reviews`` in a single format and return the written path.
+
+    JSON, XML, Parquet and SQLite consume ``reviews`` lazily, so callers may
+    pass a generator; the tabular formats collect it first, in memory or,
+    when ``options["memoryLimit"]`` (bytes) is set, in a ``SpillBuffer``.
+    """
+    options = options or {}
+    if fmt == "json":
+        return _export_json(reviews, output_dir / f"{base_filename}.json", options)
+    if fmt in {"csv", "excel", "html"}:
+        ext = _EXTENSIONS.get(fmt, fmt)
+        return _export_tabular(reviews, output_dir / f"{base_filename}.{ext}", fmt, options)
+    if fmt == "xml":
+        return _export_xml(reviews, output_dir / f"{base_filename}.xml", options)
+    if fmt == "parquet":
+        return _export_parquet(reviews, output_dir / f"{base_filename}.parquet", options)
+    if fmt == "sqlite":
+        return _export_sqlite(reviews, output_dir, options)
+    if fmt == "summary":
+        return write_rollups(
+            reviews,
+            output_dir / f"{base_filename}.summary.json",
+            REVIEW_ROLLUP_FIELDS,
+            options.get("chunkSize", DEFAULT_CHUNK_SIZE),
+        )
+    raise ValueError(f"Unsupported export format: {fmt}")
+
 def export_reviews(
     reviews: Iterable[Dict],
     output_dir: Path | str,
     base_filename: str,
     formats: List[str],
+    format_options: Optional[Dict[str, Dict[str, Any]]] = None,
+    metrics: Optional[RunMetrics] = None,
 ) -> Dict[str, Path]:
     """
     Export reviews to multiple formats.
@@ -75,7 +250,15 @@ def export_reviews(
     base_filename: str
         Base file name without extension.
     formats: List[str]
-        Formats to export, e.g. ["json", "csv", "excel", "xml", "html"].
+        Formats to export, e.g. ["json", "csv", "excel", "xml", "html",
+        "parquet", "sqlite", "summary"]. "summary" writes per-hotel
+        rollups (see ``outputs.rollups``).
+    format_options: Optional[Dict[str, Dict[str, Any]]]
+        Per-format settings, e.g. {"parquet": {"partitionBy": ["hotelId"]}},
+        {"sqlite": {"path": "reviews.sqlite"}} or, for the text formats,
+        {"json": {"compression": "zstd", "level": 3}}.
+    metrics: Optional[RunMetrics]
+        Run metrics to record the export time per format into.
 
     Returns
     -------
@@ -92,6 +275,8 @@ def export_reviews(
         raise ValueError("No reviews provided for export.")
 
     export_map: Dict[str, Path] = {}
+    format_options = format_options or {}
+    metrics = metrics or RunMetrics()
     normalized_formats = {fmt.lower() for fmt in formats}
 
     logger.debug(
@@ -100,19 +285,12 @@ def export_reviews(
         ", ".join(sorted(normalized_formats)),
     )
 
-    if "json" in normalized_formats:
-        json_file = output_dir / f"{base_filename}.json"
-        export_map["json"] = _export_json(reviews_list, json_file)
-
-    for fmt in ("csv", "excel", "html"):
+    for fmt in EXPORT_FORMATS:
         if fmt in normalized_formats:
-            ext = "csv" if fmt == "csv" else ("xlsx" if fmt == "excel" else "html")
-            tabular_file = output_dir / f"{base_filename}.{ext}"
-            export_map[fmt] = _export_tabular(reviews_list, tabular_file, fmt)
-
-    if "xml" in normalized_formats:
-        xml_file = output_dir / f"{base_filename}.xml"
-        export_map["xml"] = _export_xml(reviews_list, xml_file)
+            with metrics.time_export(fmt):
+                export_map[fmt] = export_format(
+                    fmt, reviews_list, output_dir, base_filename, format_options.get(fmt)
+                )
 
     logger.info("Export completed. Files: %s", export_map)
     return export_map
\ No newline at end of file
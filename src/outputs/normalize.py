@@ -0,0 +1,141 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+from extractors.utils_cleaner import DATE_LABEL_RE, NUMBER_RE
+from outputs.country_codes import COUNTRY_CODES
+from outputs.parquet_writer import CATEGORY, INT, STRING
+
+logger = logging.getLogger("exporters.normalize")
+
+# Reviews normalized per call when a caller collects them in chunks
+DEFAULT_CHUNK_SIZE = 10000
+
+# Where each normalized input lives in a record (dotted paths reach into
+# dicts); None skips that conversion
+REVIEW_NORMALIZE_FIELDS: Dict[str, Optional[str]] = {
+    "rating": "rating",
+    "reviewDate": "reviewDate",
+    "stayDate": "stayDate",
+    "stayLength": "stayLength",
+    "country": "userLocation",
+}
+DATASET_NORMALIZE_FIELDS: Dict[str, Optional[str]] = {
+    "rating": "score",
+    "reviewDate": "reviewDate",
+    "stayDate": None,
+    # booking.nights is already an integer
+    "stayLength": None,
+    "country": "guest.country",
+}
+
+# Added next to the stay length and the country they are derived from
+NIGHTS_FIELD = "nights"
+COUNTRY_CODE_FIELD = "countryCode"
+# Added next to the review date, which is rewritten to ISO
+REVIEW_DATE_RAW_FIELD = "reviewDateRaw"
+
+# Extra typed Parquet columns of normalized runner reviews
+NORMALIZED_REVIEW_COLUMNS = [
+    (NIGHTS_FIELD, INT),
+    (COUNTRY_CODE_FIELD, CATEGORY),
+    (REVIEW_DATE_RAW_FIELD, STRING),
+]
+
+def _split(path: str) -> List[str]:
+    return path.split(".")
+
+def _parent(record: Dict[str, Any], keys: List[str]) -> Optional[Dict[str, Any]]:
+    value: Any = record
+    for key in keys[:-1]:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value if isinstance(value, dict) else None
+
+def _assign(records: List[Dict[str, Any]], path: str, values: List[Any], key: Optional[str] = None) -> None:
+    keys = _split(path)
+    for record, value in zip(records, values):
+        parent = _parent(record, keys)
+        if parent is not None:
+            parent[key or keys[-1]] = value
+
+def _python_values(series: Any) -> List[Any]:
+    # JSON-safe: NaN/NA become None, numpy scalars Python numbers
+    return series.astype(object).where(series.notna(), None).tolist()
+
+def normalize_reviews(
+    records: List[Dict[str, Any]],
+    fields: Dict[str, Optional[str]] = REVIEW_NORMALIZE_FIELDS,
+) -> List[Dict[str, Any]]:
+    """
+    Convert the scraped text fields of a batch of reviews to typed values,
+    one vectorized pandas operation per field for the whole batch:
+
+    - the rating becomes a float (None when there is no number),
+    - the review date becomes an ISO date (``2024-01-12``) and the stay
+      date an ISO month (``2024-01``); unparseable dates are left as is,
+      and the scraped review date is kept as ``reviewDateRaw``,
+    - ``nights`` (int) is added next to the stay length,
+    - ``countryCode`` (ISO 3166-1 alpha-2, None when unknown) is added next
+      to the reviewer's country.
+
+    ``records`` is updated in place and returned. ``fields`` names the
+    record fields holding each input (see ``DATASET_NORMALIZE_FIELDS`` for
+    the dataset layout).
+    """
+    if not records:
+        return records
+    import pandas as pd  # deferred: only runs that normalize load pandas
+
+    def column(path: str) -> Any:
+        keys = _split(path)
+        values = []
+        for record in records:
+            parent = _parent(record, keys)
+            values.append(parent.get(keys[-1]) if parent is not None else None)
+        return pd.Series(values, dtype=object)
+
+    def text(path: str) -> Any:
+        return column(path).astype("string").str.strip()
+
+    if fields.get("rating"):
+        rating = pd.to_numeric(
+            text(fields["rating"]).str.extract(NUMBER_RE, expand=False), errors="coerce"
+        ).astype("float64")
+        _assign(records, fields["rating"], _python_values(rating))
+
+    for name, fmt in (("reviewDate", "%Y-%m-%d"), ("stayDate", "%Y-%m")):
+        path = fields.get(name)
+        if not path:
+            continue
+        raw = column(path)
+        if name == "reviewDate":
+            # The scraped text is kept, e.g. for the SQLite reviewDateText
+            # column; a second pass keeps the first pass's original
+            keys = _split(path)
+            for record, value in zip(records, raw.tolist()):
+                parent = _parent(record, keys)
+                if parent is not None:
+                    parent.setdefault(REVIEW_DATE_RAW_FIELD, value)
+        parsed = pd.to_datetime(
+            raw.astype("string").str.replace(DATE_LABEL_RE, "", regex=True).str.strip(),
+            format="mixed",
+            errors="coerce",
+        )
+        iso = parsed.dt.strftime(fmt).astype(object)
+        _assign(records, path, _python_values(iso.where(parsed.notna(), raw)))
+
+    if fields.get("stayLength"):
+        nights = pd.to_numeric(
+            text(fields["stayLength"]).str.extract(r"(\d+)", expand=False), errors="coerce"
+        ).astype("Int64")
+        _assign(records, fields["stayLength"], _python_values(nights), NIGHTS_FIELD)
+
+    if fields.get("country"):
+        # Categorical: the lookup runs once per distinct country
+        countries = text(fields["country"]).astype("category")
+        lookup = {name: COUNTRY_CODES.get(name.casefold()) for name in countries.cat.categories}
+        codes = countries.map(lookup).astype(object)
+        _assign(records, fields["country"], _python_values(codes), COUNTRY_CODE_FIELD)
+
+    return records
@@ -0,0 +1,258 @@
+import json
+import logging
+import re
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from extractors.utils_cleaner import DATE_LABEL_RE
+
+logger = logging.getLogger("exporters.parquet")
+
+# ISO dates and months, as written by outputs.normalize
+_ISO_DATE_RE = re.compile(r"^(\d{4})-(\d{2})(?:-(\d{2}))?$")
+
+DEFAULT_ROW_GROUP_SIZE = 10_000
+DEFAULT_COMPRESSION = "zstd"
+REVIEW_MONTH_COLUMN = "reviewMonth"
+
+# Column kinds understood by the writer. "category" columns are stored as
+# Arrow dictionaries, "map" holds flat str->str dicts and "json" serializes
+# arbitrary nested values.
+STRING = "string"
+CATEGORY = "category"
+FLOAT = "float"
+INT = "int"
+DATE = "date"
+TEXT_MAP = "map"
+JSON = "json"
+
+ColumnSpec = Sequence[Tuple[str, str]]
+
+def _import_pyarrow() -> Tuple[Any, Any, Any]:
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+    except ImportError as exc:
+        raise RuntimeError(
+            "Parquet export requires the 'pyarrow' package (pip install pyarrow)."
+        ) from exc
+    return pa, pq, ds
+
+def _arrow_type(pa: Any, kind: str) -> Any:
+    if kind == CATEGORY:
+        return pa.dictionary(pa.int32(), pa.string())
+    if kind == FLOAT:
+        return pa.float64()
+    if kind == INT:
+        return pa.int64()
+    if kind == DATE:
+        return pa.date32()
+    if kind == TEXT_MAP:
+        return pa.map_(pa.string(), pa.string())
+    if kind in {STRING, JSON}:
+        return pa.string()
+    raise ValueError(f"Unsupported column kind: {kind}")
+
+def _to_float(value: Any) -> Optional[float]:
+    if value is None or value == "":
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+def _to_int(value: Any) -> Optional[int]:
+    number = _to_float(value)
+    return None if number is None else int(number)
+
+def _to_text(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return str(value)
+
+def _to_map(value: Any) -> Optional[List[Tuple[str, str]]]:
+    if not isinstance(value, dict):
+        return None
+    return [(str(k), "" if v is None else str(v)) for k, v in value.items()]
+
+def _to_json(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    return json.dumps(value, ensure_ascii=False, sort_keys=True)
+
+def parse_dates(values: Sequence[Any]) -> List[Optional[date]]:
+    """
+    Parse a batch of review dates in one pandas call per representation.
+
+    Numbers are treated as Unix epoch seconds (as in the dataset schema),
+    strings as free-form dates such as "January 12, 2022" or "2022-08-19",
+    optionally behind a label ("Reviewed: ..."). ISO dates and months
+    (already normalized) are read directly, without pandas. Unparseable
+    values become None.
+    """
+    result: List[Optional[date]] = [None] * len(values)
+
+    epoch_idx = [
+        i for i, v in enumerate(values)
+        if isinstance(v, (int, float)) and not isinstance(v, bool)
+    ]
+    text_idx = []
+    for i, v in enumerate(values):
+        if not isinstance(v, str) or not v.strip():
+            continue
+        iso = _ISO_DATE_RE.match(v)
+        if iso is None:
+            text_idx.append(i)
+            continue
+        try:
+            result[i] = date(int(iso.group(1)), int(iso.group(2)), int(iso.group(3) or 1))
+        except ValueError:
+            pass
+
+    if not epoch_idx and not text_idx:
+        return result
+    import pandas as pd  # deferred: only the Parquet/SQLite stages need it
+
+    if epoch_idx:
+        parsed = pd.to_datetime([values[i] for i in epoch_idx], unit="s", errors="coerce")
+        for i, ts in zip(epoch_idx, parsed):
+            result[i] = None if pd.isna(ts) else ts.date()
+
+    if text_idx:
+        parsed = pd.to_datetime(
+            [DATE_LABEL_RE.sub("", values[i].strip()) for i in text_idx],
+            format="mixed",
+            errors="coerce",
+        )
+        for i, ts in zip(text_idx, parsed):
+            result[i] = None if pd.isna(ts) else ts.date()
+
+    return result
+
+def _chunks(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    chunk: List[Dict[str, Any]] = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+def _column_values(kind: str, raw: List[Any]) -> List[Any]:
+    if kind == FLOAT:
+        return [_to_float(v) for v in raw]
+    if kind == INT:
+        return [_to_int(v) for v in raw]
+    if kind == DATE:
+        return parse_dates(raw)
+    if kind == TEXT_MAP:
+        return [_to_map(v) for v in raw]
+    if kind == JSON:
+        return [_to_json(v) for v in raw]
+    return [_to_text(v) for v in raw]
+
+def _build_schema(pa: Any, columns: ColumnSpec, month_from: Optional[str]) -> Any:
+    fields = [pa.field(name, _arrow_type(pa, kind)) for name, kind in columns]
+    if month_from:
+        fields.append(pa.field(REVIEW_MONTH_COLUMN, _arrow_type(pa, CATEGORY)))
+    return pa.schema(fields)
+
+def _to_record_batch(
+    pa: Any,
+    schema: Any,
+    columns: ColumnSpec,
+    chunk: List[Dict[str, Any]],
+    month_from: Optional[str],
+) -> Any:
+    arrays = []
+    parsed: Dict[str, List[Any]] = {}
+
+    for name, kind in columns:
+        values = _column_values(kind, [row.get(name) for row in chunk])
+        parsed[name] = values
+        if kind == CATEGORY:
+            arrays.append(pa.array(values, pa.string()).dictionary_encode())
+        else:
+            arrays.append(pa.array(values, _arrow_type(pa, kind)))
+
+    if month_from:
+        months = [d.strftime("%Y-%m") if d else None for d in parsed[month_from]]
+        arrays.append(pa.array(months, pa.string()).dictionary_encode())
+
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+def write_parquet(
+    rows: Iterable[Dict[str, Any]],
+    output_path: Path | str,
+    columns: ColumnSpec,
+    month_from: Optional[str] = None,
+    partition_by: Optional[Sequence[str]] = None,
+    row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+    compression: str = DEFAULT_COMPRESSION,
+) -> Path:
+    """
+    Stream rows into a typed Parquet file (or a hive-partitioned directory).
+
+    Parameters
+    ----------
+    rows: Iterable[Dict[str, Any]]
+        Flat row dictionaries; consumed lazily one row group at a time.
+    output_path: Path | str
+        Target file, or the dataset root directory when partitioning.
+    columns: ColumnSpec
+        Ordered (column name, kind) pairs describing the output schema.
+    month_from: Optional[str]
+        Date column used to derive the ``reviewMonth`` (YYYY-MM) column.
+    partition_by: Optional[Sequence[str]]
+        Columns to partition on, e.g. ["hotelId", "reviewMonth"].
+    row_group_size: int
+        Maximum number of rows buffered and written per row group.
+    compression: str
+        Parquet compression codec.
+
+    Returns
+    -------
+    Path
+        The written file or dataset directory.
+    """
+    pa, pq, ds = _import_pyarrow()
+    output_path = Path(output_path)
+    row_group_size = max(1, int(row_group_size))
+
+    schema = _build_schema(pa, columns, month_from)
+    partition_by = list(partition_by or [])
+    unknown = [name for name in partition_by if schema.get_field_index(name) < 0]
+    if unknown:
+        raise ValueError(f"Unknown Parquet partition columns: {unknown}")
+
+    batches = (
+        _to_record_batch(pa, schema, columns, chunk, month_from)
+        for chunk in _chunks(rows, row_group_size)
+    )
+
+    if partition_by:
+        logger.debug("Writing partitioned Parquet dataset to %s by %s", output_path, partition_by)
+        file_format = ds.ParquetFileFormat()
+        ds.write_dataset(
+            batches,
+            base_dir=str(output_path),
+            schema=schema,
+            format=file_format,
+            file_options=file_format.make_write_options(compression=compression),
+            partitioning=ds.partitioning(
+                pa.schema([schema.field(name) for name in partition_by]),
+                flavor="hive",
+            ),
+            max_rows_per_group=row_group_size,
+            existing_data_behavior="delete_matching",
+        )
+        return output_path
+
+    logger.debug("Writing Parquet file to %s", output_path)
+    with pq.ParquetWriter(str(output_path), schema, compression=compression) as writer:
+        for batch in batches:
+            writer.write_batch(batch, row_group_size=row_group_size)
+    return output_path
@@ -0,0 +1,158 @@
+import json
+import logging
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from outputs.parquet_writer import _chunks, parse_dates
+
+logger = logging.getLogger("exporters.rollups")
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# Where each rollup input lives in a record (dotted paths reach into dicts)
+REVIEW_ROLLUP_FIELDS = {
+    "hotel": "hotelId",
+    "rating": "rating",
+    "date": "reviewDate",
+    "location": "userLocation",
+}
+DATASET_ROLLUP_FIELDS = {
+    "hotel": "hotelId",
+    "rating": "score",
+    "date": "reviewDate",
+    "location": "guest.country",
+}
+
+def _get(record: Dict[str, Any], path: str) -> Any:
+    value: Any = record
+    for key in path.split("."):
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+class _Totals:
+    """Running sums that chunk-level groupbys are folded into."""
+
+    def __init__(self) -> None:
+        # hotel -> [reviews, rated, rating sum, first date, last date]
+        self.hotels: Dict[str, List[Any]] = {}
+        # (hotel, month) -> [reviews, rated, rating sum]
+        self.months: Dict[Tuple[str, str], List[float]] = {}
+        self.locations: Dict[Tuple[str, str], int] = {}
+
+    def add_chunk(self, chunk: List[Dict[str, Any]], fields: Dict[str, str]) -> None:
+        import pandas as pd  # deferred: JSON-only runs never load pandas
+
+        dates = pd.to_datetime(
+            pd.Series(parse_dates([_get(r, fields["date"]) for r in chunk]), dtype=object)
+        )
+        df = pd.DataFrame(
+            {
+                "hotel": [_get(r, fields["hotel"]) or "" for r in chunk],
+                "rating": pd.to_numeric(
+                    pd.Series([_get(r, fields["rating"]) for r in chunk], dtype=object),
+                    errors="coerce",
+                ),
+                "date": dates,
+                "month": dates.dt.strftime("%Y-%m"),
+                "location": [_get(r, fields["location"]) or None for r in chunk],
+            }
+        )
+
+        per_hotel = df.groupby("hotel", sort=False).agg(
+            reviews=("hotel", "size"),
+            rated=("rating", "count"),
+            rating_sum=("rating", "sum"),
+            first=("date", "min"),
+            last=("date", "max"),
+        )
+        for hotel, row in per_hotel.iterrows():
+            first = None if pd.isna(row["first"]) else row["first"].date()
+            last = None if pd.isna(row["last"]) else row["last"].date()
+            totals = self.hotels.setdefault(hotel, [0, 0, 0.0, first, last])
+            totals[0] += int(row["reviews"])
+            totals[1] += int(row["rated"])
+            totals[2] += float(row["rating_sum"])
+            if first is not None and (totals[3] is None or first < totals[3]):
+                totals[3] = first
+            if last is not None and (totals[4] is None or last > totals[4]):
+                totals[4] = last
+
+        per_month = (
+            df.dropna(subset=["month"])
+            .groupby(["hotel", "month"], sort=False)
+            .agg(reviews=("hotel", "size"), rated=("rating", "count"), rating_sum=("rating", "sum"))
+        )
+        for key, row in per_month.iterrows():
+            totals = self.months.setdefault(key, [0, 0, 0.0])
+            totals[0] += int(row["reviews"])
+            totals[1] += int(row["rated"])
+            totals[2] += float(row["rating_sum"])
+
+        per_location = df.dropna(subset=["location"]).groupby(["hotel", "location"], sort=False).size()
+        for key, count in per_location.items():
+            self.locations[key] = self.locations.get(key, 0) + int(count)
+
+    def summary(self) -> Dict[str, Any]:
+        hotels: Dict[str, Dict[str, Any]] = {}
+        for hotel, (reviews, rated, rating_sum, first, last) in self.hotels.items():
+            hotels[hotel] = {
+                "reviewCount": reviews,
+                "ratedCount": rated,
+                "averageRating": _average(rating_sum, rated),
+                "firstReviewDate": first.isoformat() if first else None,
+                "lastReviewDate": last.isoformat() if last else None,
+                "reviewsByMonth": {},
+                "averageRatingByMonth": {},
+                "locations": {},
+            }
+        for (hotel, month), (reviews, rated, rating_sum) in sorted(self.months.items()):
+            hotels[hotel]["reviewsByMonth"][month] = reviews
+            hotels[hotel]["averageRatingByMonth"][month] = _average(rating_sum, rated)
+        # Most common locations first
+        for (hotel, location), count in sorted(self.locations.items(), key=lambda item: -item[1]):
+            hotels[hotel]["locations"][location] = count
+
+        return {
+            "reviewCount": sum(h["reviewCount"] for h in hotels.values()),
+            "hotelCount": len(hotels),
+            "hotels": hotels,
+        }
+
+def _average(total: float, count: int) -> Optional[float]:
+    return round(total / count, 2) if count else None
+
+def compute_rollups(
+    records: Iterable[Dict[str, Any]],
+    fields: Dict[str, str] = REVIEW_ROLLUP_FIELDS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Per-hotel review count, average rating, reviews and average rating per
+    month, and review counts per guest location.
+
+    ``records`` is read once, ``chunk_size`` records at a time; each chunk
+    is aggregated with pandas groupbys and folded into running totals, so
+    memory stays proportional to the number of hotels, not reviews.
+    ``fields`` names the record fields holding the hotel, rating, date and
+    location.
+    """
+    totals = _Totals()
+    for chunk in _chunks(records, max(1, int(chunk_size))):
+        totals.add_chunk(chunk, fields)
+    return totals.summary()
+
+def write_rollups(
+    records: Iterable[Dict[str, Any]],
+    output_file: Path | str,
+    fields: Dict[str, str] = REVIEW_ROLLUP_FIELDS,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Path:
+    """Compute the rollups of ``records`` and write them as a JSON summary file."""
+    output_file = Path(output_file)
+    summary = compute_rollups(records, fields, chunk_size)
+    with output_file.open("w", encoding="utf-8") as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    logger.debug("Wrote rollups for %d hotels to %s", summary["hotelCount"], output_file)
+    return output_file
@@ -0,0 +1,218 @@
+import json
+import logging
+import math
+import shutil
+import tempfile
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("exporters.spill")
+
+_BYTES_PER_MB = 1024 * 1024
+
+def memory_limit_bytes(limit_mb: Optional[float]) -> Optional[int]:
+    """``memoryLimitMb`` config value in bytes; None or 0 means unbounded."""
+    if not limit_mb:
+        return None
+    return max(1, int(float(limit_mb) * _BYTES_PER_MB))
+
+def _encode(record: Dict[str, Any]) -> str:
+    return json.dumps(record, ensure_ascii=False, separators=(",", ":"))
+
+def record_size(record: Dict[str, Any]) -> int:
+    """Size of ``record`` as counted against a ``SpillBuffer``'s memory limit."""
+    return len(_encode(record))
+
+class SpillBuffer:
+    """
+    Append-only collection of review dictionaries with a memory ceiling.
+
+    Records are held JSON-encoded; once they add up to more than
+    ``memory_limit`` bytes (counted as encoded characters, so the ceiling
+    is approximate) they are flushed to a new JSON Lines segment file under
+    ``spill_dir`` (a temporary directory by default). Iterating yields every
+    record in insertion order, reading the segments back as a stream, and
+    may be repeated until ``close`` deletes the segments.
+    """
+
+    def __init__(self, memory_limit: int, spill_dir: Optional[Path | str] = None) -> None:
+        self.memory_limit = max(1, int(memory_limit))
+        self.spill_dir = Path(spill_dir) if spill_dir else None
+        self.segments: List[Path] = []
+        self._lines: List[str] = []
+        self._buffered = 0
+        self._count = 0
+        self._tmp_dir: Optional[Path] = None
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def headroom(self) -> int:
+        """Encoded bytes that can still be appended before the buffer spills."""
+        return max(0, self.memory_limit - self._buffered)
+
+    def __enter__(self) -> "SpillBuffer":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
+
+    def append(self, record: Dict[str, Any]) -> None:
+        line = _encode(record)
+        self._lines.append(line)
+        self._buffered += len(line)
+        self._count += 1
+        if self._buffered >= self.memory_limit:
+            self._spill()
+
+    def extend(self, records: Iterable[Dict[str, Any]]) -> None:
+        for record in records:
+            self.append(record)
+
+    def _spill(self) -> None:
+        if self._tmp_dir is None:
+            if self.spill_dir:
+                self.spill_dir.mkdir(parents=True, exist_ok=True)
+            self._tmp_dir = Path(tempfile.mkdtemp(prefix="spill-", dir=self.spill_dir))
+        path = self._tmp_dir / f"segment-{len(self.segments):05d}.jsonl"
+        with path.open("w", encoding="utf-8") as f:
+            for line in self._lines:
+                f.write(line)
+                f.write("\n")
+        self.segments.append(path)
+        logger.debug("Spilled %d reviews (%d bytes) to %s.", len(self._lines), self._buffered, path)
+        self._lines = []
+        self._buffered = 0
+
+    def _iter_lines(self) -> Iterator[str]:
+        for path in self.segments:
+            with path.open("r", encoding="utf-8") as f:
+                yield from f
+        yield from self._lines
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for line in self._iter_lines():
+            yield json.loads(line)
+
+    def batches(self, max_bytes: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """Records in insertion order, grouped into lists of at most ``max_bytes`` encoded."""
+        max_bytes = max_bytes or self.memory_limit
+        batch: List[Dict[str, Any]] = []
+        size = 0
+        for line in self._iter_lines():
+            if batch and size + len(line) > max_bytes:
+                yield batch
+                batch, size = [], 0
+            batch.append(json.loads(line))
+            size += len(line)
+        if batch:
+            yield batch
+
+    def close(self) -> None:
+        """Drop the buffered records and delete the spilled segments."""
+        self._lines = []
+        self._buffered = 0
+        if self._tmp_dir is not None:
+            shutil.rmtree(self._tmp_dir, ignore_errors=True)
+            self._tmp_dir = None
+        self.segments = []
+
+def iter_batches(records: Iterable[Dict[str, Any]], max_bytes: int) -> Iterator[List[Dict[str, Any]]]:
+    """Group ``records`` into lists of about ``max_bytes`` JSON-encoded each."""
+    if isinstance(records, SpillBuffer):
+        yield from records.batches(max_bytes)
+        return
+    batch: List[Dict[str, Any]] = []
+    size = 0
+    for record in records:
+        length = len(_encode(record))
+        if batch and size + length > max_bytes:
+            yield batch
+            batch, size = [], 0
+        batch.append(record)
+        size += length
+    if batch:
+        yield batch
+
+# -- chunked tabular writers ----------------------------------------------
+
+def flatten_record(record: Dict[str, Any], prefix: str = "") -> Iterator[Tuple[str, Any]]:
+    """``(dotted column, value)`` pairs the way ``pd.json_normalize`` flattens a record."""
+    for key, value in record.items():
+        column = f"{prefix}{key}"
+        if isinstance(value, dict):
+            yield from flatten_record(value, f"{column}.")
+        else:
+            yield column, value
+
+def flat_rows(
+    records: Iterable[Dict[str, Any]], columns: Sequence[str]
+) -> List[List[Any]]:
+    """Flattened ``records`` as rows over ``columns``; missing cells are NaN."""
+    rows = []
+    for record in records:
+        flat = dict(flatten_record(record))
+        rows.append([flat[c] if c in flat else math.nan for c in columns])
+    return rows
+
+def write_text_chunks(
+    f: IO[str],
+    fmt: str,
+    columns: Sequence[str],
+    row_chunks: Iterable[List[List[Any]]],
+) -> None:
+    """
+    Write CSV or HTML one chunk of rows at a time under a fixed header.
+
+    Chunks are framed as object columns, so a chunk never changes how a
+    column is formatted (an integer column with gaps stays integer).
+    """
+    import pandas as pd  # deferred: JSON-only runs never load pandas
+
+    wrote_any = False
+    for rows in row_chunks:
+        df = pd.DataFrame(rows, columns=list(columns), dtype=object)
+        if fmt == "csv":
+            df.to_csv(f, index=False, header=not wrote_any)
+        else:
+            # Splice each chunk's <tbody> rows into one table
+            html = df.to_html(index=False, header=not wrote_any)
+            head, body = html.split("  <tbody>\n", 1)
+            if not wrote_any:
+                f.write(head)
+                f.write("  <tbody>\n")
+            f.write(body[: body.rindex("  </tbody>")])
+        wrote_any = True
+
+    if not wrote_any:
+        empty = pd.DataFrame(columns=list(columns))
+        if fmt == "csv":
+            empty.to_csv(f, index=False)
+        else:
+            empty.to_html(f, index=False)
+    elif fmt != "csv":
+        f.write("  </tbody>\n</table>")
+
+def write_xlsx_chunks(
+    path: Path | str,
+    columns: Sequence[str],
+    row_chunks: Iterable[List[List[Any]]],
+) -> None:
+    """Write an ``.xlsx`` sheet with openpyxl's write-only (streaming) workbook."""
+    from openpyxl import Workbook  # deferred with the other tabular dependencies
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Sheet1")
+    sheet.append(list(columns))
+    for rows in row_chunks:
+        for row in rows:
+            sheet.append([_excel_cell(value) for value in row])
+    workbook.save(str(path))
+
+def _excel_cell(value: Any) -> Any:
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return None
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
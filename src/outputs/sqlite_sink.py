@@ -0,0 +1,156 @@
+import json
+import logging
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+from outputs.normalize import REVIEW_DATE_RAW_FIELD
+from outputs.parquet_writer import parse_dates
+
+logger = logging.getLogger("exporters.sqlite")
+
+DEFAULT_DB_FILENAME = "booking_reviews.sqlite"
+DEFAULT_BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reviews (
+    id TEXT PRIMARY KEY,
+    hotelId TEXT NOT NULL,
+    reviewPage INTEGER,
+    userName TEXT,
+    userLocation TEXT,
+    roomInfo TEXT,
+    stayDate TEXT,
+    stayLength TEXT,
+    reviewDate TEXT,
+    reviewDateText TEXT,
+    reviewTitle TEXT,
+    rating REAL,
+    reviewTextParts TEXT,
+    customData TEXT,
+    firstSeenAt TEXT NOT NULL,
+    lastSeenAt TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_reviews_hotel ON reviews (hotelId);
+CREATE INDEX IF NOT EXISTS idx_reviews_date ON reviews (reviewDate);
+CREATE INDEX IF NOT EXISTS idx_reviews_rating ON reviews (rating);
+"""
+
+_UPSERT = """
+INSERT INTO reviews (
+    id, hotelId, reviewPage, userName, userLocation, roomInfo, stayDate,
+    stayLength, reviewDate, reviewDateText, reviewTitle, rating,
+    reviewTextParts, customData, firstSeenAt, lastSeenAt
+) VALUES (
+    :id, :hotelId, :reviewPage, :userName, :userLocation, :roomInfo, :stayDate,
+    :stayLength, :reviewDate, :reviewDateText, :reviewTitle, :rating,
+    :reviewTextParts, :customData, :seenAt, :seenAt
+)
+ON CONFLICT(id) DO UPDATE SET
+    hotelId = excluded.hotelId,
+    reviewPage = excluded.reviewPage,
+    userName = excluded.userName,
+    userLocation = excluded.userLocation,
+    roomInfo = excluded.roomInfo,
+    stayDate = excluded.stayDate,
+    stayLength = excluded.stayLength,
+    reviewDate = excluded.reviewDate,
+    reviewDateText = excluded.reviewDateText,
+    reviewTitle = excluded.reviewTitle,
+    rating = excluded.rating,
+    reviewTextParts = excluded.reviewTextParts,
+    customData = excluded.customData,
+    lastSeenAt = excluded.lastSeenAt
+"""
+
+def _to_rating(value: Any) -> float | None:
+    try:
+        return float(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+def _to_params(batch: List[Dict[str, Any]], seen_at: str) -> List[Dict[str, Any]]:
+    review_dates = parse_dates([r.get("reviewDate") for r in batch])
+    params: List[Dict[str, Any]] = []
+
+    for record, review_date in zip(batch, review_dates):
+        params.append(
+            {
+                "id": record["id"],
+                "hotelId": record.get("hotelId") or "",
+                "reviewPage": record.get("reviewPage"),
+                "userName": record.get("userName"),
+                "userLocation": record.get("userLocation"),
+                "roomInfo": record.get("roomInfo"),
+                "stayDate": record.get("stayDate"),
+                "stayLength": record.get("stayLength"),
+                "reviewDate": review_date.isoformat() if review_date else None,
+                # As scraped, also for normalized reviews
+                "reviewDateText": record.get(REVIEW_DATE_RAW_FIELD, record.get("reviewDate")),
+                "reviewTitle": record.get("reviewTitle"),
+                "rating": _to_rating(record.get("rating")),
+                "reviewTextParts": json.dumps(
+                    record.get("reviewTextParts") or {}, ensure_ascii=False
+                ),
+                "customData": json.dumps(record.get("customData") or {}, ensure_ascii=False),
+                "seenAt": seen_at,
+            }
+        )
+    return params
+
+def upsert_reviews(
+    reviews: Iterable[Dict[str, Any]],
+    db_path: Path | str,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Path:
+    """
+    Upsert review dictionaries into a SQLite store keyed by review ``id``.
+
+    Each batch is written in its own transaction, so an interrupted run keeps
+    everything committed so far. Existing rows keep their ``firstSeenAt``
+    timestamp and get their fields and ``lastSeenAt`` refreshed.
+
+    Parameters
+    ----------
+    reviews: Iterable[Dict[str, Any]]
+        Review dictionaries (see ``extractors.booking_parser.Review``).
+    db_path: Path | str
+        SQLite database file; created along with its tables when missing.
+    batch_size: int
+        Number of reviews written per transaction.
+
+    Returns
+    -------
+    Path
+        The database path.
+    """
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    batch_size = max(1, int(batch_size))
+    seen_at = datetime.utcnow().isoformat(timespec="seconds")
+
+    conn = sqlite3.connect(str(db_path))
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+
+        written = 0
+        batch: List[Dict[str, Any]] = []
+        for record in reviews:
+            batch.append(record)
+            if len(batch) >= batch_size:
+                with conn:
+                    conn.executemany(_UPSERT, _to_params(batch, seen_at))
+                written += len(batch)
+                batch = []
+        if batch:
+            with conn:
+                conn.executemany(_UPSERT, _to_params(batch, seen_at))
+            written += len(batch)
+    finally:
+        conn.close()
+
+    logger.debug("Upserted %d reviews into %s", written, db_path)
+    return db_path
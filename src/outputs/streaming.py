@@ -0,0 +1,201 @@
+import logging
+import queue
+import threading
+import time
+from contextlib import ExitStack
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from instrumentation.metrics import RunMetrics
+from outputs.exporters import EXPORT_FORMATS, export_format
+from outputs.normalize import normalize_reviews
+from outputs.spill import memory_limit_bytes
+
+logger = logging.getLogger("exporters.streaming")
+
+DEFAULT_MAX_PENDING_BATCHES = 4
+# Formats that need every review before writing and so spill under a limit
+_COLLECTING_FORMATS = ("csv", "excel", "html")
+
+_END = object()
+
+class _FormatWriter(threading.Thread):
+    """
+    Consumer thread that feeds queued review batches to a single format
+    writer as one lazy stream of reviews.
+    """
+
+    def __init__(
+        self,
+        fmt: str,
+        output_dir: Path,
+        base_filename: str,
+        options: Optional[Dict[str, Any]],
+        max_pending_batches: int,
+        metrics: RunMetrics,
+    ) -> None:
+        super().__init__(name=f"export-{fmt}", daemon=True)
+        self.fmt = fmt
+        self.output_dir = output_dir
+        self.base_filename = base_filename
+        self.options = options
+        self.batches: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending_batches)
+        self.path: Optional[Path] = None
+        self.error: Optional[BaseException] = None
+        self.metrics = metrics
+        self._ended = False
+        self._waited = 0.0
+
+    def _iter_reviews(self, stage: ExitStack) -> Iterator[Dict[str, Any]]:
+        # The export stage is only held while the writer is busy, never
+        # while it waits for the crawl, so fetch/parse can be profiled too.
+        while True:
+            stage.close()
+            wait_start = time.perf_counter()
+            batch = self.batches.get()
+            self._waited += time.perf_counter() - wait_start
+            stage.enter_context(self.metrics.stage("export"))
+            if batch is _END:
+                self._ended = True
+                return
+            yield from batch
+
+    def run(self) -> None:
+        start = time.perf_counter()
+        stage = ExitStack()
+        try:
+            self.path = export_format(
+                self.fmt,
+                self._iter_reviews(stage),
+                self.output_dir,
+                self.base_filename,
+                self.options,
+            )
+        except BaseException as exc:  # surfaced to the producer in close()
+            self.error = exc
+            logger.error("Streaming %s export failed: %s", self.fmt, exc)
+        finally:
+            stage.close()
+            # Time spent waiting for the crawl is not export time
+            self.metrics.observe_export(self.fmt, time.perf_counter() - start - self._waited)
+            # Keep draining so a failed writer never blocks the producer
+            while not self._ended:
+                if self.batches.get() is _END:
+                    self._ended = True
+
+class StreamingExporter:
+    """
+    Sink that streams review batches to the exporters while crawling.
+
+    Every format gets its own writer thread fed through a bounded queue.
+    ``push`` blocks while any queue is full, so a slow writer throttles the
+    crawl instead of letting batches pile up in memory. Output files are
+    only created once the first non-empty batch arrives, and match what
+    ``export_reviews`` writes for the same reviews.
+
+    The tabular formats have to see every review before writing. With
+    ``memory_limit_mb`` they spill what they collect to disk (under
+    ``spill_dir``) once their share of the limit is used up, so memory stays
+    flat however many hotels are crawled.
+
+    With ``normalize``, each batch is converted to typed fields
+    (``outputs.normalize``) once in ``push``, before it reaches any writer.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path | str,
+        base_filename: str,
+        formats: List[str],
+        format_options: Optional[Dict[str, Dict[str, Any]]] = None,
+        max_pending_batches: int = DEFAULT_MAX_PENDING_BATCHES,
+        metrics: Optional[RunMetrics] = None,
+        memory_limit_mb: Optional[float] = None,
+        spill_dir: Optional[Path | str] = None,
+        normalize: bool = False,
+    ) -> None:
+        self.output_dir = Path(output_dir)
+        self.base_filename = base_filename
+        normalized_formats = {fmt.lower() for fmt in formats}
+        self.formats = [fmt for fmt in EXPORT_FORMATS if fmt in normalized_formats]
+        self.format_options = self._with_memory_limit(
+            format_options or {}, memory_limit_bytes(memory_limit_mb), spill_dir
+        )
+        self.normalize = bool(normalize)
+        if self.normalize:
+            # Typed columns for the extra fields
+            self.format_options = {
+                **self.format_options,
+                "parquet": {**self.format_options.get("parquet", {}), "normalized": True},
+            }
+        self.max_pending_batches = max(1, int(max_pending_batches))
+        self.metrics = metrics or RunMetrics()
+        self.review_count = 0
+        self._writers: List[_FormatWriter] = []
+
+    def _with_memory_limit(
+        self,
+        format_options: Dict[str, Dict[str, Any]],
+        limit: Optional[int],
+        spill_dir: Optional[Path | str],
+    ) -> Dict[str, Dict[str, Any]]:
+        collecting = [fmt for fmt in self.formats if fmt in _COLLECTING_FORMATS]
+        if not limit or not collecting:
+            return format_options
+        # Every collecting writer buffers its own copy, so they share the limit
+        share = max(1, limit // len(collecting))
+        options = dict(format_options)
+        for fmt in collecting:
+            options[fmt] = {
+                **options.get(fmt, {}),
+                "memoryLimit": share,
+                "spillDirectory": spill_dir,
+            }
+        return options
+
+    def _start(self) -> None:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        for fmt in self.formats:
+            writer = _FormatWriter(
+                fmt,
+                self.output_dir,
+                self.base_filename,
+                self.format_options.get(fmt),
+                self.max_pending_batches,
+                self.metrics,
+            )
+            writer.start()
+            self._writers.append(writer)
+        logger.debug("Started streaming writers: %s", ", ".join(self.formats))
+
+    def push(self, reviews: List[Dict[str, Any]]) -> None:
+        """Queue one batch of review dictionaries for every format writer."""
+        if not reviews:
+            return
+        if not self._writers:
+            self._start()
+        if self.normalize:
+            with self.metrics.stage("normalize"):
+                normalize_reviews(reviews)
+        for writer in self._writers:
+            writer.batches.put(reviews)
+        self.review_count += len(reviews)
+
+    def close(self) -> Dict[str, Path]:
+        """
+        Flush all writers and return the format -> path mapping.
+
+        Re-raises the first writer error, if any.
+        """
+        for writer in self._writers:
+            writer.batches.put(_END)
+        for writer in self._writers:
+            writer.join()
+
+        errors = [writer.error for writer in self._writers if writer.error]
+        if errors:
+            raise errors[0]
+
+        export_map = {writer.fmt: writer.path for writer in self._writers if writer.path}
+        logger.info("Export completed. Files: %s", export_map)
+        return export_map
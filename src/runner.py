@@ -1,4 +1,4 @@
-thonimport argparse
+import argparse
 import json
 import logging
 import sys
@@ -6,10 +6,30 @@ import time
 from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
-
-from extractors.booking_parser import fetch_reviews_for_url
-from outputs.exporters import export_reviews
+from typing import Any, Dict, List, Optional, Tuple
+
+from distributed.work_queue import DEFAULT_LEASE_SECONDS, DEFAULT_MAX_ATTEMPTS, WorkQueue
+from distributed.worker import MERGE_KEY, default_worker_id, merge_shards, run_worker
+from extractors.booking_parser import _derive_hotel_id, fetch_reviews_for_url, fragment_template
+from extractors.offline import SavedPage, discover_pages, reextract_pages
+from extractors.rate_limiter import RateLimiter
+from extractors.urls import dedupe_hotel_urls
+from instrumentation.metrics import RunMetrics
+from instrumentation.profiling import DEFAULT_TOP_N, PROFILE_MODES, StageProfiler
+from outputs.streaming import DEFAULT_MAX_PENDING_BATCHES, StreamingExporter
+from scheduling.recrawl import (
+    DEFAULT_MIN_EXPECTED_NEW_REVIEWS,
+    DEFAULT_STATE_FILENAME,
+    DEFAULT_WINDOW_DAYS,
+    RecrawlScheduler,
+)
+from scheduling.sampling import (
+    DEFAULT_CONFIDENCE,
+    DEFAULT_POSITIVE_RATING,
+    DEFAULT_SAMPLE_PAGES,
+    StratifiedPageSample,
+    write_estimates,
+)
 
 # Adjust base directory so the script works regardless of where it is run from
 BASE_DIR = Path(__file__).resolve().parents[1]
@@ -116,13 +136,66 @@ def load_input_urls(path: Path) -> List[Tuple[str, Dict[str, Any]]]:
     if not urls:
         logger.error("No valid URLs loaded from '%s'.", path)
         raise RuntimeError("No valid URLs found in input file.")
-    logger.info("Loaded %d URLs from '%s'.", len(urls), path)
-    return urls
+    # One entry per hotel, however its URL was spelled
+    hotels = dedupe_hotel_urls(urls)
+    logger.info("Loaded %d URLs (%d hotels) from '%s'.", len(urls), len(hotels), path)
+    return hotels
+
+def write_run_report(metrics: RunMetrics, output_dir: Path, base_filename: str) -> None:
+    logger = logging.getLogger("runner.metrics")
+    metrics.finish()
+    try:
+        metrics.write_report(output_dir, base_filename)
+        if metrics.profiler:
+            metrics.profiler.write_reports()
+    except OSError as exc:
+        logger.warning("Could not write run report to '%s': %s", output_dir, exc)
+
+def build_scheduler(
+    config: Dict[str, Any],
+    output_dir: Path,
+    enabled: bool = False,
+) -> Optional[RecrawlScheduler]:
+    sched_cfg = config.get("scheduling", {})
+    if not (enabled or sched_cfg.get("enabled")):
+        return None
+    return RecrawlScheduler(
+        sched_cfg.get("stateDb") or output_dir / DEFAULT_STATE_FILENAME,
+        window_days=int(sched_cfg.get("windowDays", DEFAULT_WINDOW_DAYS)),
+        min_expected_new=float(
+            sched_cfg.get("minExpectedNewReviews", DEFAULT_MIN_EXPECTED_NEW_REVIEWS)
+        ),
+    )
+
+def plan_crawl(
+    urls: List[Tuple[str, Dict[str, Any]]],
+    config: Dict[str, Any],
+    scheduler: Optional[RecrawlScheduler],
+    max_pages: int,
+    request_budget: Optional[int] = None,
+) -> List[Tuple[str, Dict[str, Any], float, int]]:
+    """
+    ``(url, customData, priority, pages)`` for every hotel to crawl: all of
+    them at ``max_pages`` in input order, or the scheduler's due hotels
+    ordered by expected new reviews per request.
+    """
+    if scheduler is None:
+        return [(url, custom_data, 0.0, max_pages) for url, custom_data in urls]
+    budget = request_budget or config.get("scheduling", {}).get("requestBudget")
+    planned = scheduler.plan(urls, max_pages, request_budget=budget)
+    return [(c.url, c.customData, c.priority, c.pages) for c in planned]
 
 def run_scraper(
     input_file: Path,
     config_file: Path,
     verbose: bool = False,
+    profile: Optional[str] = None,
+    profile_hotels: Optional[int] = None,
+    profile_top: int = DEFAULT_TOP_N,
+    metrics: Optional[RunMetrics] = None,
+    schedule: bool = False,
+    request_budget: Optional[int] = None,
+    sample: bool = False,
 ) -> None:
     setup_logging(verbose)
     logger = logging.getLogger("runner")
@@ -138,25 +211,94 @@ def run_scraper(
     delay_seconds = float(request_cfg.get("delayBetweenRequestsSeconds", 1.0))
     timeout_seconds = float(request_cfg.get("timeoutSeconds", 20))
     user_agent = str(request_cfg.get("userAgent"))
+    concurrency = int(request_cfg.get("concurrency", 1))
+    rate_limiter = RateLimiter(request_cfg.get("maxRequestsPerSecond"))
+    fragment_url_template = fragment_template(
+        request_cfg.get("fetchMode"), request_cfg.get("fragmentUrlTemplate")
+    )
+
+    metrics = metrics or RunMetrics()
+
+    output_dir = Path(config.get("outputDirectory", BASE_DIR / "outputs"))
+    formats = config.get("outputFormats", ["json"])
+    if isinstance(formats, str):
+        formats = [formats]
+
+    sampling_cfg = config.get("sampling", {})
+    sampling = sample or bool(sampling_cfg.get("enabled"))
+    scheduler = build_scheduler(config, output_dir, enabled=schedule)
+    if sampling:
+        # Sampled pages are spread over the whole history, not the newest
+        # pages the scheduler plans for
+        if scheduler:
+            logger.warning("Recrawl scheduling is ignored in sampling mode.")
+            scheduler.close()
+            scheduler = None
+        max_pages = int(sampling_cfg.get("pagesPerHotel", DEFAULT_SAMPLE_PAGES))
+    confidence = float(sampling_cfg.get("confidence", DEFAULT_CONFIDENCE))
+    positive_rating = float(sampling_cfg.get("positiveRating", DEFAULT_POSITIVE_RATING))
+    estimates: Dict[str, Dict[str, Any]] = {}
+    work = plan_crawl(urls, config, scheduler, max_pages, request_budget)
+    total_urls = len(work)
+
+    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    base_filename = f"booking_reviews_{timestamp}"
+
+    if profile:
+        metrics.profiler = StageProfiler(
+            output_dir / f"{base_filename}.profile",
+            mode=profile,
+            top_n=profile_top,
+            max_hotels=profile_hotels,
+        )
 
-    all_reviews: List[Dict[str, Any]] = []
-    total_urls = len(urls)
+    # Each hotel's reviews are handed to the format writers as soon as they
+    # are fetched; a full writer queue blocks the crawl (backpressure).
+    sink = StreamingExporter(
+        output_dir=output_dir,
+        base_filename=base_filename,
+        formats=formats,
+        format_options=config.get("formatOptions", {}),
+        max_pending_batches=int(
+            config.get("maxPendingBatches", DEFAULT_MAX_PENDING_BATCHES)
+        ),
+        metrics=metrics,
+        memory_limit_mb=config.get("memoryLimitMb"),
+        spill_dir=config.get("spillDirectory"),
+        normalize=bool(config.get("normalizeReviews")),
+    )
 
     logger.info(
         "Starting scraping for %d URLs (max %d pages per hotel).",
         total_urls,
         max_pages,
     )
+    logger.info(
+        "Streaming reviews to '%s' in formats: %s",
+        output_dir,
+        ", ".join(formats),
+    )
 
-    for idx, (url, custom_data) in enumerate(urls, start=1):
+    for idx, (url, custom_data, _, pages) in enumerate(work, start=1):
         logger.info("Processing URL %d/%d: %s", idx, total_urls, url)
+        if metrics.profiler:
+            metrics.profiler.hotel_started()
+        hotel_id = _derive_hotel_id(url)
+        sampler = (
+            StratifiedPageSample(pages, sampling_cfg.get("seed"), hotel_id) if sampling else None
+        )
         try:
             reviews = fetch_reviews_for_url(
                 url=url,
-                max_pages=max_pages,
+                max_pages=pages,
                 timeout_seconds=timeout_seconds,
                 user_agent=user_agent,
                 custom_data=custom_data,
+                metrics=metrics,
+                concurrency=concurrency,
+                rate_limiter=rate_limiter,
+                fragment_url_template=fragment_url_template,
+                page_sampler=sampler,
             )
         except Exception as exc:
             logger.error(
@@ -165,49 +307,226 @@ def run_scraper(
             continue
 
         logger.info("Fetched %d reviews from %s", len(reviews), url)
-        all_reviews.extend([asdict(r) for r in reviews])
+        records = [asdict(r) for r in reviews]
+        if scheduler:
+            scheduler.record_crawl(url, records)
+        if sampler:
+            estimates[hotel_id] = {
+                "url": url,
+                **sampler.estimate(records, confidence, positive_rating),
+            }
+            rating = estimates[hotel_id]["averageRating"]
+            if rating:
+                logger.info(
+                    "Estimated rating for '%s': %.2f (%.2f-%.2f) from %d of %s reviews.",
+                    hotel_id,
+                    rating["estimate"],
+                    rating["low"],
+                    rating["high"],
+                    len(records),
+                    estimates[hotel_id]["totalReviews"],
+                )
+        sink.push(records)
 
         if idx < total_urls and delay_seconds > 0:
             logger.debug("Sleeping for %.2f seconds between URLs.", delay_seconds)
             time.sleep(delay_seconds)
 
-    if not all_reviews:
+    if scheduler:
+        scheduler.close()
+
+    if sampling:
+        try:
+            path = write_estimates(
+                estimates,
+                output_dir / f"{base_filename}.estimates.json",
+                confidence,
+                positive_rating,
+            )
+            logger.info("Wrote sampled estimates for %d hotels to: %s", len(estimates), path)
+        except OSError as exc:
+            logger.error("Failed to write sampled estimates: %s", exc)
+
+    try:
+        export_map = sink.close()
+    except Exception as exc:
+        logger.error("Failed to export reviews: %s", exc, exc_info=verbose)
+        write_run_report(metrics, output_dir, base_filename)
+        return
+
+    write_run_report(metrics, output_dir, base_filename)
+
+    if not sink.review_count:
         logger.warning("No reviews were collected. Nothing to export.")
         return
 
+    for fmt, path in export_map.items():
+        logger.info("Exported %s to: %s", fmt.upper(), path)
+
+    logger.info(
+        "Completed scraping: %d reviews collected from %d URLs.",
+        sink.review_count,
+        total_urls,
+    )
+
+def run_distributed(
+    input_file: Optional[Path],
+    config_file: Path,
+    queue_file: Path,
+    worker_id: Optional[str] = None,
+    verbose: bool = False,
+    metrics: Optional[RunMetrics] = None,
+    schedule: bool = False,
+    request_budget: Optional[int] = None,
+) -> None:
+    """
+    Work through a shared SQLite work queue together with other workers.
+
+    URLs from ``input_file`` are added to the queue (already queued URLs are
+    skipped, so every node may pass the same file) and the queue is sealed.
+    The worker claims hotels under a lease until the sealed queue is
+    drained; workers started without an input file wait for an enqueuer.
+    The first worker to find every queued hotel done or failed merges all
+    shards into the configured output formats. With the
+    recrawl scheduler, only due hotels are queued, highest expected new
+    reviews per request first, and the merging worker records the crawl.
+    """
+    setup_logging(verbose)
+    logger = logging.getLogger("runner.distributed")
+
+    config = load_config(config_file)
+    dist_cfg = config.get("distributed", {})
+    output_dir = Path(config.get("outputDirectory", BASE_DIR / "outputs"))
+    shard_dir = Path(dist_cfg.get("shardDirectory") or output_dir / "shards" / queue_file.stem)
+    worker_id = worker_id or default_worker_id()
+    metrics = metrics or RunMetrics()
+
+    queue = WorkQueue(
+        queue_file,
+        lease_seconds=float(dist_cfg.get("leaseSeconds", DEFAULT_LEASE_SECONDS)),
+        max_attempts=int(dist_cfg.get("maxAttempts", DEFAULT_MAX_ATTEMPTS)),
+    )
+    scheduler = build_scheduler(config, output_dir, enabled=schedule)
+    try:
+        if input_file is not None:
+            max_pages = int(config.get("maxPagesPerHotel", 2))
+            queue.enqueue(
+                plan_crawl(load_input_urls(input_file), config, scheduler, max_pages, request_budget)
+            )
+            queue.seal()
+
+        run_worker(queue, config, shard_dir, worker_id=worker_id, metrics=metrics)
+        write_run_report(metrics, shard_dir, f"worker_{worker_id}")
+
+        if not queue.try_acquire(MERGE_KEY, worker_id, when_finished=True):
+            logger.info("Another worker is merging the shards, or the queue holds no work.")
+            return
+
+        if not queue.done_shards():
+            # Leave the merge to a worker that finds shards
+            queue.release(MERGE_KEY)
+            logger.warning("Queue drained without any shards to merge.")
+            return
+
+        counts = queue.counts()
+        logger.info(
+            "Queue drained: %d done, %d failed. Merging shards.", counts["done"], counts["failed"]
+        )
+        formats = config.get("outputFormats", ["json"])
+        if isinstance(formats, str):
+            formats = [formats]
+        timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+        export_map = merge_shards(
+            queue,
+            output_dir,
+            f"booking_reviews_{timestamp}",
+            formats,
+            format_options=config.get("formatOptions", {}),
+            max_pending_batches=int(
+                config.get("maxPendingBatches", DEFAULT_MAX_PENDING_BATCHES)
+            ),
+            on_shard=scheduler.record_crawl if scheduler else None,
+            memory_limit_mb=config.get("memoryLimitMb"),
+            spill_dir=config.get("spillDirectory"),
+            normalize=bool(config.get("normalizeReviews")),
+        )
+        for fmt, path in export_map.items():
+            logger.info("Exported %s to: %s", fmt.upper(), path)
+    finally:
+        queue.close()
+        if scheduler:
+            scheduler.close()
+
+def run_reextract(
+    html_dir: Path,
+    config_file: Path,
+    verbose: bool = False,
+    processes: Optional[int] = None,
+    metrics: Optional[RunMetrics] = None,
+) -> None:
+    """
+    Re-run the parser over a directory of saved pages (laid out like the
+    ``www.booking.com/hotel/...`` mirror) and export the reviews as a crawl
+    would, without any network requests. Hotel IDs, and so review IDs, are
+    derived from the saved paths exactly as from the crawled URLs.
+    """
+    setup_logging(verbose)
+    logger = logging.getLogger("runner")
+
+    config = load_config(config_file)
+    metrics = metrics or RunMetrics()
     output_dir = Path(config.get("outputDirectory", BASE_DIR / "outputs"))
     formats = config.get("outputFormats", ["json"])
     if isinstance(formats, str):
         formats = [formats]
 
+    pages = discover_pages(html_dir)
+    hotels = len({page.hotelId for page in pages})
+    logger.info("Re-extracting %d saved pages of %d hotels from '%s'.", len(pages), hotels, html_dir)
+
     timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
     base_filename = f"booking_reviews_{timestamp}"
-
-    logger.info(
-        "Exporting %d collected reviews to '%s' in formats: %s",
-        len(all_reviews),
-        output_dir,
-        ", ".join(formats),
+    sink = StreamingExporter(
+        output_dir=output_dir,
+        base_filename=base_filename,
+        formats=formats,
+        format_options=config.get("formatOptions", {}),
+        max_pending_batches=int(
+            config.get("maxPendingBatches", DEFAULT_MAX_PENDING_BATCHES)
+        ),
+        metrics=metrics,
+        memory_limit_mb=config.get("memoryLimitMb"),
+        spill_dir=config.get("spillDirectory"),
+        normalize=bool(config.get("normalizeReviews")),
     )
 
+    def on_page(page: SavedPage, seconds: float, review_count: int) -> None:
+        metrics.observe_parse(seconds, review_count)
+
+    for hotel_id, records in reextract_pages(pages, processes, on_page=on_page):
+        logger.info("Re-extracted %d reviews for hotel '%s'.", len(records), hotel_id)
+        sink.push(records)
+
     try:
-        export_map = export_reviews(
-            reviews=all_reviews,
-            output_dir=output_dir,
-            base_filename=base_filename,
-            formats=formats,
-        )
+        export_map = sink.close()
     except Exception as exc:
         logger.error("Failed to export reviews: %s", exc, exc_info=verbose)
+        write_run_report(metrics, output_dir, base_filename)
+        return
+
+    write_run_report(metrics, output_dir, base_filename)
+
+    if not sink.review_count:
+        logger.warning("No reviews found in the saved pages. Nothing to export.")
         return
 
     for fmt, path in export_map.items():
         logger.info("Exported %s to: %s", fmt.upper(), path)
-
     logger.info(
-        "Completed scraping: %d reviews collected from %d URLs.",
-        len(all_reviews),
-        total_urls,
+        "Completed re-extraction: %d reviews from %d pages of %d hotels.",
+        sink.review_count,
+        len(pages),
+        hotels,
     )
 
 def build_arg_parser() -> argparse.ArgumentParser:
@@ -234,6 +553,70 @@ def build_arg_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Enable verbose (debug-level) logging.",
     )
+    parser.add_argument(
+        "--profile",
+        nargs="?",
+        const="all",
+        choices=PROFILE_MODES,
+        help="Profile the fetch/parse/export stages with cProfile (cpu), "
+        "tracemalloc (memory) or both (all, the default when no mode is given).",
+    )
+    parser.add_argument(
+        "--profile-hotels",
+        type=int,
+        help="Only profile the first N hotels.",
+    )
+    parser.add_argument(
+        "--profile-top",
+        type=int,
+        default=DEFAULT_TOP_N,
+        help=f"Entries per profiling report (default: {DEFAULT_TOP_N}).",
+    )
+    parser.add_argument(
+        "--schedule",
+        action="store_true",
+        help="Only crawl hotels due for a recrawl, ordered by expected new "
+        "reviews per request (also enabled by scheduling.enabled).",
+    )
+    parser.add_argument(
+        "--request-budget",
+        type=int,
+        help="With --schedule: total page requests for this run.",
+    )
+    parser.add_argument(
+        "--sample",
+        action="store_true",
+        help="Fetch a stratified random sample of each hotel's review pages "
+        "and write rating estimates with confidence intervals (also enabled "
+        "by sampling.enabled).",
+    )
+    parser.add_argument(
+        "--queue",
+        type=str,
+        help="Distributed mode: share hotels with other workers through this "
+        "SQLite work queue file. The input file is added to the queue.",
+    )
+    parser.add_argument(
+        "--worker-id",
+        type=str,
+        help="Worker name in distributed mode (default: <hostname>-<pid>).",
+    )
+    parser.add_argument(
+        "--no-enqueue",
+        action="store_true",
+        help="Distributed mode: only work on the queue, do not add the input file.",
+    )
+    parser.add_argument(
+        "--from-html",
+        type=str,
+        help="Offline mode: re-parse the saved pages under this directory "
+        "(a www.booking.com/hotel/... mirror) instead of crawling.",
+    )
+    parser.add_argument(
+        "--processes",
+        type=int,
+        help="With --from-html: parser processes (default: one per CPU).",
+    )
     return parser
 
 def main(argv: List[str] | None = None) -> None:
@@ -243,10 +626,37 @@ def main(argv: List[str] | None = None) -> None:
     input_path = Path(args.input_file)
     config_path = Path(args.config_file)
 
+    if args.from_html:
+        run_reextract(
+            html_dir=Path(args.from_html),
+            config_file=config_path,
+            verbose=args.verbose,
+            processes=args.processes,
+        )
+        return
+
+    if args.queue:
+        run_distributed(
+            input_file=None if args.no_enqueue else input_path,
+            config_file=config_path,
+            queue_file=Path(args.queue),
+            worker_id=args.worker_id,
+            verbose=args.verbose,
+            schedule=args.schedule,
+            request_budget=args.request_budget,
+        )
+        return
+
     run_scraper(
         input_file=input_path,
         config_file=config_path,
         verbose=args.verbose,
+        profile=args.profile,
+        profile_hotels=args.profile_hotels,
+        profile_top=args.profile_top,
+        schedule=args.schedule,
+        request_budget=args.request_budget,
+        sample=args.sample,
     )
 
 if __name__ == "__main__":
@@ -0,0 +1,206 @@
+import heapq
+import logging
+import math
+import sqlite3
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from extractors.booking_parser import REVIEWS_PER_PAGE, _derive_hotel_id
+from outputs.parquet_writer import parse_dates
+
+logger = logging.getLogger("scheduling.recrawl")
+
+DEFAULT_STATE_FILENAME = "recrawl_state.sqlite"
+DEFAULT_WINDOW_DAYS = 180
+DEFAULT_MIN_EXPECTED_NEW_REVIEWS = 1.0
+# Gamma prior on the daily review rate, worth a week of observations at
+# one review a month: a hotel with little history is neither ignored nor
+# over-crawled, and a week of real data outweighs it
+PRIOR_REVIEWS = 0.25
+PRIOR_DAYS = 7.0
+
+_SECONDS_PER_DAY = 86400.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS crawl_state (
+    hotelId TEXT PRIMARY KEY,
+    url TEXT NOT NULL,
+    lastCrawledAt REAL NOT NULL,
+    lastReviewCount INTEGER NOT NULL,
+    crawls INTEGER NOT NULL DEFAULT 1
+);
+CREATE TABLE IF NOT EXISTS review_dates (
+    reviewId TEXT PRIMARY KEY,
+    hotelId TEXT NOT NULL,
+    reviewDate TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_review_dates_hotel ON review_dates (hotelId, reviewDate);
+"""
+
+@dataclass
+class PlannedCrawl:
+    url: str
+    customData: Dict[str, Any]
+    hotelId: str
+    pages: int
+    # Reviews per day and reviews expected since the last crawl; None for
+    # hotels that were never crawled
+    rate: Optional[float]
+    expectedNew: Optional[float]
+
+    @property
+    def priority(self) -> float:
+        """Expected new reviews per request."""
+        if self.expectedNew is None:
+            return math.inf
+        return min(self.expectedNew, self.pages * REVIEWS_PER_PAGE) / self.pages
+
+class RecrawlScheduler:
+    """
+    Decides which hotels are due for a recrawl, how many pages each gets
+    and in which order, from the review arrival rate seen on past crawls.
+
+    Each hotel's rate is the posterior mean of a Poisson rate under a gamma
+    prior, fitted to the ``reviewDate``s seen in the last ``window_days``.
+    The reviews expected since the last crawl (rate x elapsed days) fill
+    pages newest-first, so page ``k`` is worth
+    ``min(10, expected - 10 * (k - 1))`` new reviews. Under a request budget
+    pages are handed out greedily by that marginal value, which is optimal
+    because it only shrinks from page to page. Hotels that were never
+    crawled come first with the full page allowance.
+    """
+
+    def __init__(
+        self,
+        db_path: Path | str,
+        window_days: int = DEFAULT_WINDOW_DAYS,
+        min_expected_new: float = DEFAULT_MIN_EXPECTED_NEW_REVIEWS,
+    ) -> None:
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.window_days = window_days
+        self.min_expected_new = min_expected_new
+        self._conn = sqlite3.connect(str(self.db_path))
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        self._conn.close()
+
+    # -- learning --------------------------------------------------------
+
+    def record_crawl(
+        self,
+        url: str,
+        reviews: List[Dict[str, Any]],
+        crawled_at: Optional[float] = None,
+    ) -> None:
+        """Store a finished crawl and the review dates it saw."""
+        hotel_id = _derive_hotel_id(url)
+        crawled_at = crawled_at or time.time()
+        dates = parse_dates([r.get("reviewDate") for r in reviews])
+        rows = [
+            (r["id"], hotel_id, d.isoformat())
+            for r, d in zip(reviews, dates)
+            if d is not None and r.get("id")
+        ]
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO review_dates (reviewId, hotelId, reviewDate) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._conn.execute(
+                "INSERT INTO crawl_state (hotelId, url, lastCrawledAt, lastReviewCount) "
+                "VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(hotelId) DO UPDATE SET url = excluded.url, "
+                "lastCrawledAt = excluded.lastCrawledAt, "
+                "lastReviewCount = excluded.lastReviewCount, crawls = crawls + 1",
+                (hotel_id, url, crawled_at, len(reviews)),
+            )
+
+    def review_rate(self, hotel_id: str, now: Optional[float] = None) -> float:
+        """Estimated new reviews per day for ``hotel_id``."""
+        today = datetime.fromtimestamp(now or time.time(), timezone.utc).date()
+        since = date.fromordinal(today.toordinal() - self.window_days).isoformat()
+        count, earliest = self._conn.execute(
+            "SELECT COUNT(*), MIN(reviewDate) FROM review_dates "
+            "WHERE hotelId = ? AND reviewDate >= ?",
+            (hotel_id, since),
+        ).fetchone()
+        if earliest is None:
+            observed_days = float(self.window_days)
+        else:
+            # Window is clipped to the history we have actually seen
+            first = date.fromisoformat(earliest)
+            observed_days = max(1.0, float((today - first).days))
+        return (PRIOR_REVIEWS + count) / (PRIOR_DAYS + observed_days)
+
+    # -- planning --------------------------------------------------------
+
+    def plan(
+        self,
+        urls: Iterable[Tuple[str, Dict[str, Any]]],
+        max_pages: int,
+        request_budget: Optional[int] = None,
+        now: Optional[float] = None,
+    ) -> List[PlannedCrawl]:
+        """
+        Return the hotels due for a crawl, ordered by expected new reviews
+        per request, each with its page allowance (at most ``max_pages``).
+        With ``request_budget`` the total number of pages is capped.
+        """
+        now = now or time.time()
+        state = {
+            row[0]: row[1]
+            for row in self._conn.execute("SELECT hotelId, lastCrawledAt FROM crawl_state")
+        }
+
+        candidates: List[PlannedCrawl] = []
+        skipped = 0
+        for url, custom_data in urls:
+            hotel_id = _derive_hotel_id(url)
+            last_crawled = state.get(hotel_id)
+            if last_crawled is None:
+                candidates.append(PlannedCrawl(url, custom_data, hotel_id, 0, None, None))
+                continue
+            rate = self.review_rate(hotel_id, now)
+            expected = rate * max(0.0, now - last_crawled) / _SECONDS_PER_DAY
+            if expected < self.min_expected_new:
+                skipped += 1
+                continue
+            candidates.append(PlannedCrawl(url, custom_data, hotel_id, 0, rate, expected))
+
+        budget = math.inf if request_budget is None else request_budget
+        # Max-heap of (-value of the hotel's next page, candidate index)
+        heap: List[Tuple[float, int]] = []
+        for idx, crawl in enumerate(candidates):
+            heapq.heappush(heap, (-self._page_value(crawl, 1), idx))
+        while heap and budget > 0:
+            _, idx = heapq.heappop(heap)
+            crawl = candidates[idx]
+            crawl.pages += 1
+            budget -= 1
+            if crawl.pages < max_pages:
+                value = self._page_value(crawl, crawl.pages + 1)
+                if value > 0:
+                    heapq.heappush(heap, (-value, idx))
+
+        planned = [c for c in candidates if c.pages > 0]
+        planned.sort(key=lambda c: c.priority, reverse=True)
+        logger.info(
+            "Recrawl plan: %d hotels due (%d pages), %d not due, %d over budget.",
+            len(planned),
+            sum(c.pages for c in planned),
+            skipped,
+            len(candidates) - len(planned),
+        )
+        return planned
+
+    @staticmethod
+    def _page_value(crawl: PlannedCrawl, page: int) -> float:
+        if crawl.expectedNew is None:
+            return math.inf
+        return min(float(REVIEWS_PER_PAGE), crawl.expectedNew - REVIEWS_PER_PAGE * (page - 1))
@@ -0,0 +1,194 @@
+import json
+import logging
+import math
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from statistics import NormalDist, fmean, variance
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from extractors.booking_parser import REVIEWS_PER_PAGE
+from extractors.utils_cleaner import extract_numeric
+
+logger = logging.getLogger("scheduling.sampling")
+
+DEFAULT_SAMPLE_PAGES = 10
+DEFAULT_CONFIDENCE = 0.95
+# Ratings at or above this count as positive reviews
+DEFAULT_POSITIVE_RATING = 8.0
+
+@dataclass
+class Stratum:
+    firstPage: int
+    lastPage: int
+    # Reviews on the stratum's pages, from the hotel's total review count
+    reviews: int
+    sampledPage: int
+
+def _reviews_on_page(page: int, total_reviews: int) -> int:
+    return max(0, min(REVIEWS_PER_PAGE, total_reviews - (page - 1) * REVIEWS_PER_PAGE))
+
+def plan_strata(total_reviews: int, pages: int, rng: random.Random) -> List[Stratum]:
+    """
+    Split the hotel's review pages into ``pages`` strata of contiguous pages
+    and pick one page at random from each. Page 1 (fetched anyway for the
+    total) is a stratum of its own; pages 2..N are cut into ``pages - 1``
+    runs whose lengths differ by at most one, so every stretch of the
+    review history is represented. Hotels with no more than ``pages``
+    pages are fetched in full.
+    """
+    total_pages = max(1, math.ceil(total_reviews / REVIEWS_PER_PAGE))
+    pages = max(1, pages)
+
+    if total_pages <= pages:
+        bounds = [(page, page) for page in range(1, total_pages + 1)]
+    else:
+        bounds = [(1, 1)]
+        remaining = total_pages - 1
+        runs = pages - 1
+        first = 2
+        for idx in range(runs):
+            length = remaining // runs + (1 if idx < remaining % runs else 0)
+            bounds.append((first, first + length - 1))
+            first += length
+
+    return [
+        Stratum(
+            firstPage=low,
+            lastPage=high,
+            reviews=sum(_reviews_on_page(p, total_reviews) for p in range(low, high + 1)),
+            sampledPage=rng.randint(low, high),
+        )
+        for low, high in bounds
+    ]
+
+def _rating(record: Dict[str, Any]) -> Optional[float]:
+    value = record.get("rating")
+    if isinstance(value, (int, float)):
+        return float(value)
+    number = extract_numeric(value)
+    return float(number) if number else None
+
+def _interval(
+    groups: List[Tuple[Optional[int], List[float]]], z: float, bounds: Tuple[float, float]
+) -> Optional[Dict[str, float]]:
+    """
+    Stratified mean of ``(stratum size, observations)`` groups with a normal
+    confidence interval. Within a stratum the sampled reviews are treated as
+    a simple random sample, with the finite population correction unless
+    the size is None (unknown); strata without observations are left out
+    and the weights renormalized.
+    """
+    usable = [(size, values) for size, values in groups if values and size != 0]
+    if not usable:
+        return None
+    population = sum(size or 0 for size, _ in usable)
+
+    estimate = 0.0
+    var = 0.0
+    for size, values in usable:
+        weight = size / population if size is not None else 1.0 / len(usable)
+        n = len(values)
+        estimate += weight * fmean(values)
+        if n > 1:
+            fpc = max(0.0, 1 - n / size) if size is not None else 1.0
+            var += weight * weight * fpc * variance(values) / n
+    error = math.sqrt(var)
+    low, high = bounds
+    return {
+        "estimate": round(estimate, 4),
+        "standardError": round(error, 4),
+        "low": round(max(low, estimate - z * error), 4),
+        "high": round(min(high, estimate + z * error), 4),
+    }
+
+class StratifiedPageSample:
+    """
+    The page sampler for one hotel: passed as ``page_sampler`` to
+    ``fetch_reviews_for_url``, it plans the strata from the hotel's total
+    review count, and ``estimate`` turns the reviews fetched from the
+    sampled pages into rating and sentiment estimates.
+    """
+
+    def __init__(
+        self,
+        pages: int = DEFAULT_SAMPLE_PAGES,
+        seed: Optional[Any] = None,
+        hotel_id: str = "",
+    ) -> None:
+        self.pages = pages
+        # Seeded per hotel, so a rerun samples the same pages
+        self.rng = random.Random(f"{seed}:{hotel_id}") if seed is not None else random.Random()
+        self.total_reviews: Optional[int] = None
+        self.strata: List[Stratum] = []
+
+    def __call__(self, total_reviews: int) -> List[int]:
+        self.total_reviews = total_reviews
+        self.strata = plan_strata(total_reviews, self.pages, self.rng)
+        return [stratum.sampledPage for stratum in self.strata]
+
+    def estimate(
+        self,
+        reviews: Iterable[Dict[str, Any]],
+        confidence: float = DEFAULT_CONFIDENCE,
+        positive_rating: float = DEFAULT_POSITIVE_RATING,
+    ) -> Dict[str, Any]:
+        """
+        Average rating and share of positive reviews (rating at or above
+        ``positive_rating``) with ``confidence`` intervals. Without a plan
+        (the first page showed no review count) the fetched reviews are
+        treated as one stratum of unknown size, without the finite
+        population correction.
+        """
+        ratings_by_page: Dict[int, List[float]] = {}
+        sampled = 0
+        for record in reviews:
+            sampled += 1
+            rating = _rating(record)
+            if rating is not None:
+                ratings_by_page.setdefault(int(record.get("reviewPage") or 1), []).append(rating)
+
+        if self.strata:
+            groups: List[Tuple[Optional[int], List[float]]] = [
+                (stratum.reviews, ratings_by_page.get(stratum.sampledPage, []))
+                for stratum in self.strata
+            ]
+        else:
+            pooled = [r for values in ratings_by_page.values() for r in values]
+            groups = [(None, pooled)] if pooled else []
+
+        z = NormalDist().inv_cdf(0.5 + confidence / 2)
+        positive = [(size, [1.0 if r >= positive_rating else 0.0 for r in values]) for size, values in groups]
+        return {
+            "totalReviews": self.total_reviews,
+            "pagesTotal": math.ceil(self.total_reviews / REVIEWS_PER_PAGE) if self.total_reviews else None,
+            "pagesSampled": len(ratings_by_page),
+            "reviewsSampled": sampled,
+            "stratified": bool(self.strata),
+            "averageRating": _interval(groups, z, (0.0, 10.0)),
+            "positiveShare": _interval(positive, z, (0.0, 1.0)),
+        }
+
+def write_estimates(
+    estimates: Dict[str, Dict[str, Any]],
+    output_file: Path | str,
+    confidence: float = DEFAULT_CONFIDENCE,
+    positive_rating: float = DEFAULT_POSITIVE_RATING,
+) -> Path:
+    """Write per-hotel estimates (keyed by hotel ID) as a JSON file."""
+    output_file = Path(output_file)
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    with output_file.open("w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "confidence": confidence,
+                "positiveRating": positive_rating,
+                "hotelCount": len(estimates),
+                "hotels": estimates,
+            },
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+    logger.debug("Wrote estimates for %d hotels to %s", len(estimates), output_file)
+    return output_file
@@ -0,0 +1,532 @@
+import argparse
+import json
+import logging
+import signal
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from extractors.booking_parser import fetch_reviews_for_url, fragment_template
+from extractors.rate_limiter import RateLimiter
+from extractors.urls import dedupe_hotel_urls
+from instrumentation.metrics import RunMetrics
+from outputs.exporters import EXPORT_FORMATS
+from outputs.streaming import DEFAULT_MAX_PENDING_BATCHES, StreamingExporter
+from runner import BASE_DIR, CONFIG_DIR, load_config, setup_logging, write_run_report
+
+DEFAULT_SERVICE_CONFIG: Dict[str, Any] = {
+    "host": "127.0.0.1",
+    "port": 8765,
+    "workers": 4,
+    "maxQueuedJobs": 100,
+    "jobHistory": 500,
+    "watchDirectory": None,
+    "pollIntervalSeconds": 2.0,
+}
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+class JobRejected(Exception):
+    """Raised when a job payload is invalid."""
+
+class QueueFull(JobRejected):
+    """Raised when the service already holds ``maxQueuedJobs`` waiting jobs."""
+
+@dataclass
+class ScrapeJob:
+    id: str
+    urls: List[Tuple[str, Dict[str, Any]]]
+    maxItems: Optional[int] = None
+    maxPages: Optional[int] = None
+    formats: List[str] = field(default_factory=list)
+    source: str = "api"
+    status: str = QUEUED
+    submittedAt: float = field(default_factory=time.time)
+    startedAt: Optional[float] = None
+    finishedAt: Optional[float] = None
+    reviewCount: int = 0
+    hotelsFailed: int = 0
+    outputs: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    metrics: Optional[RunMetrics] = None
+
+    def to_dict(self, detail: bool = False) -> Dict[str, Any]:
+        def iso(ts: Optional[float]) -> Optional[str]:
+            return datetime.fromtimestamp(ts, timezone.utc).isoformat() if ts else None
+
+        data: Dict[str, Any] = {
+            "id": self.id,
+            "status": self.status,
+            "source": self.source,
+            "hotels": len(self.urls),
+            "submittedAt": iso(self.submittedAt),
+            "startedAt": iso(self.startedAt),
+            "finishedAt": iso(self.finishedAt),
+            "reviewCount": self.reviewCount,
+            "hotelsFailed": self.hotelsFailed,
+            "outputs": self.outputs,
+            "error": self.error,
+        }
+        if detail:
+            data["urls"] = [url for url, _ in self.urls]
+            data["metrics"] = self.metrics.to_dict() if self.metrics else None
+        return data
+
+def parse_job(payload: Dict[str, Any], default_formats: List[str]) -> ScrapeJob:
+    """
+    Validate a job payload::
+
+        {"urls": ["https://...", {"url": "https://...", "customData": {...}}],
+         "maxItems": 200, "maxPages": 20, "formats": ["json"],
+         "customData": {...}}
+
+    ``url`` may be given instead of ``urls``. Job-level ``customData`` is
+    merged under each URL's own. URLs naming the same hotel are merged into
+    one canonical entry.
+    """
+    if not isinstance(payload, dict):
+        raise JobRejected("Job must be a JSON object")
+
+    raw_urls = payload.get("urls")
+    if raw_urls is None and payload.get("url"):
+        raw_urls = [payload["url"]]
+    if not isinstance(raw_urls, list) or not raw_urls:
+        raise JobRejected("Job needs a non-empty 'urls' list or a 'url'")
+
+    job_custom = payload.get("customData") or {}
+    if not isinstance(job_custom, dict):
+        job_custom = {"value": job_custom}
+
+    urls: List[Tuple[str, Dict[str, Any]]] = []
+    for entry in raw_urls:
+        if isinstance(entry, str):
+            url, custom = entry, {}
+        elif isinstance(entry, dict) and entry.get("url"):
+            url, custom = entry["url"], entry.get("customData") or {}
+            if not isinstance(custom, dict):
+                custom = {"value": custom}
+        else:
+            raise JobRejected(f"Invalid URL entry: {entry!r}")
+        if not isinstance(url, str) or not url.startswith(("http://", "https://")):
+            raise JobRejected(f"Not an http(s) URL: {url}")
+        urls.append((url, {**job_custom, **custom}))
+    urls = dedupe_hotel_urls(urls)
+
+    formats = payload.get("formats") or default_formats
+    if isinstance(formats, str):
+        formats = [formats]
+    unknown = [f for f in formats if f.lower() not in EXPORT_FORMATS]
+    if unknown:
+        raise JobRejected(f"Unknown formats: {', '.join(unknown)}")
+
+    limits: Dict[str, Optional[int]] = {}
+    for key in ("maxItems", "maxPages"):
+        value = payload.get(key)
+        if value is not None and (not isinstance(value, int) or value < 1):
+            raise JobRejected(f"'{key}' must be a positive integer")
+        limits[key] = value
+
+    return ScrapeJob(
+        id=uuid.uuid4().hex[:12],
+        urls=urls,
+        maxItems=limits["maxItems"],
+        maxPages=limits["maxPages"],
+        formats=list(formats),
+    )
+
+class ScraperService:
+    """
+    Runs scrape jobs on a bounded worker pool inside one long-lived process.
+
+    Each worker thread keeps its own pooled ``requests.Session``, so TLS
+    connections, imports and parser caches stay warm between jobs. Jobs
+    beyond ``workers`` wait in a queue of at most ``maxQueuedJobs``.
+    """
+
+    def __init__(self, config: Dict[str, Any], service_config: Dict[str, Any]) -> None:
+        self.config = config
+        self.service_config = service_config
+        self.workers = int(service_config["workers"])
+        self.max_queued = int(service_config["maxQueuedJobs"])
+        self.history = int(service_config["jobHistory"])
+
+        request_cfg = config.get("request", {})
+        self.delay_seconds = float(request_cfg.get("delayBetweenRequestsSeconds", 1.0))
+        self.timeout_seconds = float(request_cfg.get("timeoutSeconds", 20))
+        self.user_agent = str(request_cfg.get("userAgent"))
+        self.concurrency = int(request_cfg.get("concurrency", 1))
+        # Shared by every job, so the request rate holds service-wide
+        self.rate_limiter = RateLimiter(request_cfg.get("maxRequestsPerSecond"))
+        self.fragment_url_template = fragment_template(
+            request_cfg.get("fetchMode"), request_cfg.get("fragmentUrlTemplate")
+        )
+        self.output_dir = Path(config.get("outputDirectory", BASE_DIR / "outputs"))
+        formats = config.get("outputFormats", ["json"])
+        self.default_formats = [formats] if isinstance(formats, str) else list(formats)
+
+        self.logger = logging.getLogger("service")
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="scrape")
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._jobs: "OrderedDict[str, ScrapeJob]" = OrderedDict()
+        self._pending = 0
+        self.started_at = time.time()
+
+    # -- sessions --------------------------------------------------------
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=16, pool_maxsize=max(16, self.concurrency))
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            self._local.session = session
+        return session
+
+    # -- jobs ------------------------------------------------------------
+
+    def submit(self, payload: Dict[str, Any], source: str = "api") -> ScrapeJob:
+        job = parse_job(payload, self.default_formats)
+        job.source = source
+        with self._lock:
+            if self._pending >= self.max_queued + self.workers:
+                raise QueueFull("Job queue is full")
+            self._pending += 1
+            self._jobs[job.id] = job
+            self._trim_history()
+        self._executor.submit(self._run_job, job)
+        self.logger.info("Accepted job %s (%d URLs) from %s.", job.id, len(job.urls), source)
+        return job
+
+    def _trim_history(self) -> None:
+        finished = [j for j in self._jobs.values() if j.status in {SUCCEEDED, FAILED}]
+        for job in finished[: max(0, len(self._jobs) - self.history)]:
+            del self._jobs[job.id]
+
+    def get(self, job_id: str) -> Optional[ScrapeJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self) -> List[ScrapeJob]:
+        with self._lock:
+            return list(self._jobs.values())
+
+    def status(self) -> Dict[str, Any]:
+        counts: Dict[str, int] = {}
+        for job in self.jobs():
+            counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "uptimeSeconds": round(time.time() - self.started_at, 1),
+            "workers": self.workers,
+            "maxQueuedJobs": self.max_queued,
+            "jobs": counts,
+        }
+
+    def _run_job(self, job: ScrapeJob) -> None:
+        job.status = RUNNING
+        job.startedAt = time.time()
+        job.metrics = metrics = RunMetrics()
+        base_filename = f"booking_reviews_{job.id}"
+        max_pages = job.maxPages or int(self.config.get("maxPagesPerHotel", 2))
+        if job.maxItems and not job.maxPages:
+            # Enough pages to reach maxItems at ~10 reviews per page
+            max_pages = max(max_pages, -(-job.maxItems // 10))
+
+        try:
+            sink = StreamingExporter(
+                output_dir=self.output_dir,
+                base_filename=base_filename,
+                formats=job.formats,
+                format_options=self.config.get("formatOptions", {}),
+                max_pending_batches=int(
+                    self.config.get("maxPendingBatches", DEFAULT_MAX_PENDING_BATCHES)
+                ),
+                metrics=metrics,
+                memory_limit_mb=self.config.get("memoryLimitMb"),
+                spill_dir=self.config.get("spillDirectory"),
+                normalize=bool(self.config.get("normalizeReviews")),
+            )
+            try:
+                for idx, (url, custom_data) in enumerate(job.urls, start=1):
+                    remaining = job.maxItems - job.reviewCount if job.maxItems else None
+                    if remaining is not None and remaining <= 0:
+                        break
+                    try:
+                        reviews = fetch_reviews_for_url(
+                            url=url,
+                            max_pages=max_pages,
+                            timeout_seconds=self.timeout_seconds,
+                            user_agent=self.user_agent,
+                            custom_data=custom_data,
+                            metrics=metrics,
+                            session=self._session(),
+                            max_items=remaining,
+                            concurrency=self.concurrency,
+                            rate_limiter=self.rate_limiter,
+                            fragment_url_template=self.fragment_url_template,
+                        )
+                    except Exception as exc:
+                        job.hotelsFailed += 1
+                        self.logger.error("Job %s: scraping '%s' failed: %s", job.id, url, exc)
+                        continue
+                    sink.push([asdict(r) for r in reviews])
+                    job.reviewCount += len(reviews)
+                    if idx < len(job.urls) and self.delay_seconds > 0:
+                        time.sleep(self.delay_seconds)
+            except BaseException:
+                # Stop the writer threads and close their files before the job
+                # fails; a long-running service must not leak them
+                self._abort_sink(job, sink)
+                raise
+
+            job.outputs = {fmt: str(path) for fmt, path in sink.close().items()}
+            job.status = SUCCEEDED
+        except Exception as exc:
+            self.logger.error("Job %s failed: %s", job.id, exc, exc_info=True)
+            job.error = f"{exc}; {job.error}" if job.error else str(exc)
+            job.status = FAILED
+        finally:
+            job.finishedAt = time.time()
+            write_run_report(metrics, self.output_dir, base_filename)
+            with self._lock:
+                self._pending -= 1
+            self.logger.info(
+                "Job %s %s: %d reviews in %.1fs.",
+                job.id,
+                job.status,
+                job.reviewCount,
+                job.finishedAt - job.startedAt,
+            )
+
+    def _abort_sink(self, job: ScrapeJob, sink: StreamingExporter) -> None:
+        try:
+            sink.close()
+        except Exception as exc:
+            self.logger.error("Job %s: closing the exporter failed: %s", job.id, exc)
+            job.error = f"closing the exporter failed: {exc}"
+
+    def shutdown(self) -> None:
+        self.logger.info("Waiting for running jobs to finish...")
+        self._executor.shutdown(wait=True)
+
+class JobDirectoryWatcher(threading.Thread):
+    """
+    Polls a directory for ``*.json`` job files. Accepted files move to
+    ``accepted/``; unreadable or rejected ones to ``rejected/`` with a
+    ``.error`` note. When a job finishes its status is written to
+    ``results/<job id>.json``.
+    """
+
+    def __init__(self, service: ScraperService, directory: Path, interval: float) -> None:
+        super().__init__(name="job-watcher", daemon=True)
+        self.service = service
+        self.directory = directory
+        self.interval = interval
+        self.stop_event = threading.Event()
+        self._watching: Dict[str, ScrapeJob] = {}
+        for sub in ("accepted", "rejected", "results"):
+            (directory / sub).mkdir(parents=True, exist_ok=True)
+
+    def run(self) -> None:
+        logger = logging.getLogger("service.watcher")
+        logger.info("Watching '%s' for job files.", self.directory)
+        while not self.stop_event.is_set():
+            for path in sorted(self.directory.glob("*.json")):
+                self._pick_up(path, logger)
+            self._write_results()
+            self.stop_event.wait(self.interval)
+        self._write_results()
+
+    def _pick_up(self, path: Path, logger: logging.Logger) -> None:
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            job = self.service.submit(payload, source=f"file:{path.name}")
+        except QueueFull:
+            return  # leave it for the next poll
+        except (OSError, ValueError, JobRejected) as exc:
+            logger.warning("Rejected job file '%s': %s", path.name, exc)
+            path.replace(self.directory / "rejected" / path.name)
+            (self.directory / "rejected" / f"{path.name}.error").write_text(
+                f"{exc}\n", encoding="utf-8"
+            )
+            return
+        path.replace(self.directory / "accepted" / f"{job.id}-{path.name}")
+        self._watching[job.id] = job
+
+    def _write_results(self) -> None:
+        for job_id, job in list(self._watching.items()):
+            if job.status in {SUCCEEDED, FAILED}:
+                result_path = self.directory / "results" / f"{job_id}.json"
+                result_path.write_text(
+                    json.dumps(job.to_dict(detail=True), indent=2), encoding="utf-8"
+                )
+                del self._watching[job_id]
+
+class _ApiHandler(BaseHTTPRequestHandler):
+    """
+    POST /jobs          submit a job (202 with the job status)
+    GET  /jobs          list jobs
+    GET  /jobs/<id>     job status with its run metrics
+    GET  /health        service status and job counts
+    """
+
+    server: "ServiceHTTPServer"
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logging.getLogger("service.api").debug(format, *args)
+
+    def _reply(self, status: int, payload: Any) -> None:
+        body = json.dumps(payload, indent=2).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:  # noqa: N802
+        service = self.server.service
+        path = self.path.rstrip("/")
+        if path == "/health":
+            self._reply(200, service.status())
+        elif path == "/jobs":
+            self._reply(200, [job.to_dict() for job in service.jobs()])
+        elif path.startswith("/jobs/"):
+            job = service.get(path[len("/jobs/"):])
+            if job is None:
+                self._reply(404, {"error": "Unknown job"})
+            else:
+                self._reply(200, job.to_dict(detail=True))
+        else:
+            self._reply(404, {"error": "Not found"})
+
+    def do_POST(self) -> None:  # noqa: N802
+        if self.path.rstrip("/") != "/jobs":
+            self._reply(404, {"error": "Not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            payload = json.loads(self.rfile.read(length) or b"null")
+        except ValueError as exc:
+            self._reply(400, {"error": f"Invalid JSON: {exc}"})
+            return
+        try:
+            job = self.server.service.submit(payload)
+        except JobRejected as exc:
+            self._reply(503 if isinstance(exc, QueueFull) else 400, {"error": str(exc)})
+            return
+        self._reply(202, job.to_dict())
+
+class ServiceHTTPServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], service: ScraperService) -> None:
+        super().__init__(address, _ApiHandler)
+        self.service = service
+
+def load_service_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    return {**DEFAULT_SERVICE_CONFIG, **(config.get("service") or {})}
+
+def run_service(
+    config_file: Path,
+    verbose: bool = False,
+    host: Optional[str] = None,
+    port: Optional[int] = None,
+    workers: Optional[int] = None,
+    watch_dir: Optional[Path] = None,
+) -> None:
+    setup_logging(verbose)
+    logger = logging.getLogger("service")
+
+    config = load_config(config_file)
+    service_config = load_service_config(config)
+    overrides = {"host": host, "port": port, "workers": workers, "watchDirectory": watch_dir}
+    service_config.update({k: v for k, v in overrides.items() if v is not None})
+
+    service = ScraperService(config, service_config)
+    server = ServiceHTTPServer((service_config["host"], int(service_config["port"])), service)
+
+    watcher: Optional[JobDirectoryWatcher] = None
+    if service_config.get("watchDirectory"):
+        watcher = JobDirectoryWatcher(
+            service,
+            Path(service_config["watchDirectory"]),
+            float(service_config["pollIntervalSeconds"]),
+        )
+        watcher.start()
+
+    def handle_sigterm(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, handle_sigterm)
+
+    host_, port_ = server.server_address[:2]
+    logger.info(
+        "Scraper service listening on http://%s:%d with %d workers.",
+        host_,
+        port_,
+        service.workers,
+    )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        logger.info("Shutting down.")
+    finally:
+        server.server_close()
+        service.shutdown()
+        if watcher:
+            watcher.stop_event.set()
+            watcher.join()
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Booking Reviews Scraper service - accept scrape jobs over HTTP "
+        "or from a watched directory"
+    )
+    parser.add_argument(
+        "-c",
+        "--config-file",
+        type=str,
+        default=str(CONFIG_DIR / "settings.example.json"),
+        help="Path to JSON configuration file (default: src/config/settings.example.json).",
+    )
+    parser.add_argument("--host", help="Bind address (default: service.host, 127.0.0.1).")
+    parser.add_argument("--port", type=int, help="Port (default: service.port, 8765).")
+    parser.add_argument("--workers", type=int, help="Concurrent jobs (default: service.workers, 4).")
+    parser.add_argument("--watch-dir", type=Path, help="Also pick up *.json job files from this directory.")
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="store_true",
+        help="Enable verbose (debug-level) logging.",
+    )
+    return parser
+
+def main(argv: List[str] | None = None) -> None:
+    args = build_arg_parser().parse_args(argv)
+    run_service(
+        config_file=Path(args.config_file),
+        verbose=args.verbose,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        watch_dir=args.watch_dir,
+    )
+
+if __name__ == "__main__":
+    main(sys.argv[1:])